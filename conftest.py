@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import contextlib
-from typing import Generator, Any, Dict
+import time
+from pathlib import Path
+from typing import Generator, Any, Dict, List
 
 import allure
 import pytest
@@ -13,15 +15,248 @@ from core.api.services.account_service import AccountService
 from core.api.services.book_store_service import BookStoreService
 from core.config.config import RunCfg, ConfigLoader
 from core.http.http_client import HttpClient
-from core.providers.data_generator import generate_user_request
-from core.util.allure_hooks.allure import AllureApiLogger
-from core.util.html_report.decorators import html_step
+from core.http.journal import HttpJournal
+from core.http.latency import LatencyRecorder
+from core.ui.auth import AuthInjector, UiAuth
+from core.ui.driver_pool import DriverReuseSummary
+from core.ui.request_blocking import BlockedRequestSummary
+from core.util.allure_hooks.allure import ATTACH_MODES, AllureApiLogger
+from core.util.allure_hooks.attachment_writer import ATTACHMENT_WRITER_KEY, shared_attachment_writer
+from core.util.html_report.decorators import step
 from core.util.html_report.helper import process_report, customize_header, customize_row
-from core.util.logging import Logger
-from core.util.support.demoqa_flows import ensure_test_user, cleanup_demo_user
+from core.util.html_report.fast_report import FastHtmlReport
+from core.util.html_report.step_tree import StepTimingExport
+from core.util.logging import Logger, merge_worker_logs
+from core.util.support.cleanup_queue import CleanupQueue, CleanupReport
+from core.util.support.demoqa_flows import ensure_test_user
+from core.util.support.demoqa_raw_api import DemoQaRawApi
+from core.util.support.shared_store import SharedJsonStore, SharedResource, is_xdist_worker, shared_tmp_dir
+from core.util.support.run_history import RunHistory, RunRecorder, Regression
+from core.util.support.trace_timeline import TraceRecorder, merge_traces
+from core.util.support.user_ledger import UserLedger
+from core.util.support.user_pool import UserPool
 
 log = Logger.get_logger("conftest", prefix="project_root")
 
+# UI options and driver setup: registered here so they work for any initial path (pytest, pytest tests, ...)
+pytest_plugins = ["tests.ui.driver_plugin"]
+
+USER_POOL_KEY = pytest.StashKey[UserPool]()
+CLEANUP_KEY = pytest.StashKey[CleanupQueue]()
+CLEANUP_REPORT_KEY = pytest.StashKey[CleanupReport]()
+STEP_EXPORT_KEY = pytest.StashKey[StepTimingExport]()
+API_LOGGER_KEY = pytest.StashKey[AllureApiLogger]()
+LATENCY_KEY = pytest.StashKey[LatencyRecorder]()
+RUN_RECORDER_KEY = pytest.StashKey[RunRecorder]()
+REGRESSIONS_KEY = pytest.StashKey[List[Regression]]()
+LOG_SINCE_KEY = pytest.StashKey[float]()
+TRACE_KEY = pytest.StashKey[TraceRecorder]()
+HTTP_JOURNAL_KEY = pytest.StashKey[HttpJournal]()
+
+REPORT_TITLE = "DemoQA Book Store — UI/API/E2E Tests"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--user-pool-size", action="store", type=int, default=4,
+                     help="DemoQA users pre-created at session start and leased to tests (shared by xdist workers)")
+    parser.addoption("--cleanup-budget", action="store", type=float, default=60.0,
+                     help="Seconds to wait at session end for queued user deletions")
+    parser.addoption("--sweep-orphans", action="store_true", default=False,
+                     help="Delete auto_user_* accounts left in the local user ledger by previous (crashed) runs")
+    parser.addoption("--sweep-min-age", action="store", type=float, default=3600.0,
+                     help="Only sweep ledger accounts older than this many seconds")
+    parser.addoption("--api-attach", action="store", choices=ATTACH_MODES, default="always",
+                     help="Allure HTTP attachments: for every request, only for failed tests, or for failed "
+                          "plus a sample of passed tests")
+    parser.addoption("--api-attach-sample", action="store", type=float, default=0.1,
+                     help="Share of passed tests whose HTTP exchanges are attached with --api-attach=sampled")
+    parser.addoption("--api-attach-buffer", action="store", type=int, default=50,
+                     help="HTTP exchanges kept in memory per test with --api-attach=on-failure|sampled")
+    parser.addoption("--fast-report", action="store", default=None, metavar="DIR",
+                     help="Also write a scalable HTML report to DIR (streamed rows, external screenshots, "
+                          "virtual scrolling); for large runs use it instead of --self-contained-html (not in the "
+                          "default addopts: report.html links its assets). "
+                          "DIR must be new, empty or a previous fast report. Screenshot thumbnails need "
+                          "Pillow; without it the full image is shown scaled down")
+    parser.addoption("--no-history", action="store_true", default=False,
+                     help="Do not record this run in the local run history (target/run_history.sqlite)")
+    parser.addoption("--no-http-journal", action="store_true", default=False,
+                     help="Do not journal HTTP exchanges to target/http-journal (query: python -m core.http.journal)")
+    parser.addoption("--http-journal-bodies", action="store_true", default=False,
+                     help="Also store compressed request/response bodies in the HTTP journal")
+    parser.addoption("--history-baseline", action="store", type=int, default=10,
+                     help="Previous runs (same env) used as the baseline for regression detection")
+    parser.addoption("--steps-json", action="store", default=None, metavar="PATH",
+                     help="Write per-test step trees with timings (the report.html Steps column) to a JSON file")
+    parser.addoption("--trace-out", action="store", default=None, metavar="PATH",
+                     help="Write a Chrome trace-event timeline of the run (chrome://tracing, Perfetto): "
+                          "phases, fixtures, steps, HTTP, WebDriver and report hooks, one track per worker")
+
+
+def _cleanup_queue(config) -> CleanupQueue:
+    queue = config.stash.get(CLEANUP_KEY, None)
+    if queue is None:
+        queue = CleanupQueue(DemoQaRawApi())
+        config.stash[CLEANUP_KEY] = queue
+    return queue
+
+
+def _latency_recorder(config) -> LatencyRecorder:
+    recorder = config.stash.get(LATENCY_KEY, None)
+    if recorder is None:
+        recorder = LatencyRecorder()
+        config.stash[LATENCY_KEY] = recorder
+    return recorder
+
+
+def _http_journal(config) -> HttpJournal:
+    journal = config.stash.get(HTTP_JOURNAL_KEY, None)
+    if journal is None:
+        journal = HttpJournal(store_bodies=config.getoption("--http-journal-bodies"))
+        config.stash[HTTP_JOURNAL_KEY] = journal
+    return journal
+
+
+def _api_logger(config) -> AllureApiLogger:
+    api_logger = config.stash.get(API_LOGGER_KEY, None)
+    if api_logger is None:
+        api_logger = AllureApiLogger(writer=shared_attachment_writer(config), mode=config.getoption("--api-attach"),
+                                     sample_rate=config.getoption("--api-attach-sample"),
+                                     buffer_size=config.getoption("--api-attach-buffer"))
+        config.stash[API_LOGGER_KEY] = api_logger
+    return api_logger
+
+
+def _user_pool(config) -> UserPool:
+    pool = config.stash.get(USER_POOL_KEY, None)
+    if pool is None:
+        cleanup = _cleanup_queue(config)
+        pool = UserPool(shared_tmp_dir(config), size=config.getoption("--user-pool-size"),
+                        api=cleanup.api, cleanup=cleanup)
+        config.stash[USER_POOL_KEY] = pool
+    return pool
+
+
+def pytest_sessionstart(session):
+    """Register run-wide plugins (mostly controller only) and start deleting orphaned accounts in the background."""
+    config = session.config
+    if not is_xdist_worker(config):
+        config.stash[LOG_SINCE_KEY] = time.time()
+        if not config.getoption("--no-http-journal"):
+            HttpJournal.reset()
+    if config.getoption("--trace-out"):
+        # every process records its own spans; the controller merges them at the end
+        tracer = TraceRecorder(shared_tmp_dir(config) / "trace")
+        config.stash[TRACE_KEY] = tracer
+        config.pluginmanager.register(tracer, "trace-timeline")
+    if not is_xdist_worker(config) and config.getoption("--steps-json"):
+        export = StepTimingExport(Path(config.getoption("--steps-json")))
+        config.stash[STEP_EXPORT_KEY] = export
+        config.pluginmanager.register(export, "step-timing-export")
+    if not is_xdist_worker(config) and not config.getoption("--no-history"):
+        recorder = RunRecorder()
+        config.stash[RUN_RECORDER_KEY] = recorder
+        config.pluginmanager.register(recorder, "run-history-recorder")
+    if not is_xdist_worker(config):
+        config.pluginmanager.register(DriverReuseSummary(), "driver-reuse-summary")
+        config.pluginmanager.register(BlockedRequestSummary(), "blocked-request-summary")
+    if not is_xdist_worker(config) and config.getoption("--fast-report"):
+        try:
+            fast_report = FastHtmlReport(Path(config.getoption("--fast-report")), title=REPORT_TITLE)
+        except ValueError as e:
+            raise pytest.UsageError(f"--fast-report: {e}") from e
+        config.pluginmanager.register(fast_report, "fast-html-report")
+    if not is_xdist_worker(config) and config.getoption("--sweep-orphans"):
+        _cleanup_queue(config).sweep_orphans(UserLedger(), min_age_s=config.getoption("--sweep-min-age"))
+
+
+def pytest_collection_finish(session):
+    """Start pre-creating pooled users in the background as soon as collection shows they are needed."""
+    if any("user_id" in getattr(item, "fixturenames", ()) for item in session.items):
+        _user_pool(session.config).start()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """Runs after session fixtures are torn down, so their queued deletions are drained too."""
+    config = session.config
+    writer = config.stash.get(ATTACHMENT_WRITER_KEY, None)
+    if writer is not None:
+        writer.close()
+    journal = config.stash.get(HTTP_JOURNAL_KEY, None)
+    if journal is not None:
+        journal.close()
+    pool = config.stash.get(USER_POOL_KEY, None)
+    if pool is not None:
+        pool.close()
+    # the controller (or the single process without xdist) runs last: delete pooled and shared accounts
+    if not is_xdist_worker(config):
+        if (shared_tmp_dir(config) / UserPool.STORE_NAME).exists():
+            _user_pool(config).purge(_cleanup_queue(config))
+        shared_user = _api_auth_user(config).take()
+        if shared_user and shared_user["needs_cleanup"] and config.getoption("--cleanup-user", default=False):
+            _cleanup_queue(config).delete_user(shared_user["user"])
+    cleanup = config.stash.get(CLEANUP_KEY, None)
+    if cleanup is not None:
+        config.stash[CLEANUP_REPORT_KEY] = cleanup.drain(config.getoption("--cleanup-budget"))
+    if not is_xdist_worker(config):
+        # drop deleted accounts (and their passwords) so the ledger does not grow run after run
+        UserLedger().compact()
+    export = config.stash.get(STEP_EXPORT_KEY, None)
+    if export is not None:
+        export.write()
+    recorder = config.stash.get(RUN_RECORDER_KEY, None)
+    if recorder is not None and recorder.tests:
+        _record_history(config, recorder)
+    tracer = config.stash.get(TRACE_KEY, None)
+    if tracer is not None:
+        tracer.write()
+        if not is_xdist_worker(config):
+            merge_traces(tracer.out_dir, Path(config.getoption("--trace-out")))
+    # workers only drain their log queue; the controller runs after them and merges all files by time
+    if is_xdist_worker(config):
+        Logger.flush()
+    else:
+        merged = merge_worker_logs(config.stash.get(LOG_SINCE_KEY, time.time()))
+        log.debug(f"Run log merged -> {merged}")
+
+
+def _record_history(config, recorder: RunRecorder) -> None:
+    meta = {"args": config.invocation_params.args, "workers": getattr(config.option, "numprocesses", None),
+            "browser": config.getoption("--browser", default=None)}
+    env = "unknown"
+    with contextlib.suppress(Exception):
+        cfg = ConfigLoader().load()
+        env, meta["api"] = cfg.env_name, cfg.api_uri
+    try:
+        history = RunHistory()
+        run_id = history.record(recorder, env=env, meta=meta)
+        config.stash[REGRESSIONS_KEY] = history.regressions(
+            run_id, baseline_runs=config.getoption("--history-baseline"))
+    except Exception as e:
+        log.warning(f"Run history not recorded: {e}")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if is_xdist_worker(config):
+        return
+    regressions = config.stash.get(REGRESSIONS_KEY, None)
+    if regressions:
+        terminalreporter.write_sep("-", f"Performance regressions ({len(regressions)})", yellow=True)
+        for regression in regressions[:20]:
+            terminalreporter.write_line(regression.line())
+        terminalreporter.write_line("details: python -m core.util.support.run_history regressions")
+    has_pool = (shared_tmp_dir(config) / UserPool.STORE_NAME).exists()
+    report = config.stash.get(CLEANUP_REPORT_KEY, None)
+    if not has_pool and not (report and report.submitted):
+        return
+    terminalreporter.write_sep("-", "DemoQA users")
+    if has_pool:
+        for line in _user_pool(config).stats().summary_lines():
+            terminalreporter.write_line(line)
+    if report and report.submitted:
+        terminalreporter.write_line(report.summary_line())
+
 
 @pytest.fixture(scope="session")
 def run_cfg() -> RunCfg:
@@ -35,10 +270,17 @@ def env_info(http_client: HttpClient) -> RunCfg:
 
 
 @pytest.fixture(scope="session")
-def http_client() -> Generator[HttpClient, None, None]:
-    """Single shared HttpClient + Allure response-hook."""
+def http_client(request: pytest.FixtureRequest) -> Generator[HttpClient, None, None]:
+    """Single shared HttpClient + Allure response-hook (attachments written in the background)."""
     http = HttpClient(is_auth=False)
-    AllureApiLogger().install(http.s)
+    _api_logger(request.config).install(http.s)
+    _latency_recorder(request.config).install(http.s)
+    tracer = request.config.stash.get(TRACE_KEY, None)
+    if tracer is not None:
+        tracer.install(http.s)
+    if not request.config.getoption("--no-http-journal"):
+        _http_journal(request.config).install(http.s)
+    UserLedger().install(http.s)
 
     cfg = http.cfg
     env_info = (
@@ -58,8 +300,7 @@ def http_client() -> Generator[HttpClient, None, None]:
 
 
 @pytest.fixture(scope="session")
-@html_step("Provide AccountService client")
-@allure.step("Provide AccountService client")
+@step("Provide AccountService client")
 def account_service(http_client: HttpClient) -> AccountService:
     """Thin wrapper over HttpClient, uses shared Session."""
     log.info("AccountService uses shared HttpClient session")
@@ -67,8 +308,7 @@ def account_service(http_client: HttpClient) -> AccountService:
 
 
 @pytest.fixture(scope="session")
-@html_step("Provide BookStoreService client")
-@allure.step("Provide BookStoreService client")
+@step("Provide BookStoreService client")
 def book_store_service(http_client: HttpClient) -> BookStoreService:
     """Thin wrapper over HttpClient, uses shared Session."""
     log.info("BookStoreService uses shared HttpClient session")
@@ -79,38 +319,58 @@ def book_store_service(http_client: HttpClient) -> BookStoreService:
 def api_auth_user(
         request: pytest.FixtureRequest,
         account_service: AccountService,
-        book_store_service: BookStoreService,
-) -> Generator[dict[str, Any], Any, None]:
+) -> dict[str, Any]:
     """
     Provide authenticated DemoQA user for all tests:
 
     - if DEMOQA_USER/DEMOQA_PASS are set -> reuse them, no cleanup
     - otherwise create temporary user and optionally clean it up
       at the end of the session (if --cleanup-user is passed)
+
+    The user is resolved once per run: the first xdist worker creates/logs it in under a
+    cross-process lock, the others reuse it; the controller does the cleanup at session finish.
     """
-    user, needs_cleanup = ensure_test_user(account_service)
-    yield user
 
-    if needs_cleanup and request.config.getoption("--cleanup-user", default=False):
-        cleanup_demo_user(account_service, book_store_service, user)
+    def _resolve() -> Dict[str, Any]:
+        user, needs_cleanup = ensure_test_user(account_service)
+        return {"user": user, "needs_cleanup": needs_cleanup}
+
+    return _api_auth_user(request.config).acquire(_resolve)["user"]
+
+
+def _api_auth_user(config) -> SharedResource:
+    return SharedResource(SharedJsonStore(shared_tmp_dir(config) / "demoqa_api_auth_user.json", lock_timeout=120.0))
+
+
+@pytest.fixture(scope="session")
+def cleanup_queue(request: pytest.FixtureRequest) -> CleanupQueue:
+    """Background deletion of accounts a test created itself; drained at session finish."""
+    return _cleanup_queue(request.config)
+
+
+@pytest.fixture(scope="session")
+def user_pool(request: pytest.FixtureRequest) -> UserPool:
+    """Run-wide pool of logged-in DemoQA users (see --user-pool-size)."""
+    return _user_pool(request.config).start()
 
 
 @pytest.fixture()
-def user_id(account_service: AccountService) -> Generator[Any, Any, None]:
+def leased_user(user_pool: UserPool) -> Generator[Dict[str, Any], Any, None]:
     """
-    Create a fresh DemoQA user for BookStore tests and clean it up afterwards.
+    Lease a logged-in DemoQA user with an empty book shelf from the pool.
+    After the test its books are cleared in bulk and it goes back to the pool.
     """
-    # Arrange: create user with random valid credentials
-    response = account_service._client.create_user_request(generate_user_request())
-    body = response.json()
-
-    uid = body["userID"]
+    user = user_pool.lease()
+    try:
+        yield user
+    finally:
+        user_pool.release(user)
 
-    yield uid
 
-    # Teardown: best-effort delete user, ignore errors if already removed
-    with contextlib.suppress(Exception):
-        account_service.delete_user(uid)
+@pytest.fixture()
+def user_id(leased_user: Dict[str, Any]) -> str:
+    """User id of a pooled DemoQA user for BookStore tests."""
+    return leased_user["userId"]
 
 
 @pytest.fixture(scope="function")
@@ -121,31 +381,23 @@ def ui_login_via_api(
 ):
     """
     Log in UI by injecting localStorage from API login.
+    Chromium: seeded before the test's first navigation (no page load here); other browsers open the app once.
     """
-    driver.get(env_info.web_url)
-
-    script = """
-        window.localStorage.setItem('userID', arguments[0]);
-        window.localStorage.setItem('userName', arguments[1]);
-        window.localStorage.setItem('token', arguments[2]);
-        window.localStorage.setItem('expires', arguments[3]);
-    """
-    driver.execute_script(
-        script,
-        api_auth_user["userId"],
-        api_auth_user["username"],
-        api_auth_user["token"],
-        api_auth_user["expires"],
-    )
+    auth = UiAuth(user_id=api_auth_user["userId"], user_name=api_auth_user["username"],
+                  token=api_auth_user["token"], expires=api_auth_user["expires"])
+    injector = AuthInjector(driver, getattr(driver, "base_url", env_info.web_url))
+    if not injector.seed(auth):
+        injector.seed_in_page(auth)
 
     yield api_auth_user
 
+    injector.release()
     with contextlib.suppress(Exception):
         driver.execute_script("window.localStorage.clear();")
 
 
 def pytest_html_report_title(report):
-    report.title = "DemoQA Book Store — UI/API/E2E Tests"
+    report.title = REPORT_TITLE
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -157,6 +409,23 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     process_report(report, item, call)
+    api_logger = item.config.stash.get(API_LOGGER_KEY, None)
+    if api_logger is not None:
+        if report.failed:
+            api_logger.test_failed()
+        if call.when == "teardown":
+            api_logger.end_test(item.nodeid)
+    latency = item.config.stash.get(LATENCY_KEY, None)
+    if latency is not None and call.when == "teardown":
+        # plain dict on the report: reaches the xdist controller's run history
+        report.http_latency = latency.drain()
+    # API attachments are written in the background: make sure a test's files exist before moving on
+    writer = item.config.stash.get(ATTACHMENT_WRITER_KEY, None)
+    if writer is not None and call.when == "teardown":
+        writer.flush()
+    journal = item.config.stash.get(HTTP_JOURNAL_KEY, None)
+    if journal is not None and call.when == "teardown":
+        journal.flush()
 
 
 @pytest.hookimpl(optionalhook=True)
@@ -174,7 +443,7 @@ def pytest_html_results_table_row(report, cells):
 @pytest.fixture(autouse=True)
 def _html_steps_request_context(request: pytest.FixtureRequest):
     """
-    Make current pytest request available for html_step decorator.
+    Make current pytest request available for step decorators.
     """
     pytest.current_request = request
     try:
@@ -4,12 +4,11 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Sequence, Union
 
-import allure
 from requests import Response, Session
 
 from core.api.models.user import UserRequest
 from core.http.http_client import HttpClient
-from core.util.html_report.decorators import html_step
+from core.util.html_report.decorators import step
 
 StatusSpec = Union[int, Sequence[int], set]
 
@@ -22,30 +21,25 @@ class AccountClient(HttpClient):
     def __init__(self, *, is_auth: bool = False, session: Optional[Session] = None) -> None:
         super().__init__(is_auth=is_auth, session=session)
 
-    @html_step("Account: Create user")
-    @allure.step("Account: Create user")
+    @step("Account: Create user")
     def create_user_request(self, body: Dict[str, Any] | UserRequest, expect: StatusSpec = 201) -> Response:
         payload = body.to_dict() if isinstance(body, UserRequest) else body
         return self.post(self.ACC_USR_PATH, payload=payload, expected_status_code=expect)
 
-    @html_step("Account: Generate token for body")
-    @allure.step("Account: Generate token for {body}")
+    @step("Account: Generate token for {body.userName}")
     def generate_token_response(self, body: UserRequest, expect: StatusSpec = 200) -> Response:
         return self.get_generate_token_response(body=body, expect=expect)
 
-    @html_step("Account: Get user user_id")
-    @allure.step("Account: Get user {user_id}")
+    @step("Account: Get user {user_id}")
     def get_user_response(self, user_id: str, token: Optional[str], expect: StatusSpec) -> Response:
         headers = {"Authorization": f"Bearer {token}"}
         return self.get(f"{self.ACC_USR_PATH}/{user_id}", headers=headers, expected_status_code=expect)
 
-    @html_step("Account: Delete user user_id")
-    @allure.step("Account: Delete user {user_id}")
+    @step("Account: Delete user {user_id}")
     def delete_user_request(self, user_id: str, *, token: Optional[str], expect: StatusSpec) -> Response:
         return self.delete(f"{self.ACC_USR_PATH}/{user_id}", token=token, expected_status_code=expect)
 
-    @html_step("Account: Check authorization for body")
-    @allure.step("Account: Check authorization for {body}")
+    @step("Account: Check authorization for {body.userName}")
     def is_authorized_request(self, body: Dict[str, Any] | UserRequest, expect: StatusSpec = 200) -> Response:
         payload = body.to_dict() if isinstance(body, UserRequest) else body
         return self.post(f"{self.ACC_PATH}/Authorized", payload=payload, expected_status_code=expect)
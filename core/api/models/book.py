@@ -1,5 +1,5 @@
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, asdict, fields
+from typing import Optional, Dict, Any, Mapping
 
 
 @dataclass(frozen=True)
@@ -10,5 +10,11 @@ class Book:
     author: Optional[str] = None
     publisher: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Book":
+        """Build from API payload, ignoring fields this model does not declare."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -4,12 +4,11 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Sequence, Union
 
-import allure
 from requests import Response
 
 from core.api.clients.account_client import AccountClient
 from core.api.models.user import UserRequest
-from core.util.html_report.decorators import html_step
+from core.util.html_report.decorators import step
 
 StatusSpec = Union[int, Sequence[int], set]
 
@@ -20,13 +19,11 @@ class AccountService:
     def __init__(self, client: AccountClient) -> None:
         self._client: AccountClient = client
 
-    @html_step("Account: Create user")
-    @allure.step("Account: Create user")
+    @step("Account: Create user")
     def create_user(self, body: Dict[str, Any] | UserRequest, expect: StatusSpec = 201) -> Dict[str, Any]:
         return self._client.create_user_request(body, expect=expect).json()
 
-    @html_step("Account: Generate token")
-    @allure.step("Account: Generate token for {body}")
+    @step("Account: Generate token for {body.userName}")
     def generate_token(self, body: Dict[str, Any] | UserRequest, expect: StatusSpec = 200) -> str:
         r = self._client.generate_token_response(body, expect=expect)
         token = (r.json() or {}).get("token", "")
@@ -34,18 +31,15 @@ class AccountService:
             raise AssertionError(f"Token not returned: {r.text[:300]}")
         return token
 
-    @html_step("Account: Get user")
-    @allure.step("Account: Get user {user_id}")
+    @step("Account: Get user {user_id}")
     def get_user(self, user_id: str, *, token: Optional[str] = None, expect: StatusSpec = 200) -> Dict[str, Any]:
         r = self._client.get_user_response(user_id, token=token, expect=expect)
         return r.json()
 
-    @html_step("Account: Delete user")
-    @allure.step("Account: Delete user {user_id}")
+    @step("Account: Delete user {user_id}")
     def delete_user(self, user_id: str, *, token: Optional[str] = None, expect: StatusSpec = (200, 204)) -> Response:
         return self._client.delete_user_request(user_id=user_id, expect=expect, token=token)
 
-    @html_step("Account: Check authorization")
-    @allure.step("Account: Check authorization for {body}")
+    @step("Account: Check authorization for {body.userName}")
     def is_authorized(self, body: Dict[str, Any], expect: StatusSpec = 200) -> bool:
         return bool(self._client.is_authorized_request(body, expect=expect).text)
@@ -7,9 +7,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional
 
-import allure
 
-from core.util.html_report.decorators import html_step
+from core.util.html_report.decorators import step
 from core.util.logging import Logger
 
 
@@ -37,8 +36,7 @@ class ConfigLoader:
     def __init__(self) -> None:
         self.config_dir = self.CONFIG_DIR
 
-    @html_step("Load configuration from files")
-    @allure.step("Load configuration from files")
+    @step("Load configuration from files")
     def load(self) -> RunCfg:
         self.log.info(f"Loading config from: {self.config_dir.resolve()}")
         common = self._read_flat(self.config_dir / "common.properties", required=True)
@@ -79,8 +77,7 @@ class ConfigLoader:
         return self._read_flat(path, required=True)
 
     @staticmethod
-    @html_step("Load properties file")
-    @allure.step("Load properties file")
+    @step("Load properties file")
     def _read_flat(path: Path, *, required: bool = False) -> Dict[str, str]:
         if not path.exists():
             if required:
@@ -92,8 +89,7 @@ class ConfigLoader:
         return {k: v for k, v in cp["root"].items()}
 
     @staticmethod
-    @html_step("check properties presence")
-    @allure.step("check properties presence")
+    @step("check properties presence")
     def _req(mapping: Dict[str, str], key: str) -> str:
         v = mapping.get(key)
         if v is None or str(v).strip() == "":
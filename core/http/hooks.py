@@ -0,0 +1,15 @@
+"""Registration of requests 'response' hooks on a Session."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from requests import Session
+
+
+def install_response_hook(session: Session, hook: Callable[..., Any]) -> None:
+    """Append `hook` to the Session's response hooks unless a hook of the same method is already there."""
+    hooks = session.hooks.get("response") or []
+    if any(getattr(h, "__qualname__", "") == hook.__qualname__ for h in hooks):
+        return
+    session.hooks["response"] = hooks + [hook]
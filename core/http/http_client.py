@@ -15,7 +15,7 @@ from urllib3.util.retry import Retry
 from core.api.models.user import UserRequest
 from core.config.config import ConfigLoader, RunCfg
 from core.providers.data_generator import generate_user_request
-from core.util.html_report.decorators import html_step
+from core.util.html_report.decorators import step
 from core.util.logging import Logger
 
 StatusSpec = Union[int, Sequence[int], Set[int]]
@@ -130,8 +130,7 @@ class HttpClient:
         self.log.info("Token for default user acquired successfully")
         return self
 
-    @html_step("Base http client: Return generated token")
-    @allure.step("Base http client: Return generated token")
+    @step("Base http client: Return generated token")
     def _generate_token(self, body: UserRequest) -> str:
         r = self.get_generate_token_response(body)
         token = (r.json() or {}).get("token")
@@ -140,14 +139,13 @@ class HttpClient:
             raise AssertionError(f"Token not returned: {_shorten(r.text)}")
         return token
 
-    @html_step("Base http client: Get generate token response")
-    @allure.step("Base http client: Get generate token response")
+    @step("Base http client: Get generate token response")
     def get_generate_token_response(self, body: Dict[str, Any] | UserRequest, expect: StatusSpec = 200) -> Response:
         payload = body.to_dict() if isinstance(body, UserRequest) else body
         return self.post("/Account/v1/GenerateToken", payload=payload, expected_status_code=expect)
 
     # ---------- low-level ----------
-    @allure.step("send {method} request to {endpoint}")
+    @step("send {method} request to {endpoint}", capture_size=True)
     def request(
             self,
             method: str,
@@ -159,6 +157,7 @@ class HttpClient:
             headers: Optional[Mapping[str, str]] = None,
             expected_status_code: Optional[StatusSpec] = None,
             timeout: Optional[float] = None,
+            stream: bool = False,
     ) -> Response:
         url = f"{self.base}{endpoint}"
         req_headers: MutableMapping[str, str] = {}
@@ -177,12 +176,15 @@ class HttpClient:
         resp = self.s.request(
             method=method.upper(), url=url, params=params, json=json, data=data,
             headers=req_headers or None, timeout=float(self.timeout if timeout is None else timeout),
+            stream=stream,
         )
 
         self.log.info(f"← {resp.status_code} {method.upper()} {url} elapsed={getattr(resp, 'elapsed', None)}")
         if expected_status_code is not None:
             allowed = _as_set(expected_status_code)
             if resp.status_code not in allowed:
+                if stream:
+                    _ = resp.content  # unexpected status: body is small, load it for the preview
                 try:
                     preview = _shorten(str(resp.json()))
                 except Exception:
@@ -191,27 +193,24 @@ class HttpClient:
         return resp
 
     # ---------- convenience verbs ----------
-    @html_step("send POST request to endpoint")
-    @allure.step("send POST request to {endpoint}")
     def post(self, endpoint: str, payload: Optional[Any] = None, data_obj: Optional[Any] = None,
              headers: Optional[Mapping[str, str]] = None,
              expected_status_code: Union[int, Sequence[int], Set[int], None] = 200) -> Response:
         return self.request("POST", endpoint, json=payload, data=data_obj, headers=headers,
                             expected_status_code=expected_status_code)
 
-    @allure.step("send GET request to {endpoint}")
     def get(self, endpoint: str, payload: Optional[Mapping[str, Any]] = None,
             headers: Optional[Mapping[str, str]] = None,
-            expected_status_code: Union[int, Sequence[int], Set[int], None] = 200) -> Response:
-        return self.request("GET", endpoint, params=payload, headers=headers, expected_status_code=expected_status_code)
+            expected_status_code: Union[int, Sequence[int], Set[int], None] = 200,
+            stream: bool = False) -> Response:
+        return self.request("GET", endpoint, params=payload, headers=headers, expected_status_code=expected_status_code,
+                            stream=stream)
 
-    @allure.step("send PUT request to {endpoint}")
     def put(self, endpoint: str, payload: Optional[Any] = None,
             headers: Optional[Mapping[str, str]] = None,
             expected_status_code: Union[int, Sequence[int], Set[int], None] = 200) -> Response:
         return self.request("PUT", endpoint, json=payload, headers=headers, expected_status_code=expected_status_code)
 
-    @allure.step("send DELETE request to {endpoint}")
     def delete(self, endpoint: str, params=None, token: str | None = None,
                expected_status_code: Union[int, Sequence[int], Set[int], None] = 204) -> Response:
         if token:
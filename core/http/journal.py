@@ -0,0 +1,238 @@
+"""
+Indexed journal of every HTTP exchange of a run, for post-hoc lookups across thousands of tests.
+
+Each process (xdist worker) appends to `target/http-journal/`:
+    journal.<worker>.ndjson   one JSON entry per exchange: test id, time, method, templated path, status,
+                              latency, sizes (and body locations when bodies are stored)
+    journal.<worker>.idx      fixed-size binary records (offset, length, time, latency, status) per entry
+    journal.<worker>.bodies   zlib-compressed request / response bodies (`--http-journal-bodies`)
+
+Queries scan the memory-mapped index and decode only the JSON lines that pass its filters:
+    python -m core.http.journal --status 5xx --path /Account/v1/User --min-ms 2000
+    python -m core.http.journal --test test_add_book --bodies
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from requests import Response
+
+from core.config.config import ConfigLoader
+from core.http.hooks import install_response_hook
+from core.http.latency import templated_path
+from core.util.logging import Logger, worker_name
+
+# offset, length (in the .ndjson file), start (epoch s), latency (ms), status
+_INDEX = struct.Struct("<QIdfH2x")
+
+
+def _body_bytes(body: Any) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return body if isinstance(body, bytes) else b""  # generators / files are not replayable
+
+
+def _current_test() -> str:
+    # "tests/api/test_x.py::test_y (call)" — set by pytest for the running test
+    return os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" (", 1)[0]
+
+
+class HttpJournal:
+    """Append-only journal of one process; installed as a requests 'response' hook."""
+    log = Logger.get_logger("HttpJournal", prefix="HTTP")
+
+    DEFAULT_DIR: Path = ConfigLoader.PROJECT_ROOT / "target" / "http-journal"
+
+    def __init__(self, out_dir: Optional[Path] = None, *, store_bodies: bool = False,
+                 worker: Optional[str] = None) -> None:
+        self.out_dir = out_dir or self.DEFAULT_DIR
+        self.store_bodies = store_bodies
+        self.worker = worker or worker_name()
+        self.entries = 0
+        self._lock = threading.Lock()
+        self._files: Optional[Tuple[IO[bytes], IO[bytes], IO[bytes]]] = None
+
+    @classmethod
+    def reset(cls, out_dir: Optional[Path] = None) -> None:
+        """Remove the journals of a previous run (controller, before workers start)."""
+        for path in (out_dir or cls.DEFAULT_DIR).glob("journal.*"):
+            path.unlink(missing_ok=True)
+
+    def _open(self) -> Tuple[IO[bytes], IO[bytes], IO[bytes]]:
+        if self._files is None:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            base = self.out_dir / f"journal.{self.worker}"
+            self._files = (Path(f"{base}.ndjson").open("ab"), Path(f"{base}.idx").open("ab"),
+                           Path(f"{base}.bodies").open("ab"))
+        return self._files
+
+    def _store_body(self, fh: IO[bytes], data: bytes) -> Optional[List[int]]:
+        if not data:
+            return None
+        blob = zlib.compress(data, 6)
+        offset = fh.tell()
+        fh.write(blob)
+        return [offset, len(blob)]
+
+    def _record_exchange(self, resp: Response, *args: Any, **kwargs: Any) -> None:
+        """Requests 'response' hook."""
+        request = resp.request
+        elapsed = getattr(resp, "elapsed", None)
+        if elapsed is None or request is None:
+            return
+        elapsed_ms = elapsed.total_seconds() * 1000
+        started = time.time() - elapsed_ms / 1000
+        req_body = _body_bytes(request.body)
+        # non-streamed bodies are read by requests right after the hooks anyway
+        resp_body = resp.content if not kwargs.get("stream") else b""
+        length = resp.headers.get("Content-Length")
+        entry: Dict[str, Any] = {
+            "test": _current_test(), "w": self.worker, "ts": round(started, 3), "m": request.method or "GET",
+            "p": templated_path(request.url or ""), "url": request.url, "st": resp.status_code,
+            "ms": round(elapsed_ms, 1), "rq": len(req_body),
+            "rs": len(resp_body) if resp_body or not length else int(length),
+        }
+        with self._lock:
+            journal, index, bodies = self._open()
+            if self.store_bodies:
+                entry["rqb"] = self._store_body(bodies, req_body)
+                entry["rsb"] = self._store_body(bodies, resp_body)
+            line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            offset = journal.tell()
+            journal.write(line)
+            index.write(_INDEX.pack(offset, len(line), started, elapsed_ms, resp.status_code))
+            self.entries += 1
+
+    def install(self, session: Any) -> None:
+        """Register response hook on a given Session (idempotent)."""
+        install_response_hook(session, self._record_exchange)
+
+    def flush(self) -> None:
+        """Make the entries of the finished test visible to readers (index last: it points into the journal)."""
+        with self._lock:
+            if self._files is not None:
+                journal, index, bodies = self._files
+                bodies.flush()
+                journal.flush()
+                index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._files is None:
+                return
+            for fh in self._files:
+                fh.close()
+            self._files = None
+        self.log.debug(f"HTTP journal: {self.entries} exchanges -> {self.out_dir}")
+
+
+# ---------- query ----------
+@dataclass
+class JournalQuery:
+    status: Optional[str] = None  # "503", "5xx", "4xx"
+    path: Optional[str] = None  # substring of the templated path (or of the URL)
+    method: Optional[str] = None
+    min_ms: float = 0.0
+    test: Optional[str] = None
+    since: float = 0.0  # epoch seconds
+
+    def status_range(self) -> Tuple[int, int]:
+        if not self.status:
+            return 0, 999
+        if self.status.lower().endswith("xx"):
+            first = int(self.status[0]) * 100
+            return first, first + 99
+        return int(self.status), int(self.status)
+
+    def matches(self, entry: Dict[str, Any]) -> bool:
+        return ((not self.path or self.path in entry["p"] or self.path in entry.get("url", ""))
+                and (not self.method or entry["m"].upper() == self.method.upper())
+                and (not self.test or self.test in entry["test"]))
+
+
+def _mapped(path: Path) -> Optional[mmap.mmap]:
+    if not path.exists() or path.stat().st_size == 0:
+        return None
+    with path.open("rb") as fh:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_entries(out_dir: Path, query: JournalQuery) -> Iterator[Dict[str, Any]]:
+    """Entries of all worker journals that match `query`; index filters run before any JSON is decoded."""
+    lo, hi = query.status_range()
+    for idx_path in sorted(out_dir.glob("journal.*.idx")):
+        index, journal = _mapped(idx_path), _mapped(idx_path.with_suffix(".ndjson"))
+        if index is None or journal is None:
+            continue
+        try:
+            usable = len(index) - len(index) % _INDEX.size  # ignore a partially written tail record
+            for pos in range(0, usable, _INDEX.size):
+                offset, length, started, elapsed_ms, status = _INDEX.unpack_from(index, pos)
+                if not lo <= status <= hi or elapsed_ms < query.min_ms or started < query.since:
+                    continue
+                if offset + length > len(journal):
+                    break
+                entry = json.loads(journal[offset:offset + length])
+                if query.matches(entry):
+                    entry["_bodies"] = str(idx_path.with_suffix(".bodies"))
+                    yield entry
+        finally:
+            index.close()
+            journal.close()
+
+
+def read_body(bodies_path: str, location: Optional[Sequence[int]]) -> str:
+    if not location:
+        return ""
+    with open(bodies_path, "rb") as fh:
+        fh.seek(location[0])
+        return zlib.decompress(fh.read(location[1])).decode("utf-8", errors="replace")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.http.journal",
+                                     description="Query the HTTP exchange journal of the last run.")
+    parser.add_argument("--dir", type=Path, default=HttpJournal.DEFAULT_DIR, help="journal directory")
+    parser.add_argument("--status", help="status code or class, e.g. 404, 5xx")
+    parser.add_argument("--path", help="substring of the templated path, e.g. /Account/v1/User")
+    parser.add_argument("--method")
+    parser.add_argument("--min-ms", type=float, default=0.0, help="only exchanges slower than this")
+    parser.add_argument("--test", help="substring of the test node id")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--bodies", action="store_true", help="print stored bodies (truncated)")
+    args = parser.parse_args(argv)
+
+    query = JournalQuery(status=args.status, path=args.path, method=args.method, min_ms=args.min_ms, test=args.test)
+    shown = 0
+    for entry in iter_entries(args.dir, query):
+        stamp = time.strftime("%H:%M:%S", time.localtime(entry["ts"])) + f".{int(entry['ts'] * 1000) % 1000:03d}"
+        print(f"{stamp} {entry['w']:<5} {entry['st']} {entry['ms']:>8.1f}ms {entry['m']:<6} {entry['p']} "
+              f"req={entry['rq']}B resp={entry['rs']}B  {entry['test']}")
+        if args.bodies:
+            for key in ("rqb", "rsb"):
+                body = read_body(entry["_bodies"], entry.get(key))
+                if body:
+                    print(f"    {'request ' if key == 'rqb' else 'response'}: {body[:500]}")
+        shown += 1
+        if shown >= args.limit:
+            break
+    if not shown:
+        print("No matching exchanges.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
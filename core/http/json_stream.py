@@ -0,0 +1,134 @@
+"""Incremental JSON decoding: yield items of a top-level array without loading the whole body."""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional
+
+_WS = " \t\r\n"
+
+
+class _KeyScanner:
+    """
+    Finds `"key": [` among the members of the top-level object, fed text piece by piece.
+
+    Tracks string and object/array nesting, so the same key inside a nested value (or inside a
+    string) does not match; only the key being read is buffered.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.depth = 0
+        self.in_str = False
+        self.escape = False
+        self.expect_key = False  # at depth 1, after `{` or `,`
+        self.reading_key = False
+        self.raw_key = ""
+        self.last_key: Optional[str] = None
+        self.matched = False  # `"key":` seen, its value not started yet
+
+    def feed(self, text: str) -> Optional[int]:
+        """Index just past the `[` of the array under `key`, or None when `text` does not reach it."""
+        for i, c in enumerate(text):
+            if self.in_str:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_str = False
+                    if self.reading_key:
+                        self.reading_key = False
+                        self.last_key = self._decode_key()
+                        continue
+                if self.reading_key:
+                    self.raw_key += c
+                continue
+            if c in _WS:
+                continue
+            if self.depth == 1:
+                if c == ":":
+                    self.matched = self.last_key == self.key
+                    self.last_key = None
+                    continue
+                if c == ",":
+                    self.expect_key = True
+                    continue
+                if c == '"' and self.expect_key:
+                    self.expect_key = False
+                    self.in_str = self.reading_key = True
+                    self.raw_key = ""
+                    continue
+                if c == "[" and self.matched:
+                    return i + 1
+                self.matched = False
+            if c == '"':
+                self.in_str = True
+            elif c in "{[":
+                self.depth += 1
+                self.expect_key = self.depth == 1 and c == "{"
+            elif c in "}]":
+                self.depth -= 1
+        return None
+
+    def _decode_key(self) -> Optional[str]:
+        try:
+            key: str = json.loads(f'"{self.raw_key}"')
+        except ValueError:
+            return None
+        return key
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Yield items of the array stored under `key` of the top-level object (e.g. {"books": [...]}) one by one;
+    the same key in a nested value does not match.
+
+    Memory stays bounded by the largest single item: consumed text is dropped from the
+    buffer as soon as an item is decoded. Stopping iteration early stops reading `chunks`.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    scanner = _KeyScanner(key)
+
+    buf = ""
+    in_array = False
+    exhausted = False
+    it = iter(chunks)
+
+    while True:
+        if not in_array:
+            found = scanner.feed(buf)
+            if found is not None:
+                buf = buf[found:]
+                in_array = True
+                continue
+            # the scanner keeps its own state: nothing before the array is needed again
+            buf = ""
+        else:
+            pos = 0
+            while pos < len(buf) and (buf[pos] in _WS or buf[pos] == ","):
+                pos += 1
+            buf = buf[pos:]
+            if buf.startswith("]"):
+                return
+            if buf:
+                try:
+                    item, end = decoder.raw_decode(buf)
+                except json.JSONDecodeError:
+                    item, end = None, -1
+                # a value that touches the end of the buffer may still be incomplete
+                if end != -1 and (end < len(buf) or exhausted):
+                    yield item
+                    buf = buf[end:]
+                    continue
+
+        if exhausted:
+            raise ValueError(f"Unexpected end of JSON stream while reading '{key}' array")
+        chunk = next(it, None)
+        if chunk is None:
+            exhausted = True
+            buf += text.decode(b"", final=True)
+        else:
+            buf += text.decode(chunk)
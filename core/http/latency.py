@@ -0,0 +1,56 @@
+"""Per-endpoint HTTP latency samples collected by a requests response hook."""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from requests import Response, Session
+
+from core.http.hooks import install_response_hook
+
+# path segments that identify a resource rather than an endpoint: uuids, hex ids, numbers, ISBN-like
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F-]{16,}|\d+|97[89]\d{10})$")
+
+
+def templated_path(url: str) -> str:
+    """'/Account/v1/User/{id}' — ids in the path are folded so samples of one endpoint aggregate."""
+    parts = ["{id}" if _ID_SEGMENT.match(p) else p for p in urlsplit(url).path.split("/")]
+    return "/".join(parts) or "/"
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """'GET /Account/v1/User/{id}'."""
+    return f"{method.upper()} {templated_path(url)}"
+
+
+class LatencyRecorder:
+    """
+    Collects `resp.elapsed` (request sent -> response headers parsed) per endpoint.
+    The root conftest drains the samples into each test's report, so they reach the xdist controller.
+    """
+
+    def __init__(self) -> None:
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _record_latency(self, resp: Response, *args: Any, **kwargs: Any) -> None:
+        """Requests 'response' hook."""
+        elapsed = getattr(resp, "elapsed", None)
+        if elapsed is None or resp.request is None:
+            return
+        key = endpoint_key(resp.request.method or "GET", resp.request.url or "")
+        with self._lock:
+            self._samples.setdefault(key, []).append(round(elapsed.total_seconds() * 1000, 1))
+
+    def drain(self) -> Dict[str, List[float]]:
+        """Samples recorded since the previous call (ms per endpoint)."""
+        with self._lock:
+            samples, self._samples = self._samples, {}
+        return samples
+
+    def install(self, session: Session) -> None:
+        """Register response hook on a given Session (idempotent)."""
+        install_response_hook(session, self._record_latency)
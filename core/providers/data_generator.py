@@ -1,13 +1,30 @@
 from __future__ import annotations
 
 import datetime
+import itertools
+import os
 import random
 import string
+import uuid
+from typing import Iterator
 
 import allure
 
 from core.api.models.user import UserRequest
-from core.util.html_report.decorators import html_step
+from core.util.html_report.decorators import step
+
+
+# Per-process sequence + run tag: names stay unique across xdist workers without timestamps.
+_BATCH_SEQ = itertools.count(1)
+_SEEDED_BATCH_SEQ = itertools.count(1)
+_RUN_TAG = (os.getenv("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex)[:6]
+_PWD_CORE = "1Aa@"
+_PWD_ALPHABET = string.ascii_letters + string.digits + "_-"
+
+
+def worker_id() -> str:
+    """xdist worker id (gw0, gw1, ...) or 'main' when running without xdist."""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
 
 
 def now_suffix() -> str:
@@ -22,19 +39,16 @@ def random_username(prefix: str = "auto_user") -> str:
 
 @allure.step("Generate a random valid password")
 def generate_password() -> str:
-    core = "1Aa@"
-    tail = ''.join(random.choices(string.ascii_letters + string.digits + "_-", k=9))
-    return core + tail
+    tail = ''.join(random.choices(_PWD_ALPHABET, k=9))
+    return _PWD_CORE + tail
 
 
-@html_step("Generate a random user request dict")
-@allure.step("Generate a random user request dict")
+@step("Generate a random user request dict")
 def generate_user_request_dict() -> dict:
     return {"userName": random_username(), "password": generate_password()}
 
 
-@html_step("Generate a random user request object")
-@allure.step("Generate a random user request object")
+@step("Generate a random user request object")
 def generate_user_request(userName: str | None = None,
                           password: str | None = None) -> UserRequest:
     return UserRequest(
@@ -43,13 +57,42 @@ def generate_user_request(userName: str | None = None,
     )
 
 
+@step("Generate a batch of {count} unique user requests")
+def generate_user_requests(count: int, *, prefix: str = "auto_user", seed: int | None = None) -> list[UserRequest]:
+    """
+    Generate `count` unique UserRequest objects in one step (no per-item step/report overhead).
+
+    Usernames look like `<prefix>_<worker>_<run tag>_<n>`: the xdist worker id plus a per-process
+    counter guarantee uniqueness inside a run; the run tag separates runs (the backend is shared, so
+    names are never reproduced). With `seed`, passwords come from the seed and names are numbered
+    1..count inside the batch (`..._s<seed>b<batch>_<i>`), independent of other callers.
+    """
+    return build_user_requests(count, prefix=prefix, seed=seed)
+
+
+def build_user_requests(count: int, *, prefix: str = "auto_user", seed: int | None = None) -> list[UserRequest]:
+    """Step-free variant of `generate_user_requests`, safe to call from helper threads."""
+    if count < 0:
+        raise ValueError(f"count must be >= 0, got {count}")
+    rng = random.Random(seed)
+    head = f"{prefix}_{worker_id()}_{_RUN_TAG}"
+    if seed is None:
+        numbers: Iterator[str] = (str(next(_BATCH_SEQ)) for _ in range(count))
+    else:
+        batch = f"s{seed}b{next(_SEEDED_BATCH_SEQ)}"  # same seed twice in a run: still distinct names
+        numbers = (f"{batch}_{i}" for i in range(1, count + 1))
+    return [
+        UserRequest(userName=f"{head}_{n}", password=_PWD_CORE + "".join(rng.choices(_PWD_ALPHABET, k=9)))
+        for n in numbers
+    ]
+
+
 @allure.step("Get a defined delete user books dict")
 def get_delete_user_book_dict(user_id: str) -> dict:
     return {"userId": user_id, "message": f"Delete message for user with id:`{user_id}`"}
 
 
-@html_step("Get a iso-date string with defined day shift")
-@allure.step("Get a iso-date string with defined day shift")
+@step("Get a iso-date string with defined day shift")
 def iso_date_plus_days(days: int = 1, base: datetime.datetime | None = None) -> str:
     """
     Return ISO date string (YYYY-MM-DD) for base + days.
@@ -0,0 +1,163 @@
+"""
+API-seeded UI authentication without extra page loads.
+
+DemoQA keeps the session in cookies (`token`, `userName`, `userID`, `expires`) and the same keys in
+localStorage. On Chromium browsers `AuthInjector.seed()` sets the cookies through CDP
+`Network.setCookies` and registers the localStorage writes with `Page.addScriptToEvaluateOnNewDocument`,
+so the first navigation of the test already lands logged in. The script seeds a tab once (a
+sessionStorage marker), so a test that logs out stays logged out; `release()` removes it.
+Other browsers fall back to one lightweight same-origin navigation (`seed_in_page`).
+
+Tokens come from `TokenCache`: one GenerateToken call per user until shortly before the token
+expires, shared by xdist workers and later runs through `target/auth/tokens.json`.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from core.api.clients.account_client import AccountClient
+from core.api.models.user import UserRequest
+from core.config.config import ConfigLoader, RunCfg
+from core.ui.browser import is_chromium
+from core.util.logging import Logger
+from core.util.support.shared_store import SharedJsonStore
+
+# seeds localStorage once per tab of the app origin, before any page script runs
+_SEED_JS = """
+(() => {
+  if (location.origin !== %(origin)s) { return; }
+  try {
+    if (sessionStorage.getItem('__authSeeded')) { return; }
+    sessionStorage.setItem('__authSeeded', '1');
+    const items = %(items)s;
+    for (const key of Object.keys(items)) { localStorage.setItem(key, items[key]); }
+  } catch (e) {}
+})();
+"""
+
+_SET_STORAGE_JS = "const items = arguments[0]; for (const k of Object.keys(items)) { localStorage.setItem(k, items[k]); }"
+
+
+@dataclass(frozen=True)
+class UiAuth:
+    """Logged-in UI user; `expires` is the token expiry reported by the API."""
+    user_id: str
+    user_name: str
+    token: str
+    expires: str
+
+    def cookies(self) -> Dict[str, str]:
+        """Cookie values the DemoQA front-end reads (`expires`: next day, URL-encoded, as the cookie login always set it)."""
+        return {
+            "token": self.token,
+            "userName": self.user_name,
+            "userID": self.user_id,
+            "expires": f"{(dt.date.today() + dt.timedelta(days=1)).isoformat()}T23%3A59%3A59",
+        }
+
+    def storage(self) -> Dict[str, str]:
+        """localStorage values: same keys, `expires` is the ISO expiry reported by the API."""
+        return {**self.cookies(), "expires": self.expires}
+
+
+def _expires_at(value: str) -> float:
+    try:
+        return dt.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return dt.datetime.now().timestamp() + 3600  # unknown format: trust it for an hour
+
+
+class TokenCache:
+    """
+    UI user tokens per user name; renewed `margin_s` before they expire.
+    Each instance keeps the tokens it has looked up: a valid token is not read from the store again.
+    """
+    log = Logger.get_logger("TokenCache", prefix="UI")
+
+    DEFAULT_PATH: Path = ConfigLoader.PROJECT_ROOT / "target" / "auth" / "tokens.json"
+
+    def __init__(self, path: Optional[Path] = None, *, margin_s: float = 600,
+                 fetch: Optional[Callable[[str, str], Dict[str, Any]]] = None) -> None:
+        self.path = path or self.DEFAULT_PATH
+        self.margin_s = margin_s
+        self.fetch = fetch or self._generate_token
+        self._memo: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, cfg: RunCfg) -> UiAuth:
+        entry = self._memo.get(cfg.ui_user_name)
+        if entry is None or not self._valid(entry):
+            entry = self._memo[cfg.ui_user_name] = self._from_store(cfg)
+        return UiAuth(user_id=cfg.ui_user_id or "", user_name=cfg.ui_user_name, token=entry["token"],
+                      expires=entry["expires"])
+
+    def _valid(self, entry: Dict[str, Any]) -> bool:
+        return _expires_at(entry.get("expires", "")) - dt.datetime.now().timestamp() > self.margin_s
+
+    def _from_store(self, cfg: RunCfg) -> Dict[str, Any]:
+        with SharedJsonStore(self.path, lock_timeout=60).update() as data:
+            entry = data.get(cfg.ui_user_name)
+            if entry and self._valid(entry):
+                return dict(entry)
+            fetched = self.fetch(cfg.ui_user_name, cfg.ui_user_password)
+            entry = data[cfg.ui_user_name] = {"token": fetched["token"], "expires": fetched.get("expires", "")}
+        self.log.info(f"New UI token for {cfg.ui_user_name}, expires {entry['expires'] or 'unknown'}")
+        return dict(entry)
+
+    @staticmethod
+    def _generate_token(user_name: str, password: str) -> Dict[str, Any]:
+        body = UserRequest(userName=user_name, password=password)
+        data = AccountClient().generate_token_response(body, expect=200).json() or {}
+        if not data.get("token"):
+            raise AssertionError(f"Token not returned for {user_name}: {str(data)[:300]}")
+        return data
+
+
+class AuthInjector:
+    log = Logger.get_logger("AuthInjector", prefix="UI")
+
+    def __init__(self, driver: Any, web_url: str) -> None:
+        self.driver = driver
+        self.web_url = web_url.rstrip("/")
+        parts = urlsplit(self.web_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self._script_id: Optional[str] = None
+
+    def seed(self, auth: UiAuth) -> bool:
+        """Cookies + storage before the first navigation (Chromium); False when the browser has no CDP."""
+        if not is_chromium(self.driver):
+            return False
+        cookies: List[Dict[str, Any]] = [{"name": k, "value": v, "url": self.origin, "path": "/"}
+                                         for k, v in auth.cookies().items()]
+        try:
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            source = _SEED_JS % {"origin": json.dumps(self.origin), "items": json.dumps(auth.storage())}
+            result = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        except Exception as e:
+            self.log.warning(f"CDP auth seeding failed, falling back to a navigation: {e}")
+            return False
+        self._script_id = result.get("identifier")
+        return True
+
+    def seed_in_page(self, auth: UiAuth) -> None:
+        """Fallback: one lightweight same-origin navigation, then cookies and storage through WebDriver."""
+        self.driver.get(self.web_url + "/images/Toolsqa.jpg")
+        self.driver.delete_all_cookies()
+        for name, value in auth.cookies().items():
+            self.driver.add_cookie({"name": name, "value": value, "path": "/"})
+        self.driver.execute_script(_SET_STORAGE_JS, auth.storage())
+
+    def release(self) -> None:
+        """Stop seeding new documents (the current tab keeps its session)."""
+        if self._script_id is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id})
+        except Exception as e:
+            self.log.debug(f"Could not remove the auth seed script: {e}")
+        self._script_id = None
@@ -0,0 +1,110 @@
+"""
+Batched DOM commands: many element reads or input fills in one `execute_script` round-trip.
+
+Locators are translated to CSS / XPath (`dom_query`) and resolved in the page. Visibility follows
+the same rule as the wait engine (rendered box, not `visibility: hidden` / `display: none`), and a
+script result names every locator that was missing or not interactable, so callers can poll it
+through `WaitEngine.until` and raise one clear error listing all of them.
+
+`fill_inputs` sets values through the native `value` setter and dispatches `input` / `change`
+events (what React-controlled inputs listen to); it does not emit key events, so keystroke-driven
+widgets still need `send_keys`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from selenium.webdriver.common.by import By
+
+Locator = Tuple[str, str]
+
+# shared by page scripts: find(query, all) and shown(el)
+FIND_JS = """
+const find = (q, all) => {
+  if (q.css !== undefined) { return all ? Array.from(document.querySelectorAll(q.css)) : [document.querySelector(q.css)].filter(Boolean); }
+  const r = document.evaluate(q.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  const out = [];
+  for (let i = 0; i < (all ? r.snapshotLength : Math.min(1, r.snapshotLength)); i++) { out.push(r.snapshotItem(i)); }
+  return out;
+};
+const shown = el => {
+  const style = window.getComputedStyle(el);
+  return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+};
+"""
+
+# arguments: query, attribute names, visible only -> [{text, attrs}] of every matching element
+_READ_JS = FIND_JS + """
+const [q, names, visibleOnly] = arguments;
+return find(q, true).filter(el => !visibleOnly || shown(el)).map(el => {
+  const attrs = {};
+  for (const n of names) { attrs[n] = el.getAttribute(n); }
+  return {text: (el.innerText ?? el.textContent ?? '').trim(), attrs: attrs};
+});
+"""
+
+# arguments: [[query, value]] -> {missing: [i], blocked: [i]}; values are set only when every input is usable
+_FILL_JS = FIND_JS + """
+const pairs = arguments[0];
+const missing = [], blocked = [], found = [];
+pairs.forEach(([q, value], i) => {
+  const el = find(q, false)[0];
+  if (!el) { missing.push(i); return; }
+  if (!shown(el) || el.disabled || el.readOnly) { blocked.push(i); return; }
+  found.push([el, value]);
+});
+if (missing.length || blocked.length) { return {missing: missing, blocked: blocked}; }
+for (const [el, value] of found) {
+  const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+  el.focus();
+  Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return {missing: [], blocked: []};
+"""
+
+
+def dom_query(locator: Locator) -> Optional[Dict[str, str]]:
+    """Locator as CSS / XPath for page scripts; None when it has no DOM equivalent."""
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return {"css": value}
+    if by == By.XPATH:
+        return {"xpath": value}
+    if by == By.ID:
+        return {"css": f'[id="{value}"]'}
+    if by == By.NAME:
+        return {"css": f'[name="{value}"]'}
+    if by == By.CLASS_NAME:
+        return {"css": f".{value}"}
+    if by == By.TAG_NAME:
+        return {"css": value}
+    return None
+
+
+def _required_query(locator: Locator) -> Dict[str, str]:
+    query = dom_query(locator)
+    if query is None:
+        raise ValueError(f"Locator cannot be batched (no CSS/XPath form): {locator}")
+    return query
+
+
+def read_elements(driver: Any, locator: Locator, attributes: Sequence[str] = (), *,
+                  visible_only: bool = True) -> List[Dict[str, Any]]:
+    """`[{"text": ..., "attrs": {name: value}}]` of all elements matching `locator`, one round-trip."""
+    return list(driver.execute_script(_READ_JS, _required_query(locator), list(attributes), visible_only) or [])
+
+
+def fill_inputs(driver: Any, values: Mapping[Locator, str]) -> Dict[str, List[Locator]]:
+    """
+    Fill all inputs in one round-trip, or none of them.
+
+    Returns `{"missing": [...], "blocked": [...]}` (locators not found / hidden, disabled or read-only);
+    both lists empty means every value was set.
+    """
+    locators = list(values)
+    pairs = [[_required_query(locator), str(values[locator])] for locator in locators]
+    result = driver.execute_script(_FILL_JS, pairs) or {}
+    return {key: [locators[i] for i in result.get(key, [])] for key in ("missing", "blocked")}
@@ -0,0 +1,12 @@
+"""Browser capability checks shared by the UI helpers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+_CHROMIUM = ("chrome", "msedge", "edge", "chromium")
+
+
+def is_chromium(driver: Any) -> bool:
+    """True for Chromium-based browsers (Chrome, Edge), which support CDP commands and performance logs."""
+    return (driver.capabilities or {}).get("browserName", "").lower() in _CHROMIUM
@@ -0,0 +1,74 @@
+"""
+WebDriver binary resolution shared by all processes of a run (and by later runs).
+
+webdriver-manager's `install()` looks up versions online on every call. Here a binary is resolved
+once: a pinned path wins; otherwise `target/webdriver/manifest.json` remembers the resolved path per
+browser (the manifest lock makes concurrent xdist workers wait for the first resolution). In strict
+offline mode only the pinned path or a cached entry is used and the network is never touched.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+from core.config.config import ConfigLoader
+from core.util.logging import Logger
+from core.util.support.shared_store import SharedJsonStore
+
+_MANAGERS: Dict[str, Callable[[], Any]] = {
+    "chrome": ChromeDriverManager,
+    "firefox": GeckoDriverManager,
+    "edge": EdgeChromiumDriverManager,
+}
+
+
+class DriverBinaryResolver:
+    log = Logger.get_logger("DriverBinaries", prefix="UI")
+
+    DEFAULT_MANIFEST: Path = ConfigLoader.PROJECT_ROOT / "target" / "webdriver" / "manifest.json"
+
+    # per process: a resolved path is not looked up again
+    _resolved: Dict[str, str] = {}
+
+    def __init__(self, manifest: Optional[Path] = None, *, pinned_path: Optional[str] = None,
+                 offline: bool = False, max_age_s: float = 7 * 24 * 3600) -> None:
+        self.manifest = manifest or self.DEFAULT_MANIFEST
+        self.pinned_path = pinned_path
+        self.offline = offline
+        self.max_age_s = max_age_s
+
+    def resolve(self, browser: str) -> str:
+        if self.pinned_path:
+            if not Path(self.pinned_path).is_file():
+                raise FileNotFoundError(f"Pinned driver binary not found: {self.pinned_path}")
+            return self.pinned_path
+        if browser not in _MANAGERS:
+            raise ValueError(f"Unsupported browser for driver resolution: {browser}")
+        path = self._resolved.get(browser)
+        if path is None:
+            path = self._resolved[browser] = self._from_manifest(browser)
+        return path
+
+    def _from_manifest(self, browser: str) -> str:
+        # the lock is held during the download: it must not look stale to the workers waiting for it
+        with SharedJsonStore(self.manifest, lock_timeout=300, stale_after=900).update() as data:
+            entry = data.get(browser) or {}
+            cached = entry.get("path")
+            if cached and Path(cached).is_file():
+                fresh = time.time() - float(entry.get("resolved", 0)) < self.max_age_s
+                if fresh or self.offline:
+                    return str(cached)
+            if self.offline:
+                raise RuntimeError(f"Offline mode: no cached {browser} driver in {self.manifest}; "
+                                   f"run once online or pass --driver-path")
+            started = time.perf_counter()
+            path = str(_MANAGERS[browser]().install())
+            data[browser] = {"path": path, "resolved": time.time()}
+        self.log.info(f"{browser} driver resolved in {time.perf_counter() - started:.1f}s: {path}")
+        return path
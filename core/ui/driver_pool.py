@@ -0,0 +1,186 @@
+"""
+Browser lifecycle per process (xdist worker): one browser reused across UI tests with a state reset
+between tests (`ReusableDriver`), and browsers launched ahead of time in the background
+(`BrowserPrewarmPool`).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Optional, Tuple
+
+from core.ui.browser import is_chromium
+from core.util.logging import Logger
+
+# browser storage of the page that is open when a test ends
+_CLEAR_STORAGE_JS = "try { window.localStorage.clear(); } catch (e) {} try { window.sessionStorage.clear(); } catch (e) {}"
+LAUNCHED, REUSED, RELAUNCHED, PREWARMED = "launched", "reused", "relaunched", "prewarmed"
+
+
+class ReusableDriver:
+    """
+    Hands the same WebDriver to consecutive tests of one process.
+
+    `acquire()` health-checks the kept browser and launches a replacement when it crashed or its
+    session is gone; `release()` resets it for the next test: extra windows closed, cookies,
+    localStorage and sessionStorage cleared, about:blank, window size and implicit wait restored.
+    A browser that cannot be reset is quit, so the next test starts a fresh one.
+    """
+    log = Logger.get_logger("ReusableDriver", prefix="UI")
+
+    def __init__(self, factory: Callable[[], Any], *, window_size: Tuple[int, int], implicit_wait: float) -> None:
+        self.factory = factory
+        self.window_size = window_size
+        self.implicit_wait = implicit_wait
+        self.driver: Optional[Any] = None
+        self.last_event = LAUNCHED
+        self.counts: Counter[str] = Counter()
+
+    def acquire(self) -> Any:
+        if self.driver is not None and self.healthy(self.driver):
+            self.last_event = REUSED
+        else:
+            self.last_event = LAUNCHED
+            if self.driver is not None:
+                self.log.warning("Browser failed the health check, launching a replacement")
+                self._quit()
+                self.last_event = RELAUNCHED
+            self.driver = self.factory()
+        self.counts[self.last_event] += 1
+        return self.driver
+
+    def release(self) -> None:
+        if self.driver is None:
+            return
+        try:
+            self.reset(self.driver)
+        except Exception as e:
+            self.log.warning(f"Browser state reset failed, it will be replaced: {e}")
+            self._quit()
+
+    @staticmethod
+    def healthy(driver: Any) -> bool:
+        try:
+            return bool(driver.window_handles) and driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset(self, driver: Any) -> None:
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+        # storage is per origin: clear it while the test's page is still open
+        with contextlib.suppress(Exception):
+            driver.execute_script(_CLEAR_STORAGE_JS)
+        if is_chromium(driver):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        driver.set_window_size(*self.window_size)
+        driver.implicitly_wait(self.implicit_wait)
+
+    def _quit(self) -> None:
+        if self.driver is not None:
+            with contextlib.suppress(Exception):
+                self.driver.quit()
+        self.driver = None
+
+    def close(self) -> None:
+        self._quit()
+
+
+class BrowserPrewarmPool:
+    """
+    Keeps `spares` browsers launching / launched in background threads, started with the session so
+    the first launch overlaps collection and session fixtures, and every later one the previous test.
+
+    `take()` hands out the oldest launch (waiting for it if it is not ready yet) and, with `refill`
+    (per-test drivers), immediately starts its replacement; without it (a reused driver) the spares
+    only cover the first launch and relaunches. A spare that died while idle, or a launch that failed, is replaced by a
+    launch on the calling thread, so a broken pool never costs more than a normal launch.
+    """
+    log = Logger.get_logger("BrowserPrewarmPool", prefix="UI")
+
+    def __init__(self, factory: Callable[[], Any], *, spares: int = 1, refill: bool = True) -> None:
+        self.factory = factory
+        self.spares = max(1, spares)
+        self.refill = refill
+        self.last_ready = False
+        self.waited_s = 0.0
+        self._launches: Deque[Future] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=self.spares, thread_name_prefix="browser-prewarm")
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> "BrowserPrewarmPool":
+        self._top_up()
+        return self
+
+    def _top_up(self) -> None:
+        with self._lock:
+            while not self._closed and len(self._launches) < self.spares:
+                self._launches.append(self._executor.submit(self.factory))
+
+    def take(self) -> Any:
+        with self._lock:
+            launch = self._launches.popleft() if self._launches else None
+        if self.refill:
+            self._top_up()
+        if launch is None:
+            self.last_ready = False
+            return self.factory()
+        self.last_ready = launch.done()
+        started = time.perf_counter()
+        try:
+            driver = launch.result()
+        except Exception as e:
+            self.log.warning(f"Background browser launch failed, launching in the foreground: {e}")
+            self.last_ready = False
+            return self.factory()
+        finally:
+            self.waited_s += time.perf_counter() - started
+        if not ReusableDriver.healthy(driver):
+            self.log.warning("Pre-warmed browser died while idle, launching in the foreground")
+            with contextlib.suppress(Exception):
+                driver.quit()
+            self.last_ready = False
+            return self.factory()
+        return driver
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            launches, self._launches = list(self._launches), deque()
+        for launch in launches:
+            if launch.cancel():
+                continue
+            with contextlib.suppress(Exception):
+                launch.result().quit()
+        self._executor.shutdown(wait=True)
+
+
+@dataclass
+class DriverReuseSummary:
+    """Counts driver leases of setup reports (`report.driver_lease`); controller plugin, so xdist workers count too."""
+    counts: Counter[str] = field(default_factory=Counter)
+
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        lease = getattr(report, "driver_lease", None)
+        if report.when == "setup" and lease:
+            self.counts[lease] += 1
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.counts:
+            return
+        terminalreporter.write_sep("-", "WebDriver reuse")
+        terminalreporter.write_line(f"browsers launched: {self.counts[LAUNCHED]}, reused: {self.counts[REUSED]}, "
+                                    f"relaunched after failed health check: {self.counts[RELAUNCHED]}, "
+                                    f"taken pre-warmed: {self.counts[PREWARMED]}")
@@ -0,0 +1,125 @@
+"""Failure artifacts of UI tests: cheap capture, content-hash de-duplication, background writes."""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import allure
+from pytest_html import extras
+
+from core.config.config import ConfigLoader
+from core.ui.browser import is_chromium
+from core.util.allure_hooks.attachment_writer import AllureAttachmentWriter
+from core.util.logging import Logger
+
+_DOM_JS = "document.documentElement.outerHTML"
+
+
+def _digest(data: str) -> str:
+    return hashlib.sha1(data.encode("utf-8", errors="replace")).hexdigest()[:20]
+
+
+@dataclass
+class FailureArtifacts:
+    url: str = ""
+    screenshot_b64: Optional[str] = None
+    screenshot_ext: str = "jpg"
+    dom: Optional[str] = None
+    console: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class FailureArtifactCollector:
+    """
+    One place that captures and publishes artifacts of a failed UI test.
+
+    - Chromium: JPEG screenshot (`jpeg_quality`) and DOM via CDP, no PNG encoding of the full page;
+      other browsers fall back to WebDriver screenshot / page_source;
+    - artifacts are keyed by content hash, so the identical error page of a failure storm is
+      written once and only referenced by later tests;
+    - Allure attachments are registered on the failing test immediately and written by the
+      session's shared attachment writer (flushed after each test, closed by the root conftest);
+      DOM snapshots for the HTML report go to `out_dir` the same way.
+    """
+    log = Logger.get_logger("FailureArtifacts", prefix="UI")
+
+    DEFAULT_DIR: Path = ConfigLoader.PROJECT_ROOT / "target" / "ui-artifacts"
+
+    def __init__(self, writer: AllureAttachmentWriter, out_dir: Optional[Path] = None, *,
+                 jpeg_quality: int = 60) -> None:
+        self.out_dir = out_dir or self.DEFAULT_DIR
+        self.jpeg_quality = jpeg_quality
+        self.writer = writer
+        self._files: Dict[str, Path] = {}
+
+    # ---------- capture (test thread, driver calls only) ----------
+    def capture(self, driver: Any) -> FailureArtifacts:
+        artifacts = FailureArtifacts()
+        chromium = is_chromium(driver)
+        with contextlib.suppress(Exception):
+            artifacts.url = driver.current_url
+        with contextlib.suppress(Exception):
+            if chromium:
+                shot = driver.execute_cdp_cmd("Page.captureScreenshot",
+                                              {"format": "jpeg", "quality": self.jpeg_quality})
+                artifacts.screenshot_b64 = shot["data"]
+            else:
+                artifacts.screenshot_b64, artifacts.screenshot_ext = driver.get_screenshot_as_base64(), "png"
+        with contextlib.suppress(Exception):
+            if chromium:
+                result = driver.execute_cdp_cmd("Runtime.evaluate", {"expression": _DOM_JS, "returnByValue": True})
+                artifacts.dom = result["result"]["value"]
+            else:
+                artifacts.dom = driver.page_source
+        if chromium:
+            with contextlib.suppress(Exception):
+                artifacts.console = driver.get_log("browser")
+        return artifacts
+
+    # ---------- publish ----------
+    def publish(self, artifacts: FailureArtifacts, *, name: str) -> List[Dict[str, Any]]:
+        """Attach to Allure (current test) and return pytest-html extras for the report."""
+        html_extras: List[Dict[str, Any]] = []
+        if artifacts.screenshot_b64:
+            shot = artifacts.screenshot_b64
+            is_jpg = artifacts.screenshot_ext == "jpg"
+            self.writer.attach(lambda: base64.b64decode(shot), name=f"{name}.{artifacts.screenshot_ext}",
+                               attachment_type=allure.attachment_type.JPG if is_jpg else allure.attachment_type.PNG,
+                               key=_digest(shot))
+            html_extras.append(extras.jpg(shot, name="Failure Screenshot") if is_jpg
+                               else extras.png(shot, name="Failure Screenshot"))
+        if artifacts.dom:
+            dom = artifacts.dom
+            key = _digest(dom)
+            self.writer.attach(lambda: dom, name=f"{name}.html", attachment_type=allure.attachment_type.HTML, key=key)
+            html_extras.append(extras.url(self._file(key, "html", dom), name="DOM snapshot"))
+        if artifacts.url:
+            allure.attach(artifacts.url, name="current_url.txt", attachment_type=allure.attachment_type.TEXT)
+            html_extras.append(extras.url(artifacts.url, name="Failure URL"))
+        if artifacts.console:
+            console = artifacts.console
+            self.writer.attach(lambda: json.dumps(console, indent=2, ensure_ascii=False), name="console.json",
+                               attachment_type=allure.attachment_type.JSON)
+        return html_extras
+
+    def _file(self, key: str, ext: str, content: str) -> str:
+        """Path (relative to cwd, like the report) of a de-duplicated artifact file written in the background."""
+        path = self._files.get(key)
+        if path is None:
+            path = self.out_dir / f"{key}.{ext}"
+            self._files[key] = path
+            if not path.exists():
+                self.writer.submit(lambda: self._write(path, content))
+        return os.path.relpath(path, os.getcwd())
+
+    def _write(self, path: Path, content: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
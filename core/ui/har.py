@@ -0,0 +1,217 @@
+"""
+Streaming HAR 1.2 recorder for Chromium browsers (`--har`), fed by the CDP `performance` log.
+
+The log is drained while the test runs (after WebDriver commands, at most every `drain_interval`
+seconds), so events never pile up in the browser buffer. Only request lifecycle events are parsed,
+an entry is written as soon as its request finished, with send / wait / receive timings taken from
+CDP `ResourceTiming`, and the HAR goes straight to a gzip stream. Response bodies are fetched right
+away and only for text-like MIME types up to `max_body_bytes`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.util.logging import Logger
+
+_EVENTS = ("Network.requestWillBeSent", "Network.responseReceived", "Network.loadingFinished",
+           "Network.loadingFailed")
+DEFAULT_BODY_MIME = ("json", "text/", "javascript", "xml")
+
+
+def _headers(headers: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+    return [{"name": k, "value": str(v)} for k, v in (headers or {}).items()]
+
+
+def _span(timing: Dict[str, float], start: str, end: str) -> float:
+    begin, finish = timing.get(start, -1), timing.get(end, -1)
+    return round(finish - begin, 3) if begin >= 0 and finish >= 0 else -1
+
+
+def har_timings(timing: Optional[Dict[str, float]], finished_ts: Optional[float]) -> Dict[str, float]:
+    """HAR `timings` from CDP ResourceTiming (ms offsets from `requestTime`) and the loadingFinished timestamp."""
+    if not timing:
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": -1, "receive": -1}
+    first = next((timing[k] for k in ("dnsStart", "connectStart", "sendStart") if timing.get(k, -1) >= 0), 0.0)
+    headers_end = timing.get("receiveHeadersEnd", -1)
+    receive = -1.0
+    if finished_ts is not None and headers_end >= 0:
+        receive = round(max(0.0, (finished_ts - timing["requestTime"]) * 1000 - headers_end), 3)
+    return {
+        "blocked": round(first, 3),
+        "dns": _span(timing, "dnsStart", "dnsEnd"),
+        "connect": _span(timing, "connectStart", "connectEnd"),
+        "ssl": _span(timing, "sslStart", "sslEnd"),
+        "send": max(0.0, _span(timing, "sendStart", "sendEnd")),
+        "wait": _span(timing, "sendEnd", "receiveHeadersEnd"),
+        "receive": receive,
+    }
+
+
+class HarRecorder:
+    log = Logger.get_logger("HarRecorder", prefix="HAR")
+
+    def __init__(self, driver: Any, path: Path, *, target_host: str, drain_interval: float = 1.0,
+                 body_mime: Sequence[str] = DEFAULT_BODY_MIME, max_body_bytes: int = 256 * 1024) -> None:
+        self.driver = driver
+        self.path = path
+        self.target_host = target_host
+        self.drain_interval = drain_interval
+        self.body_mime = tuple(body_mime)
+        self.max_body_bytes = max_body_bytes
+        self.entries = 0
+        self.events = 0
+        # other consumers of the network events (the performance log can be read only once)
+        self.listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._fh: Optional[IO[str]] = None
+        self._last_drain = 0.0
+        self._draining = False
+        self._executor: Any = None
+        self._execute: Any = None
+
+    # ---------- lifecycle ----------
+    def start(self) -> "HarRecorder":
+        with contextlib.suppress(Exception):
+            self.driver.get_log("performance")  # events of a previous test
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=5)
+        self._fh.write('{"log":{"version":"1.2","creator":{"name":"pytest-har","version":"2.0"},"entries":[\n')
+        self._hook_commands()
+        return self
+
+    def stop(self) -> Path:
+        self._unhook_commands()
+        self.drain()
+        for request_id in list(self._pending):  # response headers seen, but not finished before the test ended
+            self._finish(request_id, None, failed=False)
+        assert self._fh is not None
+        self._fh.write("\n]}}\n")
+        self._fh.close()
+        self._fh = None
+        self.log.debug(f"HAR: {self.entries} entries from {self.events} events -> {self.path}")
+        return self.path
+
+    def _hook_commands(self) -> None:
+        """Drain after WebDriver commands of the test (same thread: WebDriver calls must not overlap)."""
+        executor = self.driver.command_executor
+        execute = executor.execute
+
+        def execute_and_drain(command: str, params: Any = None) -> Any:
+            result = execute(command, params)
+            if not self._draining and time.monotonic() - self._last_drain >= self.drain_interval:
+                self.drain()
+            return result
+
+        self._executor, self._execute = executor, execute
+        executor.execute = execute_and_drain
+
+    def _unhook_commands(self) -> None:
+        if self._executor is not None:
+            self._executor.execute = self._execute
+            self._executor = None
+
+    # ---------- events ----------
+    def drain(self) -> None:
+        # stays set while events are processed: body fetches are WebDriver commands themselves
+        self._draining = True
+        try:
+            try:
+                raw = self.driver.get_log("performance")
+            except Exception:
+                raw = []
+            for item in raw:
+                message = item.get("message", "")
+                # cheap substring filter: dataReceived & co. are the bulk of the log and are never parsed
+                if not any(name in message for name in _EVENTS):
+                    continue
+                with contextlib.suppress(ValueError, KeyError):
+                    event = json.loads(message)["message"]
+                    self._on_event(event.get("method", ""), event.get("params") or {})
+        finally:
+            self._draining = False
+            self._last_drain = time.monotonic()
+
+    def _on_event(self, method: str, params: Dict[str, Any]) -> None:
+        for listener in self.listeners:
+            listener(method, params)
+        request_id = params.get("requestId")
+        if not request_id:
+            return
+        self.events += 1
+        if method == "Network.requestWillBeSent":
+            request = params.get("request") or {}
+            if self.target_host not in request.get("url", ""):
+                return
+            if request_id in self._pending and params.get("redirectResponse"):
+                self._pending[request_id]["response"] = params["redirectResponse"]
+                self._finish(request_id, params.get("timestamp"), failed=False)
+            self._pending[request_id] = {"request": request, "wallTime": params.get("wallTime"),
+                                         "timestamp": params.get("timestamp")}
+        elif request_id not in self._pending:
+            return
+        elif method == "Network.responseReceived":
+            self._pending[request_id]["response"] = params.get("response") or {}
+        elif method == "Network.loadingFinished":
+            self._pending[request_id]["encoded"] = params.get("encodedDataLength")
+            self._finish(request_id, params.get("timestamp"), failed=False)
+        elif method == "Network.loadingFailed":
+            self._pending[request_id]["error"] = params.get("errorText", "")
+            self._finish(request_id, params.get("timestamp"), failed=True)
+
+    # ---------- entries ----------
+    def _body(self, request_id: str, mime: str, size: Any) -> Tuple[str, Optional[str]]:
+        if not any(m in mime for m in self.body_mime):
+            return "", None
+        if isinstance(size, (int, float)) and size > self.max_body_bytes:
+            return "", None
+        with contextlib.suppress(Exception):
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            return body.get("body", ""), "base64" if body.get("base64Encoded") else None
+        return "", None
+
+    def _finish(self, request_id: str, finished_ts: Optional[float], *, failed: bool) -> None:
+        data = self._pending.pop(request_id)
+        request, response = data["request"], data.get("response") or {}
+        if not response and not failed:
+            return
+        size = data.get("encoded", response.get("encodedDataLength", -1))
+        mime = response.get("mimeType", "")
+        text, encoding = self._body(request_id, mime, size) if response and not failed else ("", None)
+        timings = har_timings(response.get("timing"), finished_ts)
+        started = dt.datetime.fromtimestamp(data.get("wallTime") or time.time(), tz=dt.timezone.utc)
+        content: Dict[str, Any] = {"size": size if isinstance(size, (int, float)) else -1, "mimeType": mime,
+                                   "text": text}
+        if encoding:
+            content["encoding"] = encoding
+        entry: Dict[str, Any] = {
+            "startedDateTime": started.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            # ssl is part of connect in HAR
+            "time": round(sum(v for k, v in timings.items() if v > 0 and k != "ssl"), 3),
+            "request": {
+                "method": request.get("method"), "url": request.get("url"),
+                "httpVersion": response.get("protocol", "HTTP/1.1"), "headers": _headers(request.get("headers")),
+                "queryString": [], "headersSize": -1, "bodySize": len(request.get("postData") or ""),
+                **({"postData": {"mimeType": (request.get("headers") or {}).get("Content-Type", ""),
+                                 "text": request["postData"]}} if request.get("postData") else {}),
+            },
+            "response": {
+                "status": response.get("status", 0), "statusText": response.get("statusText", ""),
+                "httpVersion": response.get("protocol", "HTTP/1.1"), "headers": _headers(response.get("headers")),
+                "content": content, "redirectURL": (response.get("headers") or {}).get("location", ""),
+                "headersSize": -1, "bodySize": content["size"],
+            },
+            "cache": {},
+            "timings": timings,
+        }
+        if failed:
+            entry["_error"] = data.get("error", "")
+        assert self._fh is not None
+        self._fh.write(("," if self.entries else "") + json.dumps(entry, ensure_ascii=False) + "\n")
+        self.entries += 1
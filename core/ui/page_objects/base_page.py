@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from typing import Literal, TYPE_CHECKING
+from typing import Dict, List, Mapping, Optional, TYPE_CHECKING
 
-import allure
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
+from core.ui.batch import Locator, fill_inputs, read_elements
+from core.ui.page_perf import measured
+from core.ui.waits import WaitEngine
 from core.util.logging import Logger
 from .locators.base_page_locators import BasePageLocators as Loc
-from core.util.html_report.decorators import html_step
+from .locators.login_page_locators import LoginPageLocators as LoginLoc
+from core.util.html_report.decorators import step
 
 DEFAULT_TIMEOUT = 10
 if TYPE_CHECKING:
@@ -19,62 +22,107 @@ if TYPE_CHECKING:
 class BasePage:
     """Common base page with shared Selenium actions and waits."""
     log: Logger = Logger().get_logger(prefix="BasePage")
+    # --page-perf budgets: metric -> limit, optionally scoped to an action ("open.load_ms", "login.duration_ms")
+    PERF_BUDGETS: Dict[str, float] = {}
 
     def __init__(self, driver, timeout: int = DEFAULT_TIMEOUT):
         self.driver = driver
-        self.wait = WebDriverWait(driver, timeout)
+        # the only waiting mechanism: the driver's implicit wait is 0
+        self.wait = WaitEngine(driver, timeout)
         self.base_url = (getattr(driver, "base_url")).rstrip("/")
         self.log.info(f"[PAGE] Initializing {self.__class__.__name__} page.")
 
-    @html_step("Open page")
-    @allure.step("Open page `{path}`")
+    @step("Open page `{path}`")
     def open_page(self, path: str = ""):
         self.log.info(f"Open_page:`{path}`")
-        self.driver.get(self.base_url + path)
+        with measured(self, f"open {path or '/'}", navigation=True):
+            self.driver.get(self.base_url + path)
 
-    def __visible(self, locator) -> Literal[False] | WebElement:
-        return self.wait.until(EC.visibility_of_element_located(locator))
+    def __visible(self, locator) -> WebElement:
+        return self.wait.visible(locator)
 
     def click_visible(self, locator) -> BasePage:
         self.__visible(locator).click()
         return BasePage(self.driver, timeout=DEFAULT_TIMEOUT)
 
-    @html_step("Set text to input element")
-    @allure.step("Set text {text} to input element")
+    @step("Set text {text} to input element")
     def _type(self, locator, text: str) -> None:
-        el = self.__visible(locator)
+        el = locator if isinstance(locator, WebElement) else self.__visible(locator)
         el.clear()
         el.send_keys(text)
 
-    @html_step("Return web element text")
-    @allure.step("Return web element text")
+    # ---------- batched: one execute_script round-trip per poll ----------
+    @step("Read texts of `{locator}` elements")
+    def read_texts(self, locator: Locator, *, visible_only: bool = True) -> List[str]:
+        """Texts of all matching elements; waits until at least one matches."""
+        rows = self.wait.until(lambda d: read_elements(d, locator, visible_only=visible_only),
+                               f"No {'visible ' if visible_only else ''}elements: {locator}")
+        return [row["text"] for row in rows]
+
+    @step("Read attributes {attributes} of `{locator}` elements")
+    def read_attributes(self, locator: Locator, *attributes: str,
+                        visible_only: bool = True) -> List[Dict[str, Optional[str]]]:
+        """`{attribute: value}` per matching element (plus "text"); waits until at least one matches."""
+        rows = self.wait.until(lambda d: read_elements(d, locator, attributes, visible_only=visible_only),
+                               f"No {'visible ' if visible_only else ''}elements: {locator}")
+        return [{"text": row["text"], **row["attrs"]} for row in rows]
+
+    @step("Fill form inputs")
+    def fill(self, values: Mapping[Locator, str]) -> None:
+        """Set all input values at once when every input is visible and editable (no partial fill)."""
+        state: Dict[str, list] = {}
+
+        def filled(driver: object) -> bool:
+            state.update(fill_inputs(driver, values))
+            return not state["missing"] and not state["blocked"]
+
+        try:
+            self.wait.until(filled)
+        except TimeoutException:
+            raise TimeoutException(f"Cannot fill inputs within {self.wait.timeout}s: "
+                                   f"missing {state.get('missing', [])}, "
+                                   f"hidden/disabled/read-only {state.get('blocked', [])}") from None
+
+    # ---------- presence / absence once the DOM is stable ----------
+    @step("Check `{locator}` is present once the page settles")
+    def is_present(self, locator: Locator, *, settle_ms: int = 300, timeout: Optional[float] = None) -> bool:
+        """True as soon as it matches; False once the page stopped changing without it (not after the timeout)."""
+        return self.wait.present_when_settled(locator, settle_ms=settle_ms, timeout=timeout)
+
+    @step("Check `{locator}` is absent once the page settles")
+    def is_absent(self, locator: Locator, *, settle_ms: int = 300, timeout: Optional[float] = None) -> bool:
+        return not self.wait.present_when_settled(locator, settle_ms=settle_ms, timeout=timeout)
+
+    @step("Wait until `{locator}` is gone")
+    def wait_until_absent(self, locator: Locator, *, timeout: Optional[float] = None) -> bool:
+        """True at the first DOM mutation that leaves no match; False if it is still there at the timeout."""
+        return self.wait.until_absent(locator, timeout=timeout)
+
+    @step("Return web element text")
     def get_text(self, locator) -> str:
         return self.__visible(locator).text
 
-    @html_step("Return web element attribute")
-    @allure.step("Return web element attribute {attribute}")
+    @step("Return web element attribute {attribute}")
     def _get_element_attribute(self, locator, attribute: str) -> str:
         return self.__visible(locator).get_attribute(attribute)
 
-    @html_step("Return if url contains text {fragment}")
-    @allure.step("Return if url contains text {fragment}")
+    @step("Return if url contains text {fragment}")
     def url_contains(self, fragment: str) -> bool:
         return self.wait.until(EC.url_contains(fragment))
 
-    @html_step("Get test from `Log out` button")
-    @allure.step("Get test from `Log out` button")
+    @step("Get test from `Log out` button")
     def log_out_btn_text(self) -> str:
-        return self.wait.until(EC.visibility_of_element_located(Loc.LOG_OUT_BTN)).text
+        return self.__visible(Loc.LOG_OUT_BTN).text
 
-    @html_step("Return profile `User Name`")
-    @allure.step("Return profile `User Name`")
+    @step("Return profile `User Name`")
     def logged_user_name(self) -> str:
-        return self.wait.until(EC.visibility_of_element_located(Loc.LOGGED_USER_NAME)).text
+        return self.__visible(Loc.LOGGED_USER_NAME).text
 
-    @html_step("Logout from Profile page")
-    @allure.step("Logout from Profile page")
+    @step("Logout from Profile page")
     def logout(self) -> "LoginPage":
         """Click 'Log out' button and return LoginPage instance."""
-        self.__visible(Loc.LOG_OUT_BTN).click()
+        with measured(self, "logout"):
+            self.__visible(Loc.LOG_OUT_BTN).click()
+            self.__visible(LoginLoc.USERNAME)
         from .login_page import LoginPage
         return LoginPage(self.driver)
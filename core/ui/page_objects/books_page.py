@@ -1,5 +1,4 @@
 import allure
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 
 from .base_page import BasePage
@@ -16,7 +15,7 @@ class BooksPage(BasePage):
       - reading book titles from the current grid page;
       - navigating between pages and reading pagination state.
     """
-
+    PERF_BUDGETS = {"open.dom_content_loaded_ms": 1500}
 
     @allure.step("Search for '{query}' in books list")
     def search(self, query: str) -> None:
@@ -24,34 +23,24 @@ class BooksPage(BasePage):
 
     @allure.step("Set {books_per_page} books per page")
     def set_rows_per_page(self, books_per_page: int = 5) -> None:
-        selector = self.driver.find_element(*Loc.ROWS_SELECT)
-        if selector:
-            Select(selector).select_by_value(str(books_per_page))
+        Select(self.wait.visible(Loc.ROWS_SELECT)).select_by_value(str(books_per_page))
 
     @allure.step("Get list of book titles on current page")
     def book_titles(self) -> list[str]:
-        els = self.wait.until(EC.presence_of_all_elements_located(Loc.TITLES_SELECTOR))
-        titles: list[str] = []
-        for el in els:
-            text = el.text.strip()
-            if text:
-                titles.append(text)
-        return titles
+        return [text for text in self.read_texts(Loc.TITLES_SELECTOR) if text]
 
     @allure.step("Navigate to next page")
     def go_next_page(self) -> None:
-        self.driver.find_element(*Loc.NEXT_PAGE_BTN).click()
+        self.wait.clickable(Loc.NEXT_PAGE_BTN).click()
 
     @allure.step("Get current page number")
     def current_page_num(self) -> str:
-        return self.driver.find_element(*Loc.THIS_PAGE_NUM).get_attribute("value")
+        return self.wait.present(Loc.THIS_PAGE_NUM).get_attribute("value")
 
     @allure.step("Get total pages number")
     def total_book_pages(self) -> str:
-        return self.wait.until(
-            EC.visibility_of_element_located(Loc.TOTAL_PAGE_NUM)
-        ).text.strip()
+        return self.wait.visible(Loc.TOTAL_PAGE_NUM).text.strip()
 
     @allure.step("Navigate to previous page")
     def go_previous_page(self) -> None:
-        self.driver.find_element(*Loc.PREV_PAGE_BTN).click()
+        self.wait.clickable(Loc.PREV_PAGE_BTN).click()
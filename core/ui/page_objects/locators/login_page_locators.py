@@ -3,5 +3,6 @@ from selenium.webdriver.common.by import By
 class LoginPageLocators:
     USERNAME = (By.ID, "userName")
     PASSWORD = (By.ID, "password")
+    CREDENTIAL_INPUTS = (By.CSS_SELECTOR, "#userName, #password")
     LOGIN_BTN = (By.ID, "login")
     ERROR_MSG = (By.ID, "name")
@@ -1,28 +1,40 @@
-import allure
+from typing import Dict
 
 from core.ui.page_objects.base_page import BasePage
-from core.util.html_report.decorators import html_step
+from core.ui.page_perf import measured
+from core.util.html_report.decorators import step
+from .locators.base_page_locators import BasePageLocators as BaseLoc
 from .locators.login_page_locators import LoginPageLocators as Loc
 
 
 class LoginPage(BasePage):
+    PERF_BUDGETS = {"open.dom_content_loaded_ms": 1500, "login.duration_ms": 3000}
 
-    @html_step("Login by username")
-    @allure.step("Login by username {username}")
+    @step("Login by username {username}")
     def login(self, username: str, password: str) -> BasePage:
-        self._type(Loc.USERNAME, username)
-        self._type(Loc.PASSWORD, password)
-        return self.click_visible(Loc.LOGIN_BTN)
+        # both fields in one round-trip; no field is filled while the form is incomplete
+        self.fill({Loc.USERNAME: username, Loc.PASSWORD: password})
+        with measured(self, "login"):
+            page = self.click_visible(Loc.LOGIN_BTN)
+            # the transition ends on the profile page, or on the error message of a refused login;
+            # both locators are checked in one round-trip per poll
+            self.wait.first_visible(BaseLoc.LOGGED_USER_NAME, Loc.ERROR_MSG,
+                                    message="Login did not finish: neither the profile nor an error message appeared")
+        return page
 
     def error_text(self) -> str:
         return self.get_text(Loc.ERROR_MSG)
 
-    @html_step("Return default Username field text")
-    @allure.step("Return default Username field text")
+    @step("Return placeholders of the credential fields")
+    def placeholders(self) -> Dict[str, str]:
+        """`{input id: placeholder}` of the Username and Password fields, read in one round-trip."""
+        rows = self.read_attributes(Loc.CREDENTIAL_INPUTS, "id", "placeholder")
+        return {row["id"] or "": row["placeholder"] or "" for row in rows}
+
+    @step("Return default Username field text")
     def user_name_default(self):
         return self._get_element_attribute(Loc.USERNAME, "placeholder")
 
-    @html_step("Return default password field text")
-    @allure.step("Return default password field text")
+    @step("Return default password field text")
     def password_default(self):
         return self._get_element_attribute(Loc.PASSWORD, "placeholder")
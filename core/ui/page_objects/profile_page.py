@@ -1,7 +1,5 @@
 import allure
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from .base_page import BasePage
 from .locators.profile_page_locators import ProfilePageLocators as Loc
 
@@ -9,13 +7,8 @@ class ProfilePage(BasePage):
 
 
     def is_isbn_visible(self, isbn: str) -> bool:
-        try:
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, f"//*[contains(text(), '{isbn}')]"))
-            )
-            return True
-        except Exception:
-            return False
+        # a missing book is reported once the page stops changing, not after the full timeout
+        return self.is_present((By.XPATH, f"//*[contains(text(), '{isbn}')]"), settle_ms=500, timeout=5)
 
     @allure.step("Get text label for not logged user")
     def not_logged_label_text(self)->str:
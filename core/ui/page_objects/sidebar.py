@@ -11,7 +11,7 @@ class Sidebar(BasePage):
     def expand_book_store(self):
         # Idempotent expand — click header if items are not visible yet
         if not self._is_item_visible("Login"):
-            self.click(self.BOOK_APP_HEADER)
+            self.click_visible(self.BOOK_APP_HEADER)
 
     def _is_item_visible(self, name: str) -> bool:
         items = self.driver.find_elements(By.XPATH, f"//div[@class='left-pannel']//span[text()='{name}']")
@@ -19,4 +19,4 @@ class Sidebar(BasePage):
 
     def click_item(self, name: str):
         self.expand_book_store()
-        self.click((By.XPATH, f"//div[@class='left-pannel']//span[text()='{name}']"))
+        self.click_visible((By.XPATH, f"//div[@class='left-pannel']//span[text()='{name}']"))
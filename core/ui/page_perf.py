@@ -0,0 +1,128 @@
+"""
+Front-end performance of page objects (`--page-perf`): Navigation / Paint Timing and CDP `Performance.getMetrics`.
+
+`BasePage.open_page` and page transitions (`LoginPage.login`, `logout`) are measured through
+`PagePerfRecorder.measure()` when the driver carries a recorder. Navigation / Paint Timing describe the
+current document, so they are collected only for real document loads (`open`); DemoQA transitions are
+client-side and record their duration and CDP metrics only. Budgets are declared per page class
+(`PERF_BUDGETS = {"dom_content_loaded_ms": 1500, "login.duration_ms": 3000}`: a metric name, optionally
+prefixed by the action) and checked like soft assertions: every violation is collected and the test
+fails once at the end of its call phase. Measurements travel on the report into the run history.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from core.ui.browser import is_chromium
+from core.util.logging import Logger
+
+# one round-trip: navigation entry + paint entries of the current document
+_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const paint = {};
+performance.getEntriesByType('paint').forEach(e => { paint[e.name] = e.startTime; });
+return {
+  ttfb: nav ? nav.responseStart : null,
+  dcl: nav ? nav.domContentLoadedEventEnd : null,
+  load: nav ? nav.loadEventEnd : null,
+  transfer: nav ? nav.transferSize : null,
+  fp: paint['first-paint'] ?? null,
+  fcp: paint['first-contentful-paint'] ?? null,
+};
+"""
+
+# CDP Performance.getMetrics name -> (metric, scale)
+_CDP_METRICS = {
+    "JSHeapUsedSize": ("js_heap_used_bytes", 1),
+    "LayoutCount": ("layout_count", 1),
+    "RecalcStyleCount": ("recalc_style_count", 1),
+    "ScriptDuration": ("script_duration_ms", 1000),
+    "LayoutDuration": ("layout_duration_ms", 1000),
+    "TaskDuration": ("task_duration_ms", 1000),
+}
+# cumulative counters: a transition reports the delta, heap size is a level
+_CUMULATIVE = {"layout_count", "recalc_style_count", "script_duration_ms", "layout_duration_ms", "task_duration_ms"}
+
+
+class PagePerfRecorder:
+    log = Logger.get_logger("PagePerf", prefix="PERF")
+
+    def __init__(self, driver: Any) -> None:
+        self.driver = driver
+        self.results: List[Dict[str, Any]] = []
+        self.violations: List[str] = []
+        self._chromium = is_chromium(driver)
+        self._cdp_enabled = False
+
+    @contextlib.contextmanager
+    def measure(self, page: Any, action: str, *, navigation: bool = False) -> Iterator[None]:
+        before = self._cdp_metrics()
+        started = time.perf_counter()
+        yield
+        metrics: Dict[str, float] = {"duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+        if navigation:
+            metrics.update(self._navigation_timing())
+        after = self._cdp_metrics()
+        for name, value in after.items():
+            metrics[name] = round(value - before.get(name, 0.0), 1) if name in _CUMULATIVE else value
+        page_name = type(page).__name__
+        self.results.append({"page": page_name, "action": action, "metrics": metrics})
+        self._check(page_name, action, metrics, getattr(page, "PERF_BUDGETS", {}) or {})
+
+    def _check(self, page_name: str, action: str, metrics: Mapping[str, float], budgets: Mapping[str, float]) -> None:
+        kind = action.split(" ", 1)[0]
+        for key, limit in budgets.items():
+            scope, _, metric = key.rpartition(".")
+            if scope and scope != kind:
+                continue
+            value = metrics.get(metric)
+            if value is not None and value > limit:
+                message = f"{page_name} {action}: {metric} {value:g} > budget {limit:g}"
+                self.violations.append(message)
+                self.log.warning(f"Performance budget exceeded: {message}")
+
+    def _navigation_timing(self) -> Dict[str, float]:
+        try:
+            raw = self.driver.execute_script(_TIMING_JS) or {}
+        except Exception as e:
+            self.log.debug(f"Navigation timing unavailable: {e}")
+            return {}
+        names = {"ttfb": "ttfb_ms", "dcl": "dom_content_loaded_ms", "load": "load_ms", "transfer": "transfer_bytes",
+                 "fp": "first_paint_ms", "fcp": "first_contentful_paint_ms"}
+        return {names[k]: round(float(v), 1) for k, v in raw.items() if k in names and v is not None}
+
+    def _cdp_metrics(self) -> Dict[str, float]:
+        if not self._chromium:
+            return {}
+        try:
+            if not self._cdp_enabled:
+                self.driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+                self._cdp_enabled = True
+            raw = self.driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+        except Exception as e:
+            self.log.debug(f"CDP performance metrics unavailable: {e}")
+            self._chromium = False
+            return {}
+        metrics: Dict[str, float] = {}
+        for item in raw:
+            mapped = _CDP_METRICS.get(item.get("name", ""))
+            if mapped:
+                metrics[mapped[0]] = float(item.get("value", 0.0)) * mapped[1]
+        return metrics
+
+
+def perf_recorder(driver: Any) -> Optional[PagePerfRecorder]:
+    """Recorder attached to the driver by the UI conftest with --page-perf (None otherwise)."""
+    return getattr(driver, "page_perf", None)
+
+
+def measured(page: Any, action: str, *, navigation: bool = False) -> Any:
+    """
+    `with measured(self, "open /books", navigation=True): ...` — a no-op without --page-perf.
+    Pass `navigation=True` only when the block loads a new document.
+    """
+    recorder = perf_recorder(page.driver)
+    return recorder.measure(page, action, navigation=navigation) if recorder else contextlib.nullcontext()
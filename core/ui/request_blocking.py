@@ -0,0 +1,193 @@
+"""
+Third-party request blocking for UI page loads (`--block-third-party`, on by default in CI).
+
+demoqa.com pulls ads, analytics and web fonts that dominate page-load time. On Chromium browsers
+the block list goes to CDP `Network.setBlockedURLs` (wildcard URL patterns) once per browser;
+blocked requests show up in the performance log as `loadingFailed` with `blockedReason`, and are
+counted per page (document path). Firefox has no CDP: its built-in tracking protection (ad /
+analytics / social lists) is enabled instead, without per-request counts.
+
+Blocked requests never download, so "bytes saved" is an estimate: in `observe` mode nothing is
+blocked, matching requests are counted and their transfer sizes are averaged per host into
+`target/blocking/sizes.json`, which later blocking runs use to estimate the bytes they saved.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fnmatch
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from core.config.config import ConfigLoader
+from core.ui.browser import is_chromium
+from core.util.logging import Logger
+from core.util.support.shared_store import SharedJsonStore
+
+OFF, ON, OBSERVE = "off", "on", "observe"
+
+DEFAULT_BLOCK_LIST: Sequence[str] = (
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*googleadservices.com*",
+    "*adservice.google.*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googletagservices.com*",
+    "*amazon-adsystem.com*",
+    "*adsrvr.org*",
+    "*criteo.*",
+    "*pubmatic.com*",
+    "*rubiconproject.com*",
+    "*openx.net*",
+    "*casalemedia.com*",
+    "*taboola.com*",
+    "*outbrain.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+)
+
+# Firefox: no CDP, enable the bundled tracking protection lists instead
+FIREFOX_BLOCKING_PREFS: Dict[str, Any] = {
+    "privacy.trackingprotection.enabled": True,
+    "privacy.trackingprotection.socialtracking.enabled": True,
+    "privacy.trackingprotection.cryptomining.enabled": True,
+    "privacy.trackingprotection.fingerprinting.enabled": True,
+}
+
+
+def load_block_list(path: Optional[str]) -> List[str]:
+    """Patterns from a file (one per line, `#` comments) or the default list."""
+    if not path:
+        return list(DEFAULT_BLOCK_LIST)
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def apply_blocking(driver: Any, patterns: Sequence[str]) -> bool:
+    """Install the block list in a Chromium browser (Network must be enabled); False when unsupported."""
+    if not patterns or not is_chromium(driver):
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        return True
+    except Exception as e:
+        RequestBlocker.log.warning(f"Request blocking unavailable: {e}")
+        return False
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+class RequestBlocker:
+    """
+    Per-test accounting of blocked (or, in observe mode, blockable) requests.
+
+    Fed with CDP network events: by the HAR recorder when it runs (it owns the performance log),
+    otherwise by `drain()` at the end of the test.
+    """
+    log = Logger.get_logger("RequestBlocker", prefix="UI")
+
+    DEFAULT_SIZES: Path = ConfigLoader.PROJECT_ROOT / "target" / "blocking" / "sizes.json"
+
+    def __init__(self, patterns: Sequence[str], *, mode: str = ON, sizes_path: Optional[Path] = None) -> None:
+        self.patterns = list(patterns)
+        self.mode = mode
+        self.sizes_path = sizes_path or self.DEFAULT_SIZES
+        self._requests: Dict[str, Tuple[str, str]] = {}  # requestId -> (host, page)
+        self._blocked: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))  # page -> host -> count
+        self._observed: Dict[str, List[int]] = defaultdict(list)  # host -> transfer sizes (observe mode)
+        self._sizes: Optional[Dict[str, Any]] = None
+
+    def matches(self, url: str) -> bool:
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in self.patterns)
+
+    # ---------- events ----------
+    def drain(self, driver: Any) -> None:
+        with contextlib.suppress(Exception):
+            for item in driver.get_log("performance"):
+                message = item.get("message", "")
+                if "Network.requestWillBeSent" not in message and "Network.loading" not in message:
+                    continue
+                with contextlib.suppress(ValueError, KeyError):
+                    event = json.loads(message)["message"]
+                    self.on_event(event.get("method", ""), event.get("params") or {})
+
+    def on_event(self, method: str, params: Dict[str, Any]) -> None:
+        request_id = params.get("requestId")
+        if not request_id:
+            return
+        if method == "Network.requestWillBeSent":
+            url = (params.get("request") or {}).get("url", "")
+            if self.matches(url):
+                page = urlsplit(params.get("documentURL", "")).path or "/"
+                self._requests[request_id] = (_host(url), page)
+            return
+        known = self._requests.pop(request_id, None)
+        if known is None:
+            return
+        host, page = known
+        if method == "Network.loadingFailed" and params.get("blockedReason"):
+            self._blocked[page][host] += 1
+        elif method == "Network.loadingFinished" and self.mode == OBSERVE:
+            self._blocked[page][host] += 1
+            self._observed[host].append(int(params.get("encodedDataLength") or 0))
+
+    # ---------- results ----------
+    def summary(self) -> Dict[str, List[int]]:
+        """page -> [requests, estimated bytes]; plain lists so the report reaches the xdist controller."""
+        sizes = self._known_sizes()
+        result: Dict[str, List[int]] = {}
+        for page, hosts in self._blocked.items():
+            count = sum(hosts.values())
+            saved = sum(n * int(sizes.get(host, {}).get("avg", 0)) for host, n in hosts.items())
+            result[page] = [count, saved]
+        return result
+
+    def _known_sizes(self) -> Dict[str, Any]:
+        if self.mode == OBSERVE:
+            return {host: {"avg": sum(v) / len(v)} for host, v in self._observed.items() if v}
+        if self._sizes is None:
+            self._sizes = SharedJsonStore(self.sizes_path).read()
+        return self._sizes
+
+    def save_sizes(self) -> None:
+        """Observe mode: fold this test's transfer sizes into the per-host running averages."""
+        if self.mode != OBSERVE or not self._observed:
+            return
+        with SharedJsonStore(self.sizes_path).update() as data:
+            for host, values in self._observed.items():
+                entry = data.get(host) or {"avg": 0.0, "n": 0}
+                n = entry["n"] + len(values)
+                entry["avg"] = round((entry["avg"] * entry["n"] + sum(values)) / n, 1)
+                entry["n"] = n
+                data[host] = entry
+        self._observed.clear()
+
+
+@dataclass
+class BlockedRequestSummary:
+    """Totals of `report.blocked_requests` per page; controller plugin, so xdist workers count too."""
+    pages: Dict[str, List[int]] = field(default_factory=lambda: defaultdict(lambda: [0, 0]))
+
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        blocked = getattr(report, "blocked_requests", None)
+        if report.when != "teardown" or not blocked:
+            return
+        for page, (count, saved) in blocked.items():
+            self.pages[page][0] += count
+            self.pages[page][1] += saved
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.pages:
+            return
+        terminalreporter.write_sep("-", "Blocked third-party requests")
+        for page, (count, saved) in sorted(self.pages.items(), key=lambda kv: -kv[1][0]):
+            terminalreporter.write_line(f"{page:<40} {count:>6} requests  ~{saved / 1024:,.0f} KB saved")
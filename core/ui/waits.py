@@ -0,0 +1,219 @@
+"""
+Explicit wait engine of the page objects (the driver's implicit wait is 0).
+
+- adaptive polling: the first polls are fast (a ready element costs one round-trip), the interval
+  then grows by `backoff` up to `max_poll`, so long waits do not hammer the driver;
+- batching: `visible_all` / `first_visible` check several locators in one `execute_script` round-trip;
+- DOM-stable checks: `present_when_settled` / `until_absent` run one async script with a
+  MutationObserver, so a negative check returns once the page stops changing instead of after the
+  full timeout, and "eventually gone" returns at the mutation that removed the element;
+- every wait is accounted: duration and number of polls go to the driver's `WaitLog` (whatever step
+  decorator is active) and to the current `@step` (`meta["wait_ms"]`, `meta["polls"]`), so slow waits
+  show up in the report and in the step tree.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.remote.webelement import WebElement
+
+from core.ui.batch import FIND_JS, Locator, dom_query
+from core.util.html_report.decorators import current_step
+
+T = TypeVar("T")
+
+# exceptions that mean "not yet" while polling
+_RETRY = (NoSuchElementException, StaleElementReferenceException)
+
+# arguments: [query], visible only -> the first (visible) element per query, or null
+_BATCH_JS = FIND_JS + """
+const [queries, visibleOnly] = arguments;
+return queries.map(q => find(q, true).find(el => !visibleOnly || shown(el)) || null);
+"""
+
+# arguments: query, settle ms, timeout ms, callback -> true as soon as it matches; false once the loaded
+# document had no mutation for `settle` ms (or at the timeout) without a match
+_SETTLED_JS = FIND_JS + """
+const [q, settleMs, timeoutMs, done] = arguments;
+const match = () => find(q, false).length > 0;
+if (match()) { done(true); return; }
+let settleTimer = null, finished = false;
+const observer = new MutationObserver(() => { if (match()) { finish(true); } else { arm(); } });
+const finish = value => {
+  if (finished) { return; }
+  finished = true; observer.disconnect(); clearTimeout(settleTimer); clearTimeout(hardTimer); done(value);
+};
+const arm = () => {
+  if (document.readyState !== 'complete') { return; }
+  clearTimeout(settleTimer);
+  settleTimer = setTimeout(() => finish(match()), settleMs);
+};
+const hardTimer = setTimeout(() => finish(match()), timeoutMs);
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true});
+if (document.readyState === 'complete') { arm(); } else { window.addEventListener('load', arm, {once: true}); }
+"""
+
+# arguments: query, timeout ms, callback -> true at the first moment nothing matches, false at the timeout
+_GONE_JS = FIND_JS + """
+const [q, timeoutMs, done] = arguments;
+const match = () => find(q, false).length > 0;
+if (!match()) { done(true); return; }
+const observer = new MutationObserver(() => { if (!match()) { observer.disconnect(); clearTimeout(timer); done(true); } });
+const timer = setTimeout(() => { observer.disconnect(); done(!match()); }, timeoutMs);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+"""
+
+
+@dataclass
+class WaitRecord:
+    label: str
+    ms: float
+    polls: int
+    timed_out: bool
+
+
+class WaitLog:
+    """Every wait of a test; the UI conftest puts one on the driver (`driver.wait_log`)."""
+
+    def __init__(self) -> None:
+        self.records: List[WaitRecord] = []
+
+    def add(self, label: str, elapsed: float, polls: int, timed_out: bool) -> None:
+        self.records.append(WaitRecord(label, round(elapsed * 1000, 1), polls, timed_out))
+
+    def summary(self, slowest: int = 5) -> Dict[str, Any]:
+        """Plain dict (travels on the report): totals plus the slowest waits."""
+        top = sorted(self.records, key=lambda r: r.ms, reverse=True)[:slowest]
+        return {"waits": len(self.records), "polls": sum(r.polls for r in self.records),
+                "ms": round(sum(r.ms for r in self.records), 1),
+                "timeouts": sum(1 for r in self.records if r.timed_out),
+                "slowest": [vars(r) for r in top]}
+
+
+class WaitEngine:
+    """Drop-in for `WebDriverWait.until(method)` plus locator helpers; see the module docstring."""
+
+    def __init__(self, driver: Any, timeout: float = 10, *, initial_poll: float = 0.05, max_poll: float = 0.5,
+                 backoff: float = 1.6) -> None:
+        self.driver = driver
+        self.timeout = timeout
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+
+    def until(self, condition: Callable[[Any], Optional[T]], message: str = "", *, timeout: Optional[float] = None) -> T:
+        """Poll `condition(driver)` until it returns a truthy value; TimeoutException after `timeout`."""
+        limit = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + limit
+        interval, polls = self.initial_poll, 0
+        timed_out = False
+        try:
+            while True:
+                polls += 1
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        return value
+                except _RETRY:
+                    pass
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    raise TimeoutException(message or f"Condition not met within {limit}s ({polls} polls)")
+                time.sleep(min(interval, remaining))
+                interval = min(self.max_poll, interval * self.backoff)
+        finally:
+            self._account(message or getattr(condition, "__name__", "condition"), time.monotonic() - started,
+                          polls, timed_out)
+
+    def _account(self, label: str, elapsed: float, polls: int, timed_out: bool = False) -> None:
+        log = getattr(self.driver, "wait_log", None)
+        if log is not None:
+            log.add(label, elapsed, polls, timed_out)
+        record = current_step()
+        if record is not None:
+            record.meta["wait_ms"] = round(record.meta.get("wait_ms", 0) + elapsed * 1000, 1)
+            record.meta["polls"] = record.meta.get("polls", 0) + polls
+
+    # ---------- single locator ----------
+    def visible(self, locator: Locator, *, timeout: Optional[float] = None) -> WebElement:
+        def check(driver: Any) -> Optional[WebElement]:
+            element = driver.find_element(*locator)
+            return element if element.is_displayed() else None
+        return self.until(check, f"Element not visible: {locator}", timeout=timeout)
+
+    def present(self, locator: Locator, *, timeout: Optional[float] = None) -> WebElement:
+        def check(driver: Any) -> Optional[WebElement]:
+            found = driver.find_elements(*locator)
+            return found[0] if found else None
+        return self.until(check, f"Element not present: {locator}", timeout=timeout)
+
+    def clickable(self, locator: Locator, *, timeout: Optional[float] = None) -> WebElement:
+        def check(driver: Any) -> Optional[WebElement]:
+            element = driver.find_element(*locator)
+            return element if element.is_displayed() and element.is_enabled() else None
+        return self.until(check, f"Element not clickable: {locator}", timeout=timeout)
+
+    # ---------- DOM-stable checks ----------
+    def present_when_settled(self, locator: Locator, *, settle_ms: int = 300, timeout: Optional[float] = None) -> bool:
+        """True as soon as `locator` matches; False once the page stopped changing (or at `timeout`) without it."""
+        return self._observe(locator, _SETTLED_JS, [settle_ms], timeout, present=True)
+
+    def until_absent(self, locator: Locator, *, timeout: Optional[float] = None) -> bool:
+        """True as soon as nothing matches `locator` (no exception when it stays: False at `timeout`)."""
+        return self._observe(locator, _GONE_JS, [], timeout, present=False)
+
+    def _observe(self, locator: Locator, script: str, args: list, timeout: Optional[float], *, present: bool) -> bool:
+        limit = self.timeout if timeout is None else timeout
+        query = dom_query(locator)
+        started = time.monotonic()
+        if query is not None:
+            try:
+                result = bool(self.driver.execute_async_script(script, query, *args, int(limit * 1000)))
+                self._account(f"{'present' if present else 'absent'}: {locator}", time.monotonic() - started, 1)
+                return result
+            except WebDriverException:
+                pass  # navigation during the script / script timeout: poll for the remaining time
+        remaining = max(0.0, limit - (time.monotonic() - started))
+        try:
+            if present:
+                self.until(lambda d: d.find_elements(*locator), timeout=remaining)
+            else:
+                self.until(lambda d: not d.find_elements(*locator), timeout=remaining)
+            return True
+        except TimeoutException:
+            return False
+
+    # ---------- batched ----------
+    def _batch(self, locators: Sequence[Locator], visible: bool) -> List[Optional[WebElement]]:
+        queries = [dom_query(locator) for locator in locators]
+        if all(q is not None for q in queries):
+            return list(self.driver.execute_script(_BATCH_JS, queries, visible))
+        found: List[Optional[WebElement]] = []  # a locator without a CSS/XPath form: one call per locator
+        for locator in locators:
+            elements = [e for e in self.driver.find_elements(*locator) if not visible or e.is_displayed()]
+            found.append(elements[0] if elements else None)
+        return found
+
+    def visible_all(self, *locators: Locator, message: str = "", timeout: Optional[float] = None) -> List[WebElement]:
+        """Wait until every locator has a visible element (one round-trip per poll); elements in locator order."""
+        def check(driver: Any) -> Optional[List[WebElement]]:
+            found = self._batch(locators, True)
+            return [e for e in found if e is not None] if all(e is not None for e in found) else None
+        return self.until(check, message or f"Not all visible: {list(locators)}", timeout=timeout)
+
+    def first_visible(self, *locators: Locator, message: str = "",
+                      timeout: Optional[float] = None) -> Tuple[int, WebElement]:
+        """Wait until any locator has a visible element: (index of the locator, element), e.g. success vs error."""
+        def check(driver: Any) -> Optional[Tuple[int, WebElement]]:
+            for index, element in enumerate(self._batch(locators, True)):
+                if element is not None:
+                    return index, element
+            return None
+        return self.until(check, message or f"None visible: {list(locators)}", timeout=timeout)
@@ -1,20 +1,49 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Mapping, Optional
+import zlib
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
 
 import allure
 from requests import PreparedRequest, Response, Session
 
+from core.util.allure_hooks.attachment_writer import AllureAttachmentWriter
 from core.util.logging import Logger
 
+Attachment = Tuple[str, Any, Callable[[], str]]
+
+ATTACH_MODES = ("always", "on-failure", "sampled")
 
-class AllureApiLogger:
-    """Attach cURL / Request & Response JSON / Meta to Allure via Requests response hook."""
 
-    def __init__(self, *, max_body_len: int = 200_000) -> None:
+class AllureApiLogger:
+    """
+    Attach cURL / Request & Response JSON / Meta to Allure via Requests response hook.
+    With a `writer`, the hook only registers the attachments; formatting and file writes run on
+    the writer's thread, off the request's critical path.
+
+    Modes:
+    - `always`: attach every exchange to the current step;
+    - `on-failure`: keep the last `buffer_size` exchanges of the test in memory and attach them
+      only if the test fails (once failed, later exchanges are attached directly);
+    - `sampled`: like `on-failure`, plus a stable `sample_rate` share of passing tests is attached.
+    The pytest hooks call `test_failed()` / `end_test()`; buffered exchanges are attached to the test.
+    """
+
+    def __init__(self, *, max_body_len: int = 200_000, writer: Optional[AllureAttachmentWriter] = None,
+                 mode: str = "always", sample_rate: float = 0.1, buffer_size: int = 50) -> None:
+        if mode not in ATTACH_MODES:
+            raise ValueError(f"Unknown attach mode '{mode}', expected one of {ATTACH_MODES}")
         self.log = Logger.get_logger("AllureApiLogger", prefix="ALOG")
         self.max_body_len = max_body_len
+        self.writer = writer
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self._buffer: Deque[Tuple[str, List[Attachment]]] = deque(maxlen=buffer_size)
+        self._seen = 0
+        self._failed = False
 
     # -------- helpers --------
     @staticmethod
@@ -52,43 +81,93 @@ class AllureApiLogger:
             return x.decode("utf-8", errors="replace") if isinstance(x, (bytes, bytearray)) else str(x)
 
     # -------- hook --------
-    def _on_response(self, resp: Response, *args, **kwargs) -> None:
-        """Requests 'response' hook: called for each response."""
-        try:
-            prep = resp.request  # PreparedRequest
-            req_ct = (prep.headers or {}).get("Content-Type")
-            body_preview: Optional[str] = None
-            if self._is_json(req_ct) and prep.body:
-                raw = prep.body if isinstance(prep.body, (bytes, bytearray)) else str(prep.body).encode("utf-8")
-                body_preview = self._shorten(self._pretty(raw))
-
-            # cURL
-            allure.attach(self._curl(prep, body_preview), name="cURL", attachment_type=allure.attachment_type.TEXT)
-
-            # Request JSON
-            if body_preview is not None:
-                allure.attach(body_preview, name="Request JSON", attachment_type=allure.attachment_type.JSON)
-
-            # Response Meta
-            meta = {
+    def _attachments(self, resp: Response, streamed: bool = False) -> List[Attachment]:
+        """(name, type, body builder) of attachments for a response; only cheap checks run here."""
+        prep = resp.request  # PreparedRequest
+        has_body = self._is_json((prep.headers or {}).get("Content-Type")) and bool(prep.body)
+
+        @lru_cache(maxsize=None)
+        def body_preview() -> Optional[str]:
+            if not has_body:
+                return None
+            raw = prep.body if isinstance(prep.body, (bytes, bytearray)) else str(prep.body).encode("utf-8")
+            return self._shorten(self._pretty(raw))
+
+        def meta() -> str:
+            elapsed = getattr(resp, "elapsed", None)
+            return json.dumps({
                 "status_code": resp.status_code,
                 "reason": resp.reason,
                 "url": resp.url,
                 "headers": self._mask_headers(dict(resp.headers)),
-                "elapsed_ms": int(getattr(resp, "elapsed").total_seconds() * 1000) if getattr(resp, "elapsed", None) else None,
-            }
-            allure.attach(json.dumps(meta, ensure_ascii=False, indent=2, sort_keys=True),
-                          name="Response Meta", attachment_type=allure.attachment_type.JSON)
-
-            # Response JSON
-            if self._is_json(resp.headers.get("Content-Type")):
-                # ensure content is loaded before pretty-print
-                _ = resp.content  # no-op, forces load if stream=True
-                allure.attach(self._shorten(self._pretty(resp.text)), name="Response JSON",
-                              attachment_type=allure.attachment_type.JSON)
+                "elapsed_ms": int(elapsed.total_seconds() * 1000) if elapsed else None,
+            }, ensure_ascii=False, indent=2, sort_keys=True)
+
+        items: List[Attachment] = [
+            ("cURL", allure.attachment_type.TEXT, lambda: self._curl(prep, body_preview()))]
+        if has_body:
+            items.append(("Request JSON", allure.attachment_type.JSON, lambda: body_preview() or ""))
+        items.append(("Response Meta", allure.attachment_type.JSON, meta))
+        # Response JSON (skipped for stream=True: reading it here would drain the body before the caller)
+        if self._is_json(resp.headers.get("Content-Type")) and not streamed:
+            # non-streamed bodies are read by requests right after the hooks anyway
+            content = resp.content
+            items.append(("Response JSON", allure.attachment_type.JSON,
+                          lambda: self._shorten(self._pretty(content))))
+        return items
+
+    def _on_response(self, resp: Response, *args, **kwargs) -> None:
+        """Requests 'response' hook: called for each response."""
+        try:
+            if self.writer is not None and not self.writer.enabled():
+                return
+            streamed = bool(kwargs.get("stream"))
+            if self.mode == "always" or self._failed:
+                self._emit(self._attachments(resp, streamed))
+                return
+            self._seen += 1
+            label = f"#{self._seen} {resp.request.method} {urlsplit(resp.url or '').path}"
+            self._buffer.append((label, self._attachments(resp, streamed)))
         except Exception as e:
             self.log.debug(f"AllureApiLogger hook failed: {e}")
 
+    def _emit(self, items: List[Attachment], label: Optional[str] = None) -> None:
+        for name, attachment_type, build in items:
+            name = f"{label} {name}" if label else name
+            if self.writer is not None:
+                self.writer.attach(build, name=name, attachment_type=attachment_type)
+            else:
+                allure.attach(build(), name=name, attachment_type=attachment_type)
+
+    # -------- buffered modes: per-test lifecycle --------
+    def _flush_buffer(self) -> None:
+        dropped = self._seen - len(self._buffer)
+        if dropped > 0:
+            allure.attach(f"{dropped} earlier exchanges of this test were not kept (buffer size "
+                          f"{self._buffer.maxlen})", name="HTTP exchanges dropped",
+                          attachment_type=allure.attachment_type.TEXT)
+        while self._buffer:
+            label, items = self._buffer.popleft()
+            self._emit(items, label)
+
+    def _sampled(self, nodeid: str) -> bool:
+        # stable per test id: the same tests are sampled on every run
+        return zlib.crc32(nodeid.encode("utf-8")) % 10_000 < self.sample_rate * 10_000
+
+    def test_failed(self) -> None:
+        """A phase of the current test failed: attach what was buffered, attach directly from now on."""
+        if self.mode != "always" and not self._failed:
+            self._failed = True
+            self._flush_buffer()
+
+    def end_test(self, nodeid: str) -> None:
+        """Current test finished (after teardown): attach if sampled, then forget its exchanges."""
+        if self.mode == "sampled" and not self._failed and self._sampled(nodeid):
+            self._flush_buffer()
+        self._buffer.clear()
+        self._seen = 0
+        self._failed = False
+
     # -------- installer --------
     def install(self, session: Session) -> None:
         """Register response hook on a given Session (idempotent)."""
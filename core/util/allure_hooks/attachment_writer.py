@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable, Optional, Set
+from uuid import uuid4
+
+import allure_commons
+import pytest
+
+from core.util.logging import Logger
+
+BodyBuilder = Callable[[], Any]
+Task = Callable[[], None]
+
+
+def _allure_reporter() -> Any:
+    """AllureReporter of the active allure-pytest listener, or None when Allure is not collecting results."""
+    for plugin in allure_commons.plugin_manager.get_plugins():
+        reporter = getattr(plugin, "allure_logger", None)
+        if reporter is not None and hasattr(reporter, "_attach"):
+            return reporter
+    return None
+
+
+class AllureAttachmentWriter:
+    """
+    Builds and writes Allure attachment files on a background thread.
+
+    `attach()` registers the attachment (name, type, file name) on the current test/step right away,
+    on the calling thread, so it stays with its owner; the body is produced by `build` and written
+    later through the regular `report_attached_data` hook (AllureFileLogger -> results dir).
+    The queue is bounded: when the writer falls behind, callers block instead of piling up memory.
+    `flush()` is called at the end of every test.
+
+    With a content `key`, the attachment file is named after it and written once per run; later
+    attachments with the same key only reference that file (identical screenshots of a failure storm).
+    """
+
+    def __init__(self, *, max_pending: int = 256) -> None:
+        self.log = Logger.get_logger("AllureAttachmentWriter", prefix="ALOG")
+        self._queue: "queue.Queue[Optional[Task]]" = queue.Queue(maxsize=max_pending)
+        self._keys: Set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.blocked = 0
+        self.deduplicated = 0
+
+    @staticmethod
+    def enabled() -> bool:
+        return _allure_reporter() is not None
+
+    def attach(self, build: BodyBuilder, *, name: str, attachment_type: Any, key: Optional[str] = None) -> bool:
+        """Register an attachment on the current test/step and queue its body; False if Allure is inactive."""
+        reporter = _allure_reporter()
+        if reporter is None:
+            return False
+        try:
+            file_name: str = reporter._attach(key or uuid4(), name=name, attachment_type=attachment_type)
+        except Exception as e:  # no running test/step (e.g. session fixture teardown)
+            self.log.debug(f"Attachment '{name}' not registered: {e}")
+            return False
+        if key is not None:
+            if key in self._keys:
+                self.deduplicated += 1
+                return True
+            self._keys.add(key)
+
+        def write() -> None:
+            allure_commons.plugin_manager.hook.report_attached_data(body=build(), file_name=file_name)
+
+        self.submit(write)
+        return True
+
+    def submit(self, task: Task) -> None:
+        """Run `task` on the writer thread (blocks while the queue is full)."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            self.blocked += 1
+            self._queue.put(task)
+
+    def flush(self) -> None:
+        """Block until every queued attachment is written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.log.info(f"Attachments written={self.written} failed={self.failed} "
+                      f"deduplicated={self.deduplicated} producer waits={self.blocked}")
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="allure-attachment-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                task()
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                self.log.warning(f"Attachment not written: {e}")
+            finally:
+                self._queue.task_done()
+
+
+ATTACHMENT_WRITER_KEY = pytest.StashKey[AllureAttachmentWriter]()
+
+
+def shared_attachment_writer(config: Any) -> AllureAttachmentWriter:
+    """The session's single writer: API logging and UI failure artifacts share its thread, queue and flushes."""
+    writer = config.stash.get(ATTACHMENT_WRITER_KEY, None)
+    if writer is None:
+        writer = AllureAttachmentWriter()
+        config.stash[ATTACHMENT_WRITER_KEY] = writer
+    return writer
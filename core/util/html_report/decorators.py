@@ -1,7 +1,14 @@
+import inspect
+import string
+import threading
+import time
 from functools import wraps
-from typing import Callable, Any, TypeVar
+from typing import Callable, Any, Dict, List, Mapping, Optional, Tuple, TypeVar
 
+import allure_commons
 import pytest
+from allure_commons._allure import StepContext
+from allure_commons.utils import represent
 
 from core.util.logging import Logger
 
@@ -97,3 +104,256 @@ def html_step(step_description: str) -> Callable[[F], F]:
         return wrapper
 
     return decorator
+
+
+# ============================ unified step decorator ============================
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+# steps currently running on the main (test) thread, innermost last
+_STEP_STACK: List["StepRecord"] = []
+
+
+class _CallSpec:
+    """Argument names and defaults of a decorated function, resolved once at decoration time."""
+    __slots__ = ("names", "defaults", "has_fields")
+
+    def __init__(self, func: Callable[..., Any], template: str) -> None:
+        params = inspect.signature(func).parameters.values()
+        self.names: Tuple[str, ...] = tuple(p.name for p in params if p.kind in _POSITIONAL)
+        self.defaults: Dict[str, Any] = {p.name: p.default for p in params if p.default is not p.empty}
+        self.has_fields = "{" in template
+
+    def mapping(self, args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        values = dict(self.defaults)
+        values.update(zip(self.names, args))
+        values.update(kwargs)
+        return values
+
+
+class _SafeFormatMap(dict):
+    def __missing__(self, key: str) -> str:
+        return f"[UNKNOWN: {key}]"
+
+
+class _StepFormatter(string.Formatter):
+    """`{body.userName}` works for objects and dicts alike (request bodies are either)."""
+
+    def get_field(self, field_name: str, args: Any, kwargs: Any) -> Tuple[Any, str]:
+        first, *attrs = field_name.split(".")
+        obj = kwargs[first]
+        for name in attrs:
+            obj = obj[name] if isinstance(obj, Mapping) and name in obj else getattr(obj, name)
+        return obj, first
+
+
+_FORMATTER = _StepFormatter()
+
+
+def _return_size(value: Any) -> Optional[int]:
+    """Size of a step result: len() of containers/strings, body length of an already read Response."""
+    if isinstance(value, (str, bytes, list, tuple, dict, set)):
+        return len(value)
+    content = getattr(value, "_content", None)  # requests.Response; never forces a streamed body
+    return len(content) if isinstance(content, bytes) else None
+
+
+class StepRecord:
+    """
+    A recorded step: lazily formatted title, wall-clock start, duration, outcome and nested steps.
+    `process_report` converts the tree to plain dicts once per test (reports must stay serializable for xdist).
+    """
+    __slots__ = ("template", "_spec", "_args", "_kwargs", "_title",
+                 "start", "duration", "outcome", "meta", "children")
+
+    def __init__(self, template: str, spec: _CallSpec, args: tuple, kwargs: Dict[str, Any]) -> None:
+        self.template = template
+        self._spec: Optional[_CallSpec] = spec if spec.has_fields else None
+        self._args = args if spec.has_fields else ()
+        self._kwargs = kwargs if spec.has_fields else {}
+        self._title: Optional[str] = None if spec.has_fields else template
+        self.start = time.time()
+        self.duration = 0.0
+        self.outcome = "running"
+        self.meta: Dict[str, Any] = {}
+        self.children: List["StepRecord"] = []
+
+    @property
+    def title(self) -> str:
+        if self._title is None:
+            assert self._spec is not None
+            try:
+                self._title = _FORMATTER.vformat(self.template, (),
+                                                 _SafeFormatMap(self._spec.mapping(self._args, self._kwargs)))
+            except Exception as e:
+                self._title = f"{self.template} [FORMAT ERROR: {e}]"
+            # drop references to call arguments once rendered
+            self._spec, self._args, self._kwargs = None, (), {}
+        return self._title
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        """
+        Compact form: t=title, s=start offset from `origin` (ms), d=duration (ms);
+        o=outcome, m=metadata and c=children are present only when not default/empty.
+        """
+        data: Dict[str, Any] = {"t": self.title, "s": round((self.start - origin) * 1000, 1),
+                                "d": round(self.duration * 1000, 1)}
+        if self.outcome != "passed":
+            data["o"] = self.outcome
+        if self.meta:
+            data["m"] = self.meta
+        if self.children:
+            data["c"] = [child.to_dict(origin) for child in self.children]
+        return data
+
+    def __str__(self) -> str:
+        return self.title
+
+
+def current_step() -> Optional[StepRecord]:
+    """Innermost running step of the test thread (None outside steps or on helper threads)."""
+    if not _STEP_STACK or threading.current_thread() is not threading.main_thread():
+        return None
+    return _STEP_STACK[-1]
+
+
+def _allure_enabled() -> bool:
+    """Allure listeners are registered only when results are being collected (--alluredir)."""
+    return bool(allure_commons.plugin_manager.hook.start_step.get_hookimpls())
+
+
+def _open_record(template: str, spec: _CallSpec, args: tuple, kwargs: Dict[str, Any],
+                 parent: Optional[StepRecord]) -> StepRecord:
+    """New step record, attached to the running step or, for a top-level step, to the current test."""
+    record = StepRecord(template, spec, args, kwargs)
+    if parent is not None:
+        parent.children.append(record)
+        return record
+    request = getattr(pytest, "current_request", None)
+    if request is not None:
+        node = request.node
+        steps_list = getattr(node, "html_steps", None)
+        if steps_list is None:
+            steps_list = []
+            node.html_steps = steps_list
+        steps_list.append(record)
+    return record
+
+
+def _generator_step(func: Callable[..., Any], template: str, spec: _CallSpec,
+                    capture_size: bool) -> Callable[..., Any]:
+    """
+    Step wrapper for generator functions: the step opens on the first `next()` and stays open until
+    the generator is exhausted or closed, so the work done while iterating is timed and nested under it.
+    The step is on the stack only while the generator runs; the consumer's own steps between items
+    stay where they are. Closing the generator early (break / first match) counts as passed;
+    `capture_size=True` stores the number of yielded items.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
+        if threading.current_thread() is not threading.main_thread():
+            return (yield from func(*args, **kwargs))
+        parent = _STEP_STACK[-1] if _STEP_STACK else None
+        if parent is not None and parent.template == template:
+            return (yield from func(*args, **kwargs))
+
+        record = _open_record(template, spec, args, kwargs, parent)
+        allure_step: Optional[StepContext] = None
+        if _allure_enabled():
+            params = {k: represent(v) for k, v in spec.mapping(args, kwargs).items() if k != "self"}
+            allure_step = StepContext(record.title, params)
+            allure_step.__enter__()
+        started = time.perf_counter()
+        items = 0
+        error: Optional[BaseException] = None
+        inner = func(*args, **kwargs)
+        try:
+            while True:
+                _STEP_STACK.append(record)
+                try:
+                    item = next(inner)
+                except StopIteration as stop:
+                    record.outcome = "passed"
+                    return stop.value
+                finally:
+                    _STEP_STACK.pop()
+                items += 1
+                yield item
+        except GeneratorExit:
+            record.outcome = "passed"
+            raise
+        except BaseException as e:
+            record.outcome = "failed"
+            error = e
+            raise
+        finally:
+            _STEP_STACK.append(record)
+            try:
+                inner.close()  # runs the generator's own cleanup inside the step
+            finally:
+                _STEP_STACK.pop()
+                record.duration = time.perf_counter() - started
+                if capture_size:
+                    record.meta["size"] = items
+                if allure_step is not None:
+                    allure_step.__exit__(type(error) if error else None, error,
+                                         error.__traceback__ if error else None)
+
+    return wrapper
+
+
+def step(template: str, *, capture_size: bool = False) -> Callable[[F], F]:
+    """
+    Single step decorator for both the HTML report and Allure (replaces stacked html_step + allure.step).
+
+    - argument names are bound once at decoration time; the title is formatted lazily;
+    - steps are recorded as a tree with start time, duration and outcome;
+      `capture_size=True` also stores the size of the returned value;
+    - on a generator function the step spans the iteration, not the creation of the generator object;
+    - a step nested directly inside a step with the same template (service -> client wrapper) is collapsed;
+    - Allure steps are emitted only when an Allure listener is active;
+    - calls from helper threads are not recorded (they would land in whatever test runs on the main thread).
+    """
+
+    def decorator(func: F) -> F:
+        spec = _CallSpec(func, template)
+        if inspect.isgeneratorfunction(func):
+            gen_wrapper = _generator_step(func, template, spec, capture_size)
+            setattr(gen_wrapper, "_html_step", template)
+            return gen_wrapper  # type: ignore[return-value]
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
+            if threading.current_thread() is not threading.main_thread():
+                return func(*args, **kwargs)
+            parent = _STEP_STACK[-1] if _STEP_STACK else None
+            if parent is not None and parent.template == template:
+                return func(*args, **kwargs)
+
+            record = _open_record(template, spec, args, kwargs, parent)
+            _STEP_STACK.append(record)
+            started = time.perf_counter()
+            try:
+                if _allure_enabled():
+                    params = {k: represent(v) for k, v in spec.mapping(args, kwargs).items() if k != "self"}
+                    with StepContext(record.title, params):
+                        result = func(*args, **kwargs)
+                else:
+                    result = func(*args, **kwargs)
+            except BaseException:
+                record.outcome = "failed"
+                raise
+            else:
+                record.outcome = "passed"
+                if capture_size:
+                    size = _return_size(result)
+                    if size is not None:
+                        record.meta["size"] = size
+                return result
+            finally:
+                record.duration = time.perf_counter() - started
+                _STEP_STACK.pop()
+
+        setattr(wrapper, "_html_step", template)
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
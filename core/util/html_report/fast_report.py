@@ -0,0 +1,243 @@
+"""
+Scalable HTML report for large runs (`--fast-report=DIR`).
+
+Rows are streamed to `DIR/rows.js` as compact JSON while tests finish (nothing is kept in memory),
+screenshots are stored as files under `DIR/assets/` (thumbnail + full size) instead of being inlined,
+and `DIR/index.html` renders the table with virtual scrolling, so only visible rows are in the DOM.
+Columns match the pytest-html report: Feature, Revision, Test set, Test, Start Time, Steps,
+Duration, Result, Screenshot, Links.
+
+DIR must be empty, missing, or a previous fast report (it carries a `.fast-report` marker):
+only the files the report writes itself are replaced, nothing else in DIR is deleted.
+"""
+
+from __future__ import annotations
+
+import base64
+import importlib
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, IO, Optional
+
+from core.util.logging import Logger
+
+try:  # optional: real thumbnails; without Pillow the full image is shown scaled down
+    Image: Any = importlib.import_module("PIL.Image")
+except ImportError:  # pragma: no cover
+    Image = None
+
+log = Logger.get_logger("FastReport", prefix="REPORT")
+
+THUMB_SIZE = (160, 100)
+MARKER = ".fast-report"
+
+
+class FastHtmlReport:
+    """pytest plugin (controller only under xdist): one row per test, written as soon as its report arrives."""
+
+    def __init__(self, out_dir: Path, *, title: str = "Test report") -> None:
+        self.out_dir = out_dir
+        self.assets = out_dir / "assets"
+        self.title = title
+        self.rows = 0
+        self.counts: Dict[str, int] = {}
+        self._images = 0
+        self._fh: Optional[IO[str]] = None
+        self._started = time.time()
+        if out_dir.exists() and not (out_dir / MARKER).exists() and (not out_dir.is_dir() or any(out_dir.iterdir())):
+            raise ValueError(f"'{out_dir}' is not empty and is not a fast report directory; "
+                             f"pass an empty or new directory")
+
+    # ---------- pytest hooks ----------
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        # one row per test: the call phase, or setup when it failed / skipped the test
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            if self._fh is None:
+                self._open()
+            self._write_row(self._row(report))
+
+    def pytest_sessionfinish(self, session: Any) -> None:
+        if self._fh is None:
+            self._open()
+        assert self._fh is not None
+        self._fh.close()
+        self._fh = None
+        self._write_index()
+        log.info(f"Fast report: {self.rows} rows -> {self.out_dir / 'index.html'}")
+
+    # ---------- rows ----------
+    def _open(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        (self.out_dir / MARKER).touch()
+        # only what a previous fast report wrote here
+        shutil.rmtree(self.assets, ignore_errors=True)
+        (self.out_dir / "index.html").unlink(missing_ok=True)
+        self.assets.mkdir()
+        self._fh = (self.out_dir / "rows.js").open("w", encoding="utf-8", buffering=1)
+
+    def _row(self, report: Any) -> Dict[str, Any]:
+        outcome = report.outcome
+        if report.when == "setup" and report.failed:
+            outcome = "error"
+        elif hasattr(report, "wasxfail"):
+            outcome = "xfailed" if report.skipped else "xpassed"
+        row: Dict[str, Any] = {
+            "f": getattr(report, "_feature", ""),
+            "r": getattr(report, "html_revision", ""),
+            "s": getattr(report, "_html_sub_suite", ""),
+            "t": getattr(report, "_html_title", report.nodeid.split("::")[-1]),
+            "id": report.nodeid,
+            "st": getattr(report, "formatted_start_time", ""),
+            "d": round(report.duration, 3),
+            "o": outcome,
+        }
+        steps = getattr(report, "html_steps", None)
+        if steps:
+            row["steps"] = steps
+        links = [{"n": e.get("name") or e["content"], "u": e["content"]}
+                 for e in getattr(report, "extras", getattr(report, "extra", [])) or []
+                 if e.get("format_type") == "url"]
+        if links:
+            row["l"] = links
+        image = self._store_image(report)
+        if image:
+            row["img"] = image
+        return row
+
+    def _write_row(self, row: Dict[str, Any]) -> None:
+        assert self._fh is not None
+        self._fh.write("R(" + json.dumps(row, ensure_ascii=False, separators=(",", ":")) + ");\n")
+        self.rows += 1
+        self.counts[row["o"]] = self.counts.get(row["o"], 0) + 1
+
+    # ---------- images ----------
+    def _store_image(self, report: Any) -> Optional[Dict[str, str]]:
+        for extra in getattr(report, "extras", getattr(report, "extra", [])) or []:
+            if extra.get("format_type") != "image":
+                continue
+            try:
+                return self._save_image(extra["content"], extra.get("extension") or "png")
+            except Exception as e:
+                log.warning(f"Screenshot of {report.nodeid} not stored: {e}")
+        return None
+
+    def _save_image(self, content: str, extension: str) -> Optional[Dict[str, str]]:
+        self._images += 1
+        full = self.assets / f"{self._images}.{extension}"
+        if content.startswith("data:"):  # already processed by pytest-html (self-contained)
+            content = content.split(",", 1)[1]
+        source = Path(content)
+        if len(content) < 1024 and source.is_file():
+            shutil.copyfile(source, full)
+        elif len(content) >= 1024:  # pytest-html passes screenshots as base64
+            full.write_bytes(base64.b64decode(content))
+        else:
+            return None
+        thumb = full
+        if Image is not None:
+            thumb = self.assets / f"{self._images}_thumb.{extension}"
+            with Image.open(full) as img:
+                img.thumbnail(THUMB_SIZE)
+                img.save(thumb)
+        return {"full": f"assets/{full.name}", "thumb": f"assets/{thumb.name}"}
+
+    # ---------- page ----------
+    def _write_index(self) -> None:
+        summary = {"title": self.title, "total": self.rows, "counts": self.counts,
+                   "generated": time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "duration": round(time.time() - self._started, 1)}
+        page = _INDEX_HTML.replace("__SUMMARY__", json.dumps(summary, ensure_ascii=False))
+        (self.out_dir / "index.html").write_text(page, encoding="utf-8")
+
+
+_INDEX_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Report</title>
+<style>
+body{font:13px sans-serif;margin:12px}
+#bar{margin-bottom:8px}#bar input{width:260px}
+.grid{display:grid;grid-template-columns:110px 80px 160px minmax(220px,1fr) 80px 150px 70px 70px 70px 110px}
+.grid>div{padding:2px 4px;overflow:hidden;white-space:nowrap;text-overflow:ellipsis;height:24px;line-height:24px}
+#head{font-weight:bold;border-bottom:1px solid #ccc}
+#view{height:70vh;overflow-y:auto;position:relative;border-bottom:1px solid #ccc}
+#rows{position:absolute;left:0;right:0}
+.row{cursor:pointer}.row:hover{background:#f3f3f3}
+.passed{color:#2e7d32}.failed,.error{color:#c62828}.skipped,.xfailed,.xpassed{color:#888}
+img.thumb{height:22px;vertical-align:middle}
+#detail{margin-top:10px;white-space:normal}
+.bar{display:inline-block;height:6px;margin:0 4px;vertical-align:middle;background:#5bc0de}
+.bar.f{background:#d9534f}.step{margin-left:14px}
+</style></head><body>
+<h3 id="title"></h3><div id="summary"></div>
+<div id="bar">Filter: <input id="q" placeholder="text in test / feature / set">
+<select id="o"><option value="">all results</option><option>passed</option><option>failed</option>
+<option>error</option><option>skipped</option><option>xfailed</option><option>xpassed</option></select></div>
+<div id="head" class="grid"></div>
+<div id="view"><div id="spacer"></div><div id="rows"></div></div>
+<div id="detail"></div>
+<script>
+var SUMMARY = __SUMMARY__, ALL = [], ROWS = [], H = 28;
+function R(r) { ALL.push(r); }
+</script>
+<script src="rows.js"></script>
+<script>
+var COLS = ["Feature","Revision","Test set","Test","Start Time","Steps","Duration","Result","Screenshot","Links"];
+function esc(s) { return String(s == null ? "" : s).replace(/[&<>"]/g, function (c) {
+  return {"&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;"}[c]; }); }
+function ms(v) { return v >= 1000 ? (v / 1000).toFixed(2) + " s" : Math.round(v) + " ms"; }
+function stepSummary(r) {
+  if (!r.steps) return "";
+  var slow = r.steps.reduce(function (a, s) { return (s.d || 0) > (a.d || 0) ? s : a; }, {});
+  return r.steps.length + " steps" + (slow.d ? " \\u00b7 max " + ms(slow.d) : "");
+}
+function cells(r) {
+  var img = r.img ? '<a href="' + r.img.full + '" target="_blank"><img class="thumb" loading="lazy" src="' + r.img.thumb + '"></a>' : "";
+  var links = (r.l || []).map(function (l) { return '<a href="' + esc(l.u) + '" target="_blank">' + esc(l.n) + "</a>"; }).join(" ");
+  return [r.f, r.r, r.s, r.t, r.st, stepSummary(r), r.d.toFixed(2) + " s", r.o].map(function (v, i) {
+    return '<div title="' + esc(v) + '"' + (i === 7 ? ' class="' + r.o + '"' : "") + ">" + esc(v) + "</div>";
+  }).join("") + "<div>" + img + "</div><div>" + links + "</div>";
+}
+function tree(steps, scale) {
+  return steps.map(function (s) {
+    var bar = s.d != null ? '<span class="bar' + (s.o === "failed" ? " f" : "") + '" style="width:' + Math.max(1, Math.round(s.d * scale)) + 'px"></span>' + ms(s.d) : "";
+    var size = s.m && s.m.size != null ? " [" + s.m.size + "]" : "";
+    if (s.m && s.m.wait_ms != null) size += " (waited " + ms(s.m.wait_ms) + ", " + (s.m.polls || 0) + " polls)";
+    return '<div class="step"><span class="' + (s.o === "failed" ? "failed" : "") + '">' + esc(s.t) + "</span>" + bar + size +
+      (s.c ? tree(s.c, scale) : "") + "</div>";
+  }).join("");
+}
+function showDetail(i) {
+  var r = ROWS[i], longest = Math.max.apply(null, (r.steps || [{d: 0}]).map(function (s) { return s.d || 0; }));
+  document.getElementById("detail").innerHTML = "<b>" + esc(r.id) + "</b> \\u2014 <span class=\\"" + r.o + "\\">" + r.o + "</span>" +
+    (r.steps ? tree(r.steps, longest ? 200 / longest : 0) : "<div>no steps</div>");
+}
+var view = document.getElementById("view"), rowsEl = document.getElementById("rows");
+function render() {
+  var first = Math.max(0, Math.floor(view.scrollTop / H) - 10);
+  var last = Math.min(ROWS.length, first + Math.ceil(view.clientHeight / H) + 20), html = [];
+  for (var i = first; i < last; i++) html.push('<div class="grid row" style="height:' + H + 'px" data-i="' + i + '">' + cells(ROWS[i]) + "</div>");
+  rowsEl.style.top = (first * H) + "px";
+  rowsEl.innerHTML = html.join("");
+}
+function applyFilter() {
+  var q = document.getElementById("q").value.toLowerCase(), o = document.getElementById("o").value;
+  ROWS = ALL.filter(function (r) {
+    return (!o || r.o === o) && (!q || (r.t + " " + r.f + " " + r.s + " " + r.id).toLowerCase().indexOf(q) >= 0);
+  });
+  document.getElementById("spacer").style.height = (ROWS.length * H) + "px";
+  render();
+}
+document.getElementById("title").textContent = SUMMARY.title;
+document.getElementById("summary").textContent = SUMMARY.total + " tests, " + Object.keys(SUMMARY.counts).map(function (k) {
+  return SUMMARY.counts[k] + " " + k; }).join(", ") + " \\u2014 generated " + SUMMARY.generated + " in " + SUMMARY.duration + " s";
+document.getElementById("head").innerHTML = COLS.map(function (c) { return "<div>" + c + "</div>"; }).join("");
+view.addEventListener("scroll", function () { window.requestAnimationFrame(render); });
+rowsEl.addEventListener("click", function (e) {
+  var row = e.target.closest(".row"); if (row && e.target.tagName !== "IMG") showDetail(+row.dataset.i);
+});
+document.getElementById("q").addEventListener("input", applyFilter);
+document.getElementById("o").addEventListener("change", applyFilter);
+applyFilter();
+</script></body></html>
+"""
@@ -1,28 +1,15 @@
-import os
 import time
 from datetime import datetime
 
-from pytest_html import extras
-
+from core.util.html_report.step_tree import serialize_steps, render_step_tree
 from core.util.logging import Logger
 
-SCREENSHOT_DIR = "screenshots"
 logger = Logger.get_logger()
 
-if not os.path.exists(SCREENSHOT_DIR):
-    os.makedirs(SCREENSHOT_DIR)
-
-
-def take_screenshot() -> str:
-    """Capture a screenshot and return its file path."""
-    screenshot_filename = f"screenshot_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
-    screenshot_path = os.path.join(SCREENSHOT_DIR, screenshot_filename)
-    return os.path.normpath(screenshot_path)
-
 
 def process_report(report, item, call):
     """
-    Process the test report to add additional data like screenshots, custom titles, and metadata.
+    Process the test report to add additional data like custom titles, steps, and metadata.
 
     Args:
         report: The pytest report object.
@@ -59,7 +46,8 @@ def process_report(report, item, call):
     # === HTML STEPS SUPPORT ===
     if call.when == "call" and hasattr(item, "html_steps"):
         steps = getattr(item, "html_steps", [])
-        report.html_steps = steps
+        # step titles are rendered here, once; plain dicts survive xdist report serialization
+        report.html_steps = serialize_steps(steps)
         # Logger.log_info(logger, f"[p_r] html_steps {item.name}: {steps}")
 
     # === TIME METADATA ===
@@ -70,16 +58,6 @@ def process_report(report, item, call):
             "%H:%M:%S")  # Convert timestamps to readable format
         # Logger.log_info(logger, f"Test `{item.name}` started at {report.formatted_start_time}, duration: {report.duration:.2f}s")
 
-    # === SCREENSHOT ON FAILURE ===
-    if call.when == "call" and report.failed:
-        screenshot_path = take_screenshot()
-        if screenshot_path:
-            rel_screenshot_path = os.path.relpath(screenshot_path, os.getcwd())
-            extra = getattr(report, "extra", [])
-            extra.append(extras.image(rel_screenshot_path, name="Failure Screenshot"))
-            report.extra = extra
-            logger.info(f"[process_report] added screenshot: {report.extra}")
-
 
 def customize_header(cells):
     """Reorder columns in the HTML report header."""
@@ -113,15 +91,15 @@ def customize_row(report, cells):
     steps = getattr(report, "html_steps", [])
     # Logger.log_info(logger, f"[c_r] html_steps: {steps}")
     if steps:
-        steps_html = ""  # f"{len(steps)}:<br>"
-        for idx, step in enumerate(steps, 1):
-            steps_html += f'<span">{idx}. {step}</span><br>'
+        steps_html = render_step_tree(steps)
     else:
         steps_html = '<span style="color: gray;"></span>'
     # Logger.log_info(logger, f"Generated steps_html: {steps_html}")
 
-    if hasattr(report, "extra") and report.extra:
-        for extra in report.extra:
+    # failure screenshots of UI tests come from FailureArtifactCollector (tests/ui/conftest.py)
+    report_extras = getattr(report, "extras", None) or getattr(report, "extra", None)
+    if report_extras:
+        for extra in report_extras:
             if extra.get("format_type") == "image":
                 # logger.info(f"[table_row] extra: {extra}")
                 screenshot_html = (
@@ -0,0 +1,101 @@
+"""
+Micro-benchmark of step decorator overhead: stacked `html_step` + `allure.step` vs unified `step`.
+
+    python -m core.util.html_report.step_benchmark [--number 20000]
+
+Runs without Allure listeners (plain pytest run) and with a no-op listener registered
+(the `--alluredir` case), for a flat call and a 3-level nested call.
+"""
+
+import argparse
+import timeit
+from types import SimpleNamespace
+from typing import Any, Callable, Dict
+
+import allure
+import allure_commons
+import pytest
+
+from core.util.html_report.decorators import html_step, step
+
+
+class _NoopListener:
+    @allure_commons.hookimpl
+    def start_step(self, uuid: str, title: str, params: Any) -> None:
+        pass
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid: str, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        pass
+
+
+@html_step("Stacked: get user {user_id}")
+@allure.step("Stacked: get user {user_id}")
+def _stacked_leaf(user_id: str, *, expect: int = 200) -> str:
+    return user_id
+
+
+@html_step("Stacked: service")
+@allure.step("Stacked: service")
+def _stacked_mid(user_id: str) -> str:
+    return _stacked_leaf(user_id)
+
+
+@html_step("Stacked: flow")
+@allure.step("Stacked: flow")
+def _stacked_top(user_id: str) -> str:
+    return _stacked_mid(user_id)
+
+
+@step("Unified: get user {user_id}")
+def _unified_leaf(user_id: str, *, expect: int = 200) -> str:
+    return user_id
+
+
+@step("Unified: service")
+def _unified_mid(user_id: str) -> str:
+    return _unified_leaf(user_id)
+
+
+@step("Unified: flow")
+def _unified_top(user_id: str) -> str:
+    return _unified_mid(user_id)
+
+
+def _measure(cases: Dict[str, Callable[[], Any]], number: int) -> None:
+    node = SimpleNamespace(html_steps=[])
+    setattr(pytest, "current_request", SimpleNamespace(node=node))
+    try:
+        for name, fn in cases.items():
+            node.html_steps = []
+            best = min(timeit.repeat(fn, number=number, repeat=3))
+            # render lazily recorded titles too, as process_report does
+            render = timeit.timeit(lambda: [str(s) for s in node.html_steps], number=1)
+            print(f"  {name:<18} {(best + render / 3) / number * 1e6:8.2f} us/call")
+    finally:
+        setattr(pytest, "current_request", None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    cases = {
+        "stacked flat": lambda: _stacked_leaf("u1"),
+        "unified flat": lambda: _unified_leaf("u1"),
+        "stacked nested x3": lambda: _stacked_top("u1"),
+        "unified nested x3": lambda: _unified_top("u1"),
+    }
+    print("Allure inactive:")
+    _measure(cases, args.number)
+    listener = _NoopListener()
+    allure_commons.plugin_manager.register(listener)
+    try:
+        print("Allure listener registered:")
+        _measure(cases, args.number)
+    finally:
+        allure_commons.plugin_manager.unregister(listener)
+
+
+if __name__ == "__main__":
+    main()
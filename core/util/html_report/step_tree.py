@@ -0,0 +1,87 @@
+"""Serialization, HTML rendering and JSON export of the timed step tree recorded by `@step`."""
+
+import html
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.util.html_report.decorators import StepRecord
+from core.util.logging import Logger
+
+log = Logger.get_logger("StepTree", prefix="STEPS")
+
+StepDict = Dict[str, Any]
+
+_BAR_MAX_PX = 80
+
+
+def serialize_steps(steps: Iterable[Any]) -> List[StepDict]:
+    """Convert recorded steps to compact JSON-safe dicts (see `StepRecord.to_dict`); offsets are from the first step."""
+    steps = list(steps)
+    records = [s for s in steps if isinstance(s, StepRecord)]
+    origin = min((r.start for r in records), default=0.0)
+    # plain strings come from the legacy `html_step` decorator: no timing
+    return [s.to_dict(origin) if isinstance(s, StepRecord) else {"t": str(s)} for s in steps]
+
+
+def _format_ms(ms: float) -> str:
+    return f"{ms / 1000:.2f} s" if ms >= 1000 else f"{ms:.0f} ms"
+
+
+def _render_step(step: StepDict, scale: float) -> str:
+    duration = step.get("d")
+    failed = step.get("o") == "failed"
+    title = html.escape(step.get("t", ""))
+    color = "#d9534f" if failed else "#5bc0de"
+    label = ""
+    if duration is not None:
+        width = max(1, round(duration * scale))
+        label = (f'<span style="display:inline-block;height:6px;width:{width}px;background:{color};'
+                 f'margin:0 4px;vertical-align:middle"></span>'
+                 f'<span style="color:gray">{_format_ms(duration)}</span>')
+    meta = step.get("m") or {}
+    if meta.get("size") is not None:
+        label += f' <span style="color:gray">[{meta["size"]}]</span>'
+    if meta.get("wait_ms") is not None:
+        label += f' <span style="color:gray">(waited {_format_ms(meta["wait_ms"])}, {meta.get("polls", 0)} polls)</span>'
+    head = f'<span style="color:{"#d9534f" if failed else "inherit"}">{title}</span>{label}'
+    children = step.get("c")
+    if not children:
+        return f'<div style="margin-left:12px">{head}</div>'
+    inner = "".join(_render_step(child, scale) for child in children)
+    return (f'<details style="margin-left:12px"{" open" if failed else ""}>'
+            f'<summary>{head}</summary>{inner}</details>')
+
+
+def render_step_tree(steps: List[Any]) -> str:
+    """Collapsible step tree; bar width is proportional to the step duration (longest top-level step = full bar)."""
+    if steps and not isinstance(steps[0], dict):
+        steps = serialize_steps(steps)
+    longest = max((s.get("d") or 0.0 for s in steps), default=0.0)
+    scale = _BAR_MAX_PX / longest if longest else 0.0
+    return "".join(_render_step(s, scale) for s in steps)
+
+
+class StepTimingExport:
+    """
+    Collects step trees from call-phase reports and writes one JSON file.
+    Registered as a plugin on the controller, so it also receives the reports of xdist workers.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.tests: List[Dict[str, Any]] = []
+
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        steps: Optional[List[StepDict]] = getattr(report, "html_steps", None)
+        if report.when != "call" or not steps:
+            return
+        self.tests.append({"nodeid": report.nodeid, "outcome": report.outcome,
+                           "duration_ms": round(report.duration * 1000, 1), "steps": steps})
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        doc = {"generated": time.strftime("%Y-%m-%dT%H:%M:%S"), "tests": self.tests}
+        self.path.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+        log.info(f"Step timings of {len(self.tests)} tests written to {self.path}")
@@ -1,10 +1,17 @@
 # core/logging.py
 from __future__ import annotations
 
+import atexit
+import heapq
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
 from logging import DEBUG, INFO, WARNING, ERROR, CRITICAL
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 # Optional color support on Windows/PyCharm
 try:
@@ -14,6 +21,9 @@ except Exception:  # pragma: no cover
 
 _LOG_DATE_FMT = "%Y-%m-%d %H:%M:%S"
 _LOG_FILE_NAME = "run_log.log"
+# `%(prefix)s` is set per logger by _PrefixFilter; msecs make per-worker files mergeable by time
+_LOG_FMT = "%(asctime)s.%(msecs)03d %(prefix)s %(levelname)s: %(message)s"
+_TS_LEN = len("2024-01-01 00:00:00.000")
 
 
 class _ColorFormatter(logging.Formatter):
@@ -29,10 +39,24 @@ class _ColorFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         msg = super().format(record)
-        color = self._COLORS.get(record.levelno, "")
+        color = self._COLORS.get(record.levelno, "") if getattr(record, "use_colors", True) else ""
         return f"{color}{msg}{self._RESET}" if color else msg
 
 
+class _PrefixFilter(logging.Filter):
+    """Stamps records with the logger's prefix: all loggers share one set of handlers."""
+
+    def __init__(self, prefix: str, use_colors: bool) -> None:
+        super().__init__()
+        self.prefix = prefix
+        self.use_colors = use_colors
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.prefix = self.prefix
+        record.use_colors = self.use_colors
+        return True
+
+
 def _project_root(start: Optional[Path] = None) -> Path:
     """Best effort to find repo root; fall back to CWD."""
     p = (start or Path(__file__)).resolve()
@@ -42,20 +66,91 @@ def _project_root(start: Optional[Path] = None) -> Path:
     return Path.cwd()
 
 
-def _build_plain_formatter(prefix: str) -> logging.Formatter:
-    fmt = f"%(asctime)s {prefix} %(levelname)s: %(message)s"
-    return logging.Formatter(fmt=fmt, datefmt=_LOG_DATE_FMT)
+def worker_name() -> str:
+    """xdist worker id ('gw0', ...) or 'main' for the controller / a run without xdist."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
 
 
-def _build_color_formatter(prefix: str) -> logging.Formatter:
-    fmt = f"%(asctime)s {prefix} %(levelname)s: %(message)s"
-    return _ColorFormatter(fmt=fmt, datefmt=_LOG_DATE_FMT)
+def log_dir() -> Path:
+    return _project_root() / "target" / "logs"
+
+
+class _Pipeline:
+    """
+    One QueueHandler per process: loggers only enqueue records, a QueueListener thread does the
+    console and file I/O. Each process (xdist worker) writes its own `target/logs/run_log.<worker>.log`.
+    The listener marks every handled record `task_done`, so `flush()` is a plain `queue.join()`.
+    """
+    records: "Optional[queue.Queue[logging.LogRecord]]" = None
+    handler: Optional[logging.handlers.QueueHandler] = None
+    listener: Optional[logging.handlers.QueueListener] = None
+    running = False
+    lock = threading.Lock()
+
+    @classmethod
+    def queue_handler(cls) -> logging.handlers.QueueHandler:
+        with cls.lock:
+            if cls.handler is None:
+                log_path = log_dir() / f"run_log.{worker_name()}.log"
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                fh = logging.FileHandler(log_path, mode="w", encoding="utf-8")
+                fh.setFormatter(logging.Formatter(fmt=_LOG_FMT, datefmt=_LOG_DATE_FMT))
+                ch = logging.StreamHandler(stream=sys.stdout)
+                ch.setFormatter(_ColorFormatter(fmt=_LOG_FMT, datefmt=_LOG_DATE_FMT))
+                cls.records = queue.Queue()
+                cls.handler = logging.handlers.QueueHandler(cls.records)
+                cls.listener = logging.handlers.QueueListener(cls.records, fh, ch, respect_handler_level=True)
+                cls.listener.start()
+                cls.running = True
+                atexit.register(cls.stop)
+            return cls.handler
+
+    @classmethod
+    def flush(cls) -> None:
+        """Wait until every record queued so far is written."""
+        with cls.lock:
+            if cls.running and cls.records is not None:
+                cls.records.join()
+
+    @classmethod
+    def stop(cls) -> None:
+        with cls.lock:
+            if cls.running and cls.listener is not None:
+                cls.running = False
+                cls.listener.stop()
+
+
+def _records(path: Path) -> Iterator[Tuple[str, str]]:
+    """(timestamp, text) per record; lines without a timestamp (tracebacks) belong to the previous record."""
+    ts, block = "", ""
+    with path.open(encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            if len(line) > _TS_LEN and line[4] == "-" and line[10] == " " and line[19] == ".":
+                if block:
+                    yield ts, block
+                ts, block = line[:_TS_LEN], line
+            else:
+                block += line
+    if block:
+        yield ts, block
+
+
+def merge_worker_logs(since: float, target: Optional[Path] = None) -> Path:
+    """Merge the per-process logs written since `since` (epoch) into one time-ordered `target/logs/run_log.log`."""
+    _Pipeline.flush()
+    target = target or log_dir() / _LOG_FILE_NAME
+    files = sorted(p for p in log_dir().glob("run_log.*.log") if p.stat().st_mtime >= since - 1)
+    with target.open("w", encoding="utf-8") as out:
+        for _, block in heapq.merge(*(_records(p) for p in files), key=lambda r: r[0]):
+            out.write(block)
+    return target
 
 
 class Logger:
     """
     Centralized logger factory:
-      - console (colored) + file 'run_log.log'
+      - console (colored) + per-process file, written by one background listener per process
+        (see _Pipeline); `merge_worker_logs` builds 'target/logs/run_log.log' after the run
       - idempotent (won't add handlers twice)
       - minimal public API (info/warn/error helpers)
     """
@@ -74,26 +169,19 @@ class Logger:
         if use_colors and _colorama_init:
             _colorama_init(autoreset=True)
 
-        log_path = Path(__file__).resolve().parents[1] / _LOG_FILE_NAME
-
-        # File handler (plain)
-        fh = logging.FileHandler(log_path, encoding="utf-8")
-        fh.setFormatter(_build_plain_formatter(prefix))
-
-        # Console handler (colored or plain)
-        # ch = logging.StreamHandler()
-        import sys
-        ch = logging.StreamHandler(stream=sys.stdout)
-        ch.setFormatter(_build_color_formatter(prefix) if use_colors else _build_plain_formatter(prefix))
-
         logger.setLevel(log_level)
-        logger.addHandler(fh)
-        logger.addHandler(ch)
+        logger.addFilter(_PrefixFilter(prefix, use_colors))
+        logger.addHandler(_Pipeline.queue_handler())
         logger.propagate = False
         logging.captureWarnings(True)
 
         return logger
 
+    @staticmethod
+    def flush() -> None:
+        """Block until queued records of this process are written."""
+        _Pipeline.flush()
+
     @staticmethod
     def info(logger: logging.Logger, message: str) -> None:
         logger.info(message)
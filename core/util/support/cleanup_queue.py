@@ -0,0 +1,95 @@
+"""Concurrent, best-effort DemoQA account cleanup drained at session end within a time budget."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from core.util.logging import Logger
+from core.util.support.demoqa_raw_api import DemoQaRawApi
+from core.util.support.user_ledger import UserLedger
+
+UserDict = Dict[str, Any]
+
+
+@dataclass
+class CleanupReport:
+    submitted: int = 0
+    done: int = 0
+    failed: int = 0
+    unfinished: int = 0
+    elapsed_s: float = 0.0
+
+    def summary_line(self) -> str:
+        return (f"cleanup submitted={self.submitted} done={self.done} failed={self.failed} "
+                f"unfinished={self.unfinished} in {self.elapsed_s:.1f}s")
+
+
+class CleanupQueue:
+    """
+    Deletions run on a thread pool as soon as they are submitted, so teardowns only enqueue work.
+    `drain()` waits for the rest up to a time budget; failures are logged, not swallowed, and
+    accounts that could not be deleted stay in the UserLedger for the next orphan sweep.
+    """
+    log = Logger.get_logger("CleanupQueue", prefix="CLEAN")
+
+    def __init__(self, api: DemoQaRawApi, *, workers: int = 4) -> None:
+        self.api = api
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="demoqa-cleanup")
+        self._futures: List[Future] = []
+
+    def delete_user(self, user: UserDict) -> None:
+        """Enqueue deletion of the user's books and account."""
+        self._futures.append(self._pool.submit(self._delete_user, dict(user)))
+
+    def sweep_orphans(self, ledger: UserLedger, *, prefix: str = "auto_user", min_age_s: float = 3600.0) -> int:
+        """Enqueue deletion of accounts previous runs created and never removed."""
+        orphans = ledger.orphans(prefix=prefix, min_age_s=min_age_s)
+        for entry in orphans:
+            self.delete_user({"username": entry["userName"], "password": entry["password"],
+                              "userId": entry["userId"]})
+        self.log.info(f"Orphan sweep: {len(orphans)} '{prefix}*' accounts queued for deletion")
+        return len(orphans)
+
+    def drain(self, budget_s: float = 60.0) -> CleanupReport:
+        started = time.monotonic()
+        done, not_done = wait(self._futures, timeout=budget_s)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        report = CleanupReport(submitted=len(self._futures), unfinished=len(not_done))
+        for f in done:
+            if f.exception() is None:
+                report.done += 1
+            else:
+                report.failed += 1
+                self.log.warning(f"Cleanup failed: {f.exception()}")
+        report.elapsed_s = time.monotonic() - started
+        self._futures = []
+        if report.submitted:
+            self.log.info(report.summary_line())
+        return report
+
+    def _delete_user(self, user: UserDict) -> None:
+        if not user.get("token"):
+            logged_in = self.api.login(user)
+            if logged_in is False:
+                self._forget(user)
+                return
+            if logged_in is None:
+                raise RuntimeError(f"Could not login '{user.get('username')}' for cleanup")
+        self.api.clear_books(user)
+        if self.api.delete_user(user):
+            return
+        # stale token or already deleted: re-login tells which
+        logged_in = self.api.login(user)
+        if logged_in is False:
+            self._forget(user)
+            return
+        if not (logged_in and self.api.delete_user(user)):
+            raise RuntimeError(f"Could not delete user '{user.get('username')}' ({user.get('userId')})")
+
+    def _forget(self, user: UserDict) -> None:
+        """Account no longer exists (deleted elsewhere): drop it from the ledger."""
+        if user.get("userId"):
+            self.api.ledger.record_deleted(user["userId"])
@@ -1,22 +1,22 @@
 # tests/support/demoqa_flows_old.py
 from __future__ import annotations
 
-import contextlib
 import os
 from typing import Any, Dict, Tuple
 
-import allure
 
 from core.api.services.account_service import AccountService
 from core.api.services.book_store_service import BookStoreService
 from core.providers.data_generator import generate_user_request
-from core.util.html_report.decorators import html_step
+from core.util.html_report.decorators import step
+from core.util.logging import Logger
 
 UserDict = Dict[str, Any]
 
+log = Logger.get_logger("DemoqaFlows", prefix="FLOW")
 
-@html_step("DemoQA: Create user via /Account/v1/User")
-@allure.step("DemoQA: Create user via /Account/v1/User")
+
+@step("DemoQA: Create user via /Account/v1/User")
 def create_demo_user(account_service: AccountService) -> UserDict:
     """Create a new DemoQA user with random valid credentials."""
     body = generate_user_request()
@@ -30,8 +30,7 @@ def create_demo_user(account_service: AccountService) -> UserDict:
     }
 
 
-@html_step("DemoQA: Login user via /Account/v1/Login")
-@allure.step("DemoQA: Login user via /Account/v1/Login")
+@step("DemoQA: Login user via /Account/v1/Login")
 def login_demo_user(account_service: AccountService, user: UserDict) -> UserDict:
     """Login DemoQA user and attach token/expires."""
     login_body = {
@@ -52,16 +51,14 @@ def login_demo_user(account_service: AccountService, user: UserDict) -> UserDict
     return user
 
 
-@html_step("DemoQA: Create and login temporary user")
-@allure.step("DemoQA: Create and login temporary user")
+@step("DemoQA: Create and login temporary user")
 def create_and_login_temp_user(account_service: AccountService) -> UserDict:
     """Create a random user and login it in one step."""
     user = create_demo_user(account_service)
     return login_demo_user(account_service, user)
 
 
-@html_step("DemoQA: Ensure test user from env or create temporary")
-@allure.step("DemoQA: Ensure test user from env or create temporary")
+@step("DemoQA: Ensure test user from env or create temporary")
 def ensure_test_user(account_service: AccountService) -> Tuple[UserDict, bool]:
     """
     Try to login DEMOQA_USER/DEMOQA_PASS from env, otherwise create a temporary user.
@@ -79,22 +76,28 @@ def ensure_test_user(account_service: AccountService) -> Tuple[UserDict, bool]:
     return user, True
 
 
-@html_step("DemoQA: Cleanup user (books + account)")
-@allure.step("DemoQA: Cleanup user (books + account)")
+@step("DemoQA: Cleanup user (books + account)")
 def cleanup_demo_user(
         account_service: AccountService,
         book_store_service: BookStoreService,
         user: UserDict,
 ) -> None:
-    """Delete all books and then delete the user."""
+    """
+    Delete all books and then delete the user (synchronously, on the calling thread).
+    Fixtures should prefer CleanupQueue.delete_user(), which takes this off the test's critical path.
+    """
     user_id = user.get("userId")
     token = user.get("token")
 
     if not user_id or not token:
         return
 
-    with contextlib.suppress(Exception):
+    try:
         book_store_service.delete_user_books(user_id, token=token)
+    except Exception as e:
+        log.warning(f"Cleanup: could not delete books of user {user_id}: {e}")
 
-    with contextlib.suppress(Exception):
+    try:
         account_service.delete_user(user_id, token=token)
+    except Exception as e:
+        log.warning(f"Cleanup: could not delete user {user_id}: {e}")
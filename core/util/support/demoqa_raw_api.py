@@ -0,0 +1,73 @@
+"""Step-free DemoQA calls for helper threads (user pool, cleanup queue)."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+
+from core.api.models.user import UserRequest
+from core.http.http_client import HttpClient
+from core.util.support.user_ledger import UserLedger
+
+UserDict = Dict[str, Any]
+
+
+class DemoQaRawApi:
+    """
+    Minimal DemoQA client without Allure/html steps: steps emitted from a helper thread would be
+    attributed to whatever test is running on the main thread. Each thread gets its own Session;
+    connection pools and retries are shared with the base HttpClient. Account creation/deletion
+    is recorded in the UserLedger.
+    """
+
+    def __init__(self, http: Optional[HttpClient] = None, ledger: Optional[UserLedger] = None) -> None:
+        self.http = http or HttpClient(is_auth=False)
+        self.ledger = ledger or UserLedger()
+        self._local = threading.local()
+
+    def create_user(self, body: UserRequest) -> Optional[UserDict]:
+        r = self._call("POST", "/Account/v1/User", json=body.to_dict())
+        if r is None or r.status_code != 201:
+            return None
+        return {"username": body.userName, "password": body.password, "userId": r.json()["userID"]}
+
+    def login(self, user: UserDict) -> Optional[bool]:
+        """True: token stored in `user`; False: credentials rejected (account gone); None: transport/server error."""
+        r = self._call("POST", "/Account/v1/Login", json={"userName": user["username"], "password": user["password"]})
+        if r is None or r.status_code >= 500:
+            return None
+        body = (r.json() or {}) if r.status_code == 200 else {}
+        if not body.get("token"):
+            return False
+        user["token"], user["expires"] = body["token"], body.get("expires")
+        user["userId"] = body.get("userId") or user.get("userId")
+        return True
+
+    def clear_books(self, user: UserDict) -> bool:
+        r = self._call("DELETE", "/BookStore/v1/Books", params={"UserId": user["userId"]}, token=user.get("token"))
+        return r is not None and r.status_code in (200, 204)
+
+    def delete_user(self, user: UserDict) -> bool:
+        r = self._call("DELETE", f"/Account/v1/User/{user['userId']}", token=user.get("token"))
+        return r is not None and r.status_code == 204
+
+    def _call(self, method: str, path: str, *, token: Optional[str] = None, **kwargs: Any) -> Any:
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        with contextlib.suppress(Exception):
+            return self._session().request(method, f"{self.http.base}{path}", headers=headers,
+                                           timeout=self.http.timeout, **kwargs)
+        return None
+
+    def _session(self) -> requests.Session:
+        s: Optional[requests.Session] = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            s.headers.update(self.http.s.headers)
+            for prefix, adapter in self.http.s.adapters.items():
+                s.mount(prefix, adapter)
+            self.ledger.install(s)
+            self._local.session = s
+        return s
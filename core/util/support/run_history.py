@@ -0,0 +1,284 @@
+"""
+Local SQLite history of test runs with performance regression detection.
+
+Every run records test durations (setup / call / teardown), per-endpoint HTTP latency summaries,
+page metrics of UI runs with `--page-perf` and the environment into `target/run_history.sqlite`.
+A metric is flagged as a regression when it is an outlier against a rolling baseline of the previous
+runs on the same environment: robust z-score (median / MAD) above `z_threshold`, and slower by both `min_ratio` and `min_delta_ms`.
+
+CLI:
+    python -m core.util.support.run_history runs [--limit 20]
+    python -m core.util.support.run_history regressions [--run ID] [--baseline 10]
+    python -m core.util.support.run_history test <nodeid substring> [--limit 20]
+    python -m core.util.support.run_history endpoint <endpoint substring> [--limit 20]
+    python -m core.util.support.run_history page <page / action / metric substring> [--limit 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sqlite3
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.config.config import ConfigLoader
+from core.util.logging import Logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    finished REAL NOT NULL,
+    env TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    setup_ms REAL NOT NULL,
+    call_ms REAL NOT NULL,
+    teardown_ms REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS http (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    p50_ms REAL NOT NULL,
+    p95_ms REAL NOT NULL,
+    mean_ms REAL NOT NULL,
+    max_ms REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    p50 REAL NOT NULL,
+    max REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tests_nodeid ON tests(nodeid, run_id);
+CREATE INDEX IF NOT EXISTS http_endpoint ON http(endpoint, run_id);
+CREATE INDEX IF NOT EXISTS pages_name ON pages(name, run_id);
+"""
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _git_revision() -> str:
+    with contextlib.suppress(Exception):
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ConfigLoader.PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip()
+    return ""
+
+
+@dataclass
+class PhaseTimings:
+    nodeid: str
+    outcome: str = "passed"
+    setup_ms: float = 0.0
+    call_ms: float = 0.0
+    teardown_ms: float = 0.0
+
+
+@dataclass
+class Regression:
+    kind: str  # "test" | "endpoint"
+    name: str
+    metric: str
+    current: float
+    baseline: float
+    z: float
+    runs: int
+
+    def line(self) -> str:
+        return (f"{self.kind:<8} {self.name} {self.metric}: {self.current:.0f}ms vs baseline {self.baseline:.0f}ms "
+                f"(+{(self.current / self.baseline - 1) * 100 if self.baseline else 0:.0f}%, z={self.z:.1f}, "
+                f"n={self.runs})")
+
+
+@dataclass
+class RunRecorder:
+    """Accumulates one run; registered as a plugin on the controller, so xdist workers' reports are included."""
+    started: float = field(default_factory=time.time)
+    tests: Dict[str, PhaseTimings] = field(default_factory=dict)
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    # "LoginPage open /login dom_content_loaded_ms" -> values (UI --page-perf)
+    pages: Dict[str, List[float]] = field(default_factory=dict)
+
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        timing = self.tests.setdefault(report.nodeid, PhaseTimings(report.nodeid))
+        setattr(timing, f"{report.when}_ms", round(report.duration * 1000, 1))
+        if report.failed:
+            timing.outcome = "error" if report.when != "call" else "failed"
+        elif report.skipped and timing.outcome == "passed":
+            timing.outcome = "skipped"
+        for endpoint, samples in (getattr(report, "http_latency", None) or {}).items():
+            self.latencies.setdefault(endpoint, []).extend(samples)
+        for measurement in getattr(report, "page_metrics", None) or []:
+            for metric, value in measurement["metrics"].items():
+                name = f"{measurement['page']} {measurement['action']} {metric}"
+                self.pages.setdefault(name, []).append(value)
+
+
+class RunHistory:
+    log = Logger.get_logger("RunHistory", prefix="HIST")
+
+    DEFAULT_PATH: Path = ConfigLoader.PROJECT_ROOT / "target" / "run_history.sqlite"
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or self.DEFAULT_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA foreign_keys = ON")
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # ---------- write ----------
+    def record(self, run: RunRecorder, *, env: str, meta: Dict[str, Any]) -> int:
+        outcomes = [t.outcome for t in run.tests.values()]
+        meta = {"git": _git_revision(), **meta}
+        with self._connect() as db:
+            cur = db.execute(
+                "INSERT INTO runs (started, finished, env, meta, passed, failed, skipped) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run.started, time.time(), env, json.dumps(meta, ensure_ascii=False), outcomes.count("passed"),
+                 outcomes.count("failed") + outcomes.count("error"), outcomes.count("skipped")))
+            run_id = int(cur.lastrowid or 0)
+            db.executemany("INSERT INTO tests VALUES (?, ?, ?, ?, ?, ?)",
+                           [(run_id, t.nodeid, t.outcome, t.setup_ms, t.call_ms, t.teardown_ms)
+                            for t in run.tests.values()])
+            db.executemany("INSERT INTO http VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           [(run_id, ep, len(s), _percentile(s, 0.5), _percentile(s, 0.95),
+                             round(statistics.fmean(s), 1), max(s)) for ep, s in run.latencies.items() if s])
+            db.executemany("INSERT INTO pages VALUES (?, ?, ?, ?, ?)",
+                           [(run_id, name, len(v), _percentile(v, 0.5), max(v)) for name, v in run.pages.items() if v])
+        self.log.info(f"Run #{run_id} recorded: {len(run.tests)} tests, {len(run.latencies)} endpoints -> {self.path}")
+        return run_id
+
+    # ---------- read ----------
+    def runs(self, limit: int = 20) -> List[Tuple[Any, ...]]:
+        with self._connect() as db:
+            return db.execute("SELECT id, started, finished, env, meta, passed, failed, skipped FROM runs "
+                              "ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+
+    def last_run_id(self) -> Optional[int]:
+        with self._connect() as db:
+            row = db.execute("SELECT MAX(id) FROM runs").fetchone()
+        return int(row[0]) if row and row[0] is not None else None
+
+    def history(self, table: str, name: str, limit: int = 20) -> List[Tuple[Any, ...]]:
+        key, metrics = {"tests": ("nodeid", "outcome, setup_ms, call_ms, teardown_ms"),
+                        "http": ("endpoint", "count, p50_ms, p95_ms, max_ms"),
+                        "pages": ("name", "count, p50, max")}[table]
+        with self._connect() as db:
+            return db.execute(f"SELECT r.id, r.started, t.{key}, {metrics} FROM {table} t JOIN runs r ON r.id = t.run_id "
+                              f"WHERE t.{key} LIKE ? ORDER BY r.id DESC LIMIT ?", (f"%{name}%", limit)).fetchall()
+
+    # ---------- regressions ----------
+    def regressions(self, run_id: Optional[int] = None, *, baseline_runs: int = 10, min_runs: int = 5,
+                    z_threshold: float = 3.5, min_ratio: float = 1.2, min_delta_ms: float = 50.0) -> List[Regression]:
+        run_id = run_id or self.last_run_id()
+        if run_id is None:
+            return []
+        checks = [("test", "tests", "nodeid", "call_ms", "AND t.outcome = 'passed'"),
+                  ("endpoint", "http", "endpoint", "p50_ms", ""),
+                  ("endpoint", "http", "endpoint", "p95_ms", ""),
+                  ("page", "pages", "name", "p50", "AND t.name LIKE '%\\_ms' ESCAPE '\\'")]
+        found: List[Regression] = []
+        with self._connect() as db:
+            env_row = db.execute("SELECT env FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if env_row is None:
+                return []
+            baseline_ids = [r[0] for r in db.execute(
+                "SELECT id FROM runs WHERE env = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (env_row[0], run_id, baseline_runs))]
+            if len(baseline_ids) < min_runs:
+                return []
+            marks = ",".join("?" * len(baseline_ids))
+            for kind, table, key, metric, cond in checks:
+                current = dict(db.execute(f"SELECT t.{key}, t.{metric} FROM {table} t WHERE t.run_id = ? {cond}",
+                                          (run_id,)).fetchall())
+                past: Dict[str, List[float]] = {}
+                for name, value in db.execute(f"SELECT t.{key}, t.{metric} FROM {table} t "
+                                              f"WHERE t.run_id IN ({marks}) {cond}", baseline_ids):
+                    past.setdefault(name, []).append(value)
+                for name, value in current.items():
+                    values = past.get(name, [])
+                    if len(values) < min_runs:
+                        continue
+                    median = statistics.median(values)
+                    mad = statistics.median(abs(v - median) for v in values) * 1.4826
+                    # floor the spread so a perfectly flat history does not flag noise-level changes
+                    z = (value - median) / max(mad, median * 0.05, 1.0)
+                    if z >= z_threshold and value >= median * min_ratio and value - median >= min_delta_ms:
+                        found.append(Regression(kind, name, metric, value, median, z, len(values)))
+        return sorted(found, key=lambda r: r.z, reverse=True)
+
+
+# ---------- CLI ----------
+def _ts(epoch: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(epoch))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.util.support.run_history",
+                                     description="Query the local run history / performance regressions.")
+    parser.add_argument("--db", type=Path, default=None, help=f"SQLite file (default {RunHistory.DEFAULT_PATH})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_runs = sub.add_parser("runs", help="list recorded runs")
+    p_runs.add_argument("--limit", type=int, default=20)
+    p_reg = sub.add_parser("regressions", help="regressions of a run against its rolling baseline")
+    p_reg.add_argument("--run", type=int, default=None, help="run id (default: last run)")
+    p_reg.add_argument("--baseline", type=int, default=10, help="number of previous runs in the baseline")
+    for name in ("test", "endpoint", "page"):
+        p = sub.add_parser(name, help=f"history of {name}s matching a substring")
+        p.add_argument("name")
+        p.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.db)
+    if args.cmd == "runs":
+        for run_id, started, finished, env, meta, passed, failed, skipped in history.runs(args.limit):
+            info = json.loads(meta)
+            print(f"#{run_id:<5} {_ts(started)} {finished - started:7.1f}s env={env:<6} git={info.get('git', ''):<8} "
+                  f"passed={passed} failed={failed} skipped={skipped}")
+    elif args.cmd == "regressions":
+        found = history.regressions(args.run, baseline_runs=args.baseline)
+        for regression in found:
+            print(regression.line())
+        if not found:
+            print("No significant regressions (or not enough baseline runs).")
+        return 1 if found else 0
+    else:
+        table = {"test": "tests", "endpoint": "http", "page": "pages"}[args.cmd]
+        for row in history.history(table, args.name, args.limit):
+            run_id, started, name, *metrics = row
+            print(f"#{run_id:<5} {_ts(started)} {name} " + " ".join(str(m) for m in metrics))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
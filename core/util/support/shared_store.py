@@ -0,0 +1,166 @@
+"""Cross-process (xdist) shared state: lock file + JSON document under the run's shared temp dir."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from core.util.logging import Logger
+
+log = Logger.get_logger("SharedStore", prefix="STORE")
+
+
+def is_xdist_worker(config: Any) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def shared_tmp_dir(config: Any) -> Path:
+    """
+    Directory visible to the controller and all xdist workers of the current run.
+    Workers get `<basetemp>/popen-gwN`, so their parent is the controller's basetemp.
+    """
+    base = Path(config._tmp_path_factory.getbasetemp())
+    return base.parent if is_xdist_worker(config) else base
+
+
+def _pid_alive(pid: str) -> bool:
+    """Lock owners are processes of this machine (xdist workers); an unreadable owner counts as dead."""
+    if not pid.isdigit() or os.name == "nt":  # os.kill(pid, 0) would terminate the process on Windows
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class FileLock:
+    """Portable inter-process lock based on O_EXCL lock-file creation (also serializes threads of one process)."""
+
+    def __init__(self, path: Path, *, timeout: float = 30.0, poll: float = 0.01, stale_after: float = 120.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.poll = poll
+        # set it above the longest time the lock is held: an older lock of a live process is never broken anyway
+        self.stale_after = stale_after
+        self._fd: int | None = None
+        self._owner = ""
+        self._thread_lock = threading.Lock()
+
+    def acquire(self) -> None:
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Could not acquire lock {self.path} in {self.timeout}s")
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                self._owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+                os.write(self._fd, self._owner.encode())
+                return
+            except FileExistsError:
+                self._break_if_stale()
+                if time.monotonic() > deadline:
+                    self._thread_lock.release()
+                    raise TimeoutError(f"Could not acquire lock {self.path} in {self.timeout}s")
+                time.sleep(self.poll)
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            # only our own lock file: if it was broken as stale, it now belongs to someone else
+            if self._read_owner() == self._owner:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(self.path)
+            self._thread_lock.release()
+
+    def _read_owner(self) -> str:
+        try:
+            return self.path.read_text(encoding="utf-8")
+        except (FileNotFoundError, UnicodeDecodeError):
+            return ""
+
+    def _break_if_stale(self) -> None:
+        # a crashed holder never removes its lock file; a live holder keeps it however long it takes
+        with contextlib.suppress(FileNotFoundError):
+            if time.time() - self.path.stat().st_mtime <= self.stale_after:
+                return
+            owner = self._read_owner()
+            if _pid_alive(owner.split(":", 1)[0]):
+                return
+            if self._read_owner() == owner:
+                log.warning(f"Removing stale lock {self.path} (owner {owner or 'unknown'})")
+                os.unlink(self.path)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.release()
+
+
+class SharedJsonStore:
+    """JSON document updated read-modify-write under a FileLock; writes are atomic (tmp + replace)."""
+
+    def __init__(self, path: Path, *, lock_timeout: float = 30.0, stale_after: float = 120.0) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = FileLock(path.with_name(path.name + ".lock"), timeout=lock_timeout, stale_after=stale_after)
+
+    def read(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @contextlib.contextmanager
+    def update(self) -> Iterator[Dict[str, Any]]:
+        with self.lock:
+            data = self.read()
+            yield data
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+
+class SharedResource:
+    """
+    JSON-serializable value computed once per run by the first process that asks for it.
+    Other workers block on the store lock while it is being built, then reuse it. The value stays
+    in the store until `take()` at the end of the run (controller `pytest_sessionfinish`), so a worker
+    that finishes or crashes early never makes a later one rebuild it.
+    """
+
+    def __init__(self, store: SharedJsonStore) -> None:
+        self.store = store
+
+    def acquire(self, factory: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        with self.store.update() as data:
+            if data.get("value") is None:
+                data["value"] = factory()
+                log.info(f"Shared resource created: {self.store.path.name}")
+            value: Dict[str, Any] = data["value"]
+        return value
+
+    def take(self) -> Optional[Dict[str, Any]]:
+        """Remove and return the value (None if it was never built); call once, after all workers are done."""
+        if not self.store.exists():
+            return None
+        with self.store.update() as data:
+            value: Optional[Dict[str, Any]] = data.pop("value", None)
+        if value is not None:
+            log.info(f"Shared resource taken for cleanup: {self.store.path.name}")
+        return value
@@ -0,0 +1,181 @@
+"""
+Timeline of a test run in Chrome Trace Event Format (`--trace-out=run.json`).
+
+Open the file in chrome://tracing or https://ui.perfetto.dev: one process track per xdist worker
+(`main` without xdist) with spans for test phases, fixture setup / teardown, `@step` steps,
+HTTP requests (endpoint, status, bytes), WebDriver commands and the report hooks.
+
+Every process records its own spans (`TraceRecorder`, registered as a plugin on the controller and
+on each worker) and writes them to `<shared tmp>/trace/trace.<worker>.json`; the controller merges
+the files once the workers are done. Timestamps are wall clock, so tracks of different workers line up.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator, Iterable, List, Optional
+
+import pytest
+from requests import Response, Session
+
+from core.http.hooks import install_response_hook
+from core.http.latency import endpoint_key
+from core.util.logging import Logger, worker_name
+
+log = Logger.get_logger("TraceTimeline", prefix="TRACE")
+
+TraceEvent = Dict[str, Any]
+
+
+def _us(epoch_s: float) -> int:
+    return int(epoch_s * 1_000_000)
+
+
+def _track(worker: str) -> int:
+    """Trace 'pid' of a worker: 0 for the controller / main process, N + 1 for gwN."""
+    return int(worker[2:]) + 1 if worker.startswith("gw") and worker[2:].isdigit() else 0
+
+
+class TraceRecorder:
+    """Collects the spans of one process; see the module docstring."""
+
+    def __init__(self, out_dir: Path, worker: Optional[str] = None) -> None:
+        self.out_dir = out_dir
+        self.worker = worker or worker_name()
+        self.pid = _track(self.worker)
+        self.events: List[TraceEvent] = []
+        self._lock = threading.Lock()
+        self._teardown_started: Dict[int, float] = {}
+        self._threads: Dict[int, int] = {}
+
+    # ---------- spans ----------
+    def span(self, name: str, cat: str, start: float, duration: float, **args: Any) -> None:
+        """Complete ('X') event; `start` is epoch seconds, `duration` seconds."""
+        event: TraceEvent = {"name": name, "cat": cat, "ph": "X", "ts": _us(start),
+                             "dur": max(1, int(duration * 1_000_000)), "pid": self.pid}
+        if args:
+            event["args"] = {k: v for k, v in args.items() if v is not None}
+        with self._lock:
+            # small stable thread ids: the test thread is 1, background threads follow
+            event["tid"] = self._threads.setdefault(threading.get_ident(), len(self._threads) + 1)
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def timed(self, name: str, cat: str, **args: Any) -> Generator[Dict[str, Any], None, None]:
+        """Span around a block; the yielded dict can add args (e.g. a status known only at the end)."""
+        start, started = time.time(), time.perf_counter()
+        extra: Dict[str, Any] = {}
+        try:
+            yield extra
+        finally:
+            self.span(name, cat, start, time.perf_counter() - started, **args, **extra)
+
+    # ---------- pytest hooks ----------
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef: Any, request: Any) -> Generator[None, Any, None]:
+        with self.timed(f"setup {fixturedef.argname}", "fixture", scope=fixturedef.scope):
+            yield
+        # finalizers run LIFO: this one runs right after the fixture's own teardown code is due to start
+        key = id(fixturedef)
+        fixturedef.addfinalizer(lambda: self._teardown_started.__setitem__(key, time.time()))
+
+    def pytest_fixture_post_finalizer(self, fixturedef: Any, request: Any) -> None:
+        started = self._teardown_started.pop(id(fixturedef), None)
+        if started is not None:
+            self.span(f"teardown {fixturedef.argname}", "fixture", started, time.time() - started,
+                      scope=fixturedef.scope)
+
+    @pytest.hookimpl(tryfirst=True, hookwrapper=True)
+    def pytest_runtest_makereport(self, item: Any, call: Any) -> Generator[None, Any, None]:
+        with self.timed("makereport", "report", when=call.when):
+            outcome = yield
+        report = outcome.get_result()
+        self.span(f"{call.when} {item.name}", "test", report.start or call.start,
+                  (report.stop or call.stop) - (report.start or call.start), nodeid=item.nodeid,
+                  outcome=report.outcome)
+        if call.when == "teardown":
+            self._steps(getattr(item, "html_steps", None) or [])
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_logreport(self, report: Any) -> Generator[None, Any, None]:
+        with self.timed("logreport", "report", when=report.when):
+            yield
+
+    def _steps(self, steps: Iterable[Any]) -> None:
+        for record in steps:
+            start, duration = getattr(record, "start", None), getattr(record, "duration", None)
+            if start is None or duration is None:  # legacy html_step: title only
+                continue
+            self.span(record.title, "step", start, duration, outcome=record.outcome, **(record.meta or {}))
+            self._steps(record.children or [])
+
+    # ---------- HTTP ----------
+    def _record_http(self, resp: Response, *args: Any, **kwargs: Any) -> None:
+        """Requests 'response' hook: request sent -> response headers parsed."""
+        elapsed = getattr(resp, "elapsed", None)
+        if elapsed is None or resp.request is None:
+            return
+        seconds = elapsed.total_seconds()
+        length = resp.headers.get("Content-Length")
+        self.span(endpoint_key(resp.request.method or "GET", resp.request.url or ""), "http",
+                  time.time() - seconds, seconds, status=resp.status_code,
+                  bytes=int(length) if length and length.isdigit() else None)
+
+    def install(self, session: Session) -> None:
+        """Register the response hook on a given Session (idempotent)."""
+        install_response_hook(session, self._record_http)
+
+    # ---------- WebDriver ----------
+    def instrument(self, driver: Any) -> None:
+        """Span per WebDriver command: wraps `execute` of the driver's command executor."""
+        executor = driver.command_executor
+        if getattr(executor, "_trace_recorder", None) is self:
+            return
+        execute = executor.execute
+
+        def traced(command: str, params: Any = None) -> Any:
+            with self.timed(command, "webdriver") as extra:
+                try:
+                    return execute(command, params)
+                except Exception as e:
+                    extra["error"] = type(e).__name__
+                    raise
+
+        executor.execute = traced
+        executor._trace_recorder = self
+
+    # ---------- output ----------
+    def write(self) -> Path:
+        """Spans of this process -> `out_dir/trace.<worker>.json`."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / f"trace.{self.worker}.json"
+        meta: List[TraceEvent] = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": self.worker}},
+            {"name": "process_sort_index", "ph": "M", "pid": self.pid, "args": {"sort_index": self.pid}},
+        ]
+        with self._lock:
+            events = meta + self.events
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(events, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+def merge_traces(parts_dir: Path, target: Path) -> int:
+    """Merge the per-process files into one Trace Event Format document; returns the number of events."""
+    events: List[TraceEvent] = []
+    for part in sorted(parts_dir.glob("trace.*.json")):
+        try:
+            events.extend(json.loads(part.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            log.warning(f"Trace part {part} skipped: {e}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, separators=(",", ":")),
+                      encoding="utf-8")
+    log.info(f"Trace timeline: {len(events)} events -> {target}")
+    return len(events)
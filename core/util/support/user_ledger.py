@@ -0,0 +1,115 @@
+"""Local ledger of DemoQA accounts created by test runs (DemoQA has no 'list users' API to find orphans)."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from requests import Response, Session
+
+from core.config.config import ConfigLoader
+from core.http.hooks import install_response_hook
+from core.util.logging import Logger
+from core.util.support.shared_store import FileLock
+
+_USER_PATH = re.compile(r"/Account/v1/User(?:/(?P<uid>[^/?]+))?$")
+
+
+class UserLedger:
+    """
+    Append-only JSONL file of created / deleted accounts, shared by threads, xdist workers and runs.
+
+    Entries are written by a requests response hook (see `install`), so every account created
+    through an instrumented Session is recorded no matter which test or helper created it.
+    Credentials are kept so a later run can log in and delete accounts a crashed run left behind;
+    the file lives under `target/` next to other local run artifacts and is compacted at the end of
+    every session, so only accounts that still exist keep their password on disk.
+    """
+    log = Logger.get_logger("UserLedger", prefix="LEDGER")
+
+    DEFAULT_PATH: Path = ConfigLoader.PROJECT_ROOT / "target" / "demoqa_users.jsonl"
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or self.DEFAULT_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+
+    # ---------- write ----------
+    def record_created(self, user_name: str, password: str, user_id: str) -> None:
+        self._append({"op": "created", "userName": user_name, "password": password, "userId": user_id,
+                      "ts": time.time()})
+
+    def record_deleted(self, user_id: str) -> None:
+        self._append({"op": "deleted", "userId": user_id, "ts": time.time()})
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self.lock:
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    # ---------- read ----------
+    def live(self) -> List[Dict[str, Any]]:
+        """Accounts recorded as created and not (yet) recorded as deleted."""
+        created: Dict[str, Dict[str, Any]] = {}
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("op") == "created":
+                created[entry["userId"]] = entry
+            elif entry.get("op") == "deleted":
+                created.pop(entry.get("userId"), None)
+        return list(created.values())
+
+    def orphans(self, *, prefix: str = "auto_user", min_age_s: float = 3600.0) -> List[Dict[str, Any]]:
+        """Live accounts with `prefix` older than `min_age_s` (younger ones may belong to a running session)."""
+        cutoff = time.time() - min_age_s
+        return [e for e in self.live() if e.get("userName", "").startswith(prefix) and e.get("ts", 0) <= cutoff]
+
+    def compact(self) -> int:
+        """Rewrite the file with live accounts only; returns the number of entries dropped."""
+        with self.lock:
+            try:
+                total = sum(1 for line in self.path.read_text(encoding="utf-8").splitlines() if line.strip())
+            except FileNotFoundError:
+                return 0
+            live = self.live()
+            if total == len(live):
+                return 0
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in live), encoding="utf-8")
+            os.replace(tmp, self.path)  # never leave a truncated ledger: it holds the only copy of the credentials
+        self.log.debug(f"Ledger compacted: {total - len(live)} entries dropped, {len(live)} live accounts")
+        return total - len(live)
+
+    # ---------- requests hook ----------
+    def _record_account(self, resp: Response, *args: Any, **kwargs: Any) -> None:
+        """Requests 'response' hook: record POST/DELETE /Account/v1/User results."""
+        try:
+            prep = resp.request
+            m = _USER_PATH.search(urlsplit(prep.url or "").path)
+            if not m:
+                return
+            if prep.method == "POST" and not m.group("uid") and resp.status_code == 201:
+                raw = prep.body if isinstance(prep.body, (str, bytes)) else "{}"
+                body = json.loads(raw or "{}")
+                self.record_created(body.get("userName", ""), body.get("password", ""), resp.json()["userID"])
+            elif prep.method == "DELETE" and m.group("uid") and resp.status_code in (200, 204) and not resp.content:
+                # DemoQA answers 200 + error message for a wrong id, 204 + empty body on success
+                self.record_deleted(m.group("uid"))
+        except Exception as e:
+            self.log.debug(f"UserLedger hook failed: {e}")
+
+    def install(self, session: Session) -> None:
+        """Register response hook on a given Session (idempotent)."""
+        install_response_hook(session, self._record_account)
@@ -0,0 +1,230 @@
+"""Pre-provisioned DemoQA users leased to tests and recycled (shelf cleared) instead of create/delete per test."""
+
+from __future__ import annotations
+
+import contextlib
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.providers.data_generator import build_user_requests
+from core.util.logging import Logger
+from core.util.support.cleanup_queue import CleanupQueue
+from core.util.support.demoqa_raw_api import DemoQaRawApi
+from core.util.support.shared_store import SharedJsonStore
+
+UserDict = Dict[str, Any]
+
+_STOP = object()
+
+
+@dataclass
+class PoolStats:
+    """Aggregated over all xdist workers of the run."""
+    size: int = 0
+    created: int = 0
+    leases: int = 0
+    hits: int = 0
+    misses: int = 0
+    recycled: int = 0
+    dropped: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.leases if self.leases else 0.0
+
+    def summary_lines(self) -> List[str]:
+        avg = self.wait_total_s / self.leases if self.leases else 0.0
+        return [
+            f"pool size={self.size} created={self.created} recycled={self.recycled} dropped={self.dropped}",
+            f"leases={self.leases} hits={self.hits} misses={self.misses} hit rate={self.hit_rate:.0%}",
+            f"lease wait avg={avg * 1000:.0f}ms max={self.wait_max_s * 1000:.0f}ms",
+        ]
+
+
+class UserPool:
+    """
+    Pool of logged-in DemoQA users shared by all xdist workers through a locked JSON store.
+
+    - `start()` pre-creates users on a background thread until the run-wide pool reaches `size`;
+    - `lease()` hands out a free user (hit) or, if none is ready, provisions one on demand (miss);
+    - `release()` queues the user for recycling: its books are deleted in one bulk call and
+      it goes back to the free list;
+    - `purge()` (controller, end of run) queues every pooled account for deletion.
+
+    Background work goes through DemoQaRawApi (no Allure/html steps from helper threads);
+    users that cannot be recycled are handed to the CleanupQueue.
+    """
+    log = Logger.get_logger("UserPool", prefix="POOL")
+
+    STORE_NAME = "demoqa_user_pool.json"
+
+    def __init__(self, store_dir: Path, *, size: int = 4, lease_timeout: float = 10.0,
+                 api: Optional[DemoQaRawApi] = None, cleanup: Optional[CleanupQueue] = None) -> None:
+        self.size = max(0, int(size))
+        self.lease_timeout = lease_timeout
+        self.store = SharedJsonStore(store_dir / self.STORE_NAME)
+        self.api = api or DemoQaRawApi()
+        self.cleanup = cleanup
+        self._tasks: "queue.Queue[Any]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    # ---------- lifecycle ----------
+    def start(self) -> "UserPool":
+        """Start the background provisioning/recycling thread (idempotent)."""
+        if self._worker is None:
+            with self._update():
+                pass
+            self._worker = threading.Thread(target=self._run, name="demoqa-user-pool", daemon=True)
+            self._worker.start()
+            self._tasks.put("fill")
+        return self
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Finish pending recycling and stop the background thread (per process)."""
+        if self._worker is None:
+            return
+        self._tasks.put(_STOP)
+        self._worker.join(timeout)
+        self._worker = None
+
+    def purge(self, cleanup: CleanupQueue) -> int:
+        """Queue deletion of every pooled account; called once per run by the controller."""
+        with self._update() as data:
+            users = list((data.get("all") or {}).values())
+            data["all"], data["free"], data["leased"] = {}, [], {}
+        for user in users:
+            cleanup.delete_user(user)
+        self.log.info(f"Queued {len(users)} pooled users for deletion")
+        return len(users)
+
+    # ---------- lease / release ----------
+    def lease(self) -> UserDict:
+        """Return a logged-in user with an empty book shelf."""
+        started = time.monotonic()
+        hit = True
+        user: UserDict
+        while True:
+            with self._update() as data:
+                if data["free"]:
+                    user = data["free"].pop(0)
+                    data["leased"][user["userId"]] = user
+                    break
+                hit = False
+                # wait only for users that are already being provisioned; otherwise create now
+                provision_now = data["pending"] == 0 or time.monotonic() - started > self.lease_timeout
+                if provision_now:
+                    data["pending"] += 1
+            if provision_now:
+                try:
+                    user = self._provision()
+                finally:
+                    with self._update() as data:
+                        data["pending"] -= 1
+                with self._update() as data:
+                    data["leased"][user["userId"]] = user
+                break
+            time.sleep(0.05)
+
+        waited = time.monotonic() - started
+        with self._update() as data:
+            stats = data["stats"]
+            stats["leases"] += 1
+            stats["hits" if hit else "misses"] += 1
+            stats["wait_total_s"] += waited
+            stats["wait_max_s"] = max(stats["wait_max_s"], waited)
+        self.log.info(f"Leased {user['username']} ({'hit' if hit else 'miss'}, {waited * 1000:.0f}ms)")
+        return user
+
+    def release(self, user: UserDict) -> None:
+        """Return a leased user; recycling happens off the test's critical path."""
+        with self._update() as data:
+            data.get("leased", {}).pop(user.get("userId"), None)
+        if self._worker is None:
+            self._recycle(user)
+        else:
+            self._tasks.put(user)
+
+    def stats(self) -> PoolStats:
+        data = self.store.read()
+        return PoolStats(size=self.size, **(data.get("stats") or {}))
+
+    # ---------- background ----------
+    def _run(self) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is _STOP:
+                return
+            try:
+                if task == "fill":
+                    self._fill()
+                else:
+                    self._recycle(task)
+            except Exception as e:
+                self.log.warning(f"Pool task failed: {e}")
+
+    def _fill(self) -> None:
+        while True:
+            with self._update() as data:
+                if len(data["all"]) + data["pending"] >= self.size:
+                    return
+                data["pending"] += 1
+            try:
+                user = self._provision()
+            finally:
+                with self._update() as data:
+                    data["pending"] -= 1
+            with self._update() as data:
+                data["free"].append(user)
+
+    def _recycle(self, user: UserDict) -> None:
+        if self.api.clear_books(user) or (self.api.login(user) and self.api.clear_books(user)):
+            with self._update() as data:
+                data["free"].append(user)
+                data["all"][user["userId"]] = user
+                data["stats"]["recycled"] += 1
+            return
+        # deleted by the test itself or otherwise unusable: forget it
+        with self._update() as data:
+            data["all"].pop(user["userId"], None)
+            data["stats"]["dropped"] += 1
+        if self.cleanup is not None:
+            self.cleanup.delete_user(user)
+        self.log.warning(f"Dropped user {user.get('username')} from pool")
+
+    # ---------- provisioning ----------
+    def _provision(self) -> UserDict:
+        body = build_user_requests(1)[0]
+        user = self.api.create_user(body)
+        if user is None:
+            raise RuntimeError(f"Pool could not create user {body.userName}")
+        if not self.api.login(user):
+            self.api.delete_user(user)
+            raise RuntimeError(f"Pool could not login user {body.userName}")
+        with self._update() as data:
+            data["all"][user["userId"]] = user
+            data["stats"]["created"] += 1
+        return user
+
+    @contextlib.contextmanager
+    def _update(self) -> Iterator[Dict[str, Any]]:
+        with self.store.update() as data:
+            self._init_store(data)
+            yield data
+
+    @staticmethod
+    def _init_store(data: Dict[str, Any]) -> None:
+        data.setdefault("all", {})
+        data.setdefault("free", [])
+        data.setdefault("leased", {})
+        data.setdefault("pending", 0)
+        stats = data.setdefault("stats", {})
+        for key in ("created", "leases", "hits", "misses", "recycled", "dropped"):
+            stats.setdefault(key, 0)
+        for key in ("wait_total_s", "wait_max_s"):
+            stats.setdefault(key, 0.0)
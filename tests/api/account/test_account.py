@@ -3,8 +3,9 @@ import pytest
 from assertpy import assert_that, soft_assertions
 
 from core.api.services.account_service import AccountService
-from core.providers.data_generator import generate_user_request_dict, generate_user_request
+from core.providers.data_generator import generate_user_request_dict, generate_user_request, generate_user_requests
 from core.util.html_report.decorators import html_sub_suite, html_feature, html_title
+from core.util.support.cleanup_queue import CleanupQueue
 from tests.ui.base_test import BaseTest
 
 
@@ -57,6 +58,22 @@ class TestAccountEndpoint(BaseTest):
             assert_that(r.status_code).is_equal_to(201)
             assert_that(r.json().get("userID")).is_not_none()
 
+    @html_title("Verify POST `/Account/v1/User` endpoint (`create user`) for a batch of generated users")
+    @allure.title("Verify POST `/Account/v1/User` endpoint (`create user`) for a batch of generated users")
+    @allure.testcase("TMS_LINK-A-1-7")
+    def test_create_users_batch(self, account_service_auth: AccountService, cleanup_queue: CleanupQueue):
+        user_requests = generate_user_requests(3)
+        responses = [account_service_auth._client.create_user_request(u) for u in user_requests]
+        for u, r in zip(user_requests, responses):
+            if r.status_code == 201:
+                cleanup_queue.delete_user({"username": u.userName, "password": u.password,
+                                           "userId": r.json().get("userID")})
+        with soft_assertions():
+            assert_that({u.userName for u in user_requests}).is_length(3)
+            for r in responses:
+                assert_that(r.status_code).is_equal_to(201)
+                assert_that(r.json().get("userID")).is_not_none()
+
     @html_title("Verify `GET /Account/v1/User/{UUID}` endpoint (`Get User`) functionality")
     @allure.title("Verify `GET /Account/v1/User/{UUID}` endpoint (`Get User`) functionality")
     @allure.testcase("TMS_LINK-A-1-4")
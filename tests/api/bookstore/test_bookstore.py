@@ -37,6 +37,20 @@ class TestBookStoreEndpoint(BaseTest):
             assert_that(r).described_as("Response should contain books list").is_instance_of(list)
             assert_that(r[0].get("isbn")).described_as("Any book must contain ISBN").is_not_none()
 
+    @html_title("GET /BookStore/v1/Books — streamed catalog matches full list")
+    @allure.title("GET /BookStore/v1/Books — streamed catalog matches full list")
+    @allure.testcase("TMS_LINK-BS-1-4")
+    def test_iter_books_matches_list(self, book_store_service: BookStoreService):
+        listed = book_store_service.list_books()
+        streamed = list(book_store_service.iter_books())
+        publisher = listed[-1].get("publisher")
+        found = book_store_service.find_book(lambda b: b.publisher == publisher)
+        with soft_assertions():
+            assert_that([b.isbn for b in streamed]).is_equal_to([b.get("isbn") for b in listed])
+            assert_that(streamed[0].title).is_equal_to(listed[0].get("title"))
+            assert_that(found).is_not_none()
+            assert_that(found.publisher if found else None).is_equal_to(publisher)
+
     @html_title("DELETE /BookStore/v1/Book — delete a single book from user")
     @allure.title("DELETE /BookStore/v1/Book — delete a single book from user")
     @allure.testcase("TMS_LINK-BS-1-2")
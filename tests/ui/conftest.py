@@ -1,57 +1,29 @@
 # All code/comments in English
 import contextlib
-import json
 import logging
-import os
-import sys
 import time
 from pathlib import Path
 from urllib.parse import urlsplit
 
 import allure
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.remote.webdriver import WebDriver
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
 from core.config.config import ConfigLoader, RunCfg
-
-
-# =============================== CLI options =================================
-def pytest_addoption(parser):
-    # browsers / display
-    parser.addoption("--browser", action="store", default="chrome", help="chrome|firefox|edge")
-    parser.addoption("--headless", action="store_true", default=False, help="Run headless")
-    parser.addoption("--window-size", action="store", default="1920,1080", help="WxH window size (default 1920,1080)")
-    parser.addoption("--lang", action="store", default="en-US", help="Accept-Language/locale")
-    parser.addoption("--incognito", action="store_true", default=False, help="Incognito/Private mode")
-    # grid / base url / waits
-    parser.addoption("--base-url", action="store", default="https://demoqa.com", help="Base URL")
-    parser.addoption("--iwait", action="store", type=int, default=2, help="Implicit wait seconds")
-    # HAR / cleanup
-    parser.addoption("--har", action="store_true", default=False, help="Record HAR via CDP (Chrome/Edge)")
-    parser.addoption("--cleanup-user", action="store_true", default=False, help="Delete temp user after session")
+from core.ui.browser import is_chromium
+from core.ui.driver_pool import LAUNCHED, PREWARMED, ReusableDriver
+from core.ui.failure_artifacts import FailureArtifactCollector
+from core.ui.har import HarRecorder
+from core.ui.page_perf import PagePerfRecorder
+from core.ui.request_blocking import OFF, RequestBlocker
+from core.ui.waits import WaitLog
+from core.util.allure_hooks.attachment_writer import shared_attachment_writer
+from core.util.logging import Logger
+from tests.ui.driver_plugin import PREWARM_KEY, _build_driver
 
 
 # =============================== Logging =====================================
-def _make_logger():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        stream=sys.stdout,
-    )
-    return logging.getLogger("TEST")
-
-
-LOGGER = _make_logger()
+LOGGER = Logger.get_logger("TEST", prefix="TEST", log_level=logging.INFO)
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -61,105 +33,48 @@ def _test_log():
     LOGGER.info("=== test end ===")
 
 
-# ============================== Driver builders ==============================
-def _chrome(cfg):
-    opts = ChromeOptions()
-    # console + performance logs (for HAR)
-    opts.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
-    opts.add_argument(f"--lang={cfg['lang']}")
-    if cfg["incognito"]:
-        opts.add_argument("--incognito")
-    if cfg["headless"]:
-        opts.add_argument("--headless=new")
-    w, h = cfg["window_size"].split(",")
-    opts.add_argument(f"--window-size={int(w)},{int(h)}")
-    if os.getenv("CI"):
-        opts.add_argument("--no-sandbox")
-        opts.add_argument("--disable-dev-shm-usage")
-
-    service = ChromeService(ChromeDriverManager().install())
-    drv = webdriver.Chrome(service=service, options=opts)
-
-    # Enable CDP network for HAR
-    with contextlib.suppress(Exception):
-        drv.execute_cdp_cmd("Network.enable", {"maxTotalBufferSize": 100_000_000, "maxResourceBufferSize": 50_000_000})
-    return drv
-
-
-def _firefox(cfg):
-    opts = FirefoxOptions()
-    if cfg["headless"]:
-        opts.add_argument("-headless")
-    opts.set_preference("intl.accept_languages", cfg["lang"])
-    service = FirefoxService(GeckoDriverManager().install())
-    drv = webdriver.Firefox(service=service, options=opts)
-
-    # set window size explicitly for FF
-    w, h = map(int, cfg["window_size"].split(","))
-    with contextlib.suppress(Exception):
-        drv.set_window_size(w, h)
+# ================================ WebDriver ==================================
+def _new_driver(py_cfg) -> WebDriver:
+    prewarm = py_cfg.stash.get(PREWARM_KEY, None)
+    drv = prewarm.take() if prewarm is not None else _build_driver(py_cfg)
+    tracer = py_cfg.pluginmanager.get_plugin("trace-timeline")
+    if tracer is not None:
+        tracer.instrument(drv)
     return drv
 
 
-def _edge(cfg):
-    opts = EdgeOptions()
-    opts.use_chromium = True
-    if cfg["headless"]:
-        opts.add_argument("--headless=new")
-    opts.add_argument(f"--lang={cfg['lang']}")
-    if cfg["incognito"]:
-        opts.add_argument("-inprivate")
-    w, h = cfg["window_size"].split(",")
-    opts.add_argument(f"--window-size={int(w)},{int(h)}")
+def _lease(py_cfg, event: str) -> str:
+    """A launch served by a ready pre-warmed browser is counted as such."""
+    prewarm = py_cfg.stash.get(PREWARM_KEY, None)
+    return PREWARMED if event == LAUNCHED and prewarm is not None and prewarm.last_ready else event
 
-    service = EdgeService(EdgeChromiumDriverManager().install())
-    drv = webdriver.Edge(service=service, options=opts)
-
-    # Enable CDP network for HAR (Edge)
-    with contextlib.suppress(Exception):
-        drv.execute_cdp_cmd("Network.enable", {})
-    return drv
 
-
-def _build_driver(py_cfg) -> WebDriver:
-    cfg = {
-        "browser": py_cfg.getoption("--browser").lower(),
-        "headless": py_cfg.getoption("--headless"),
-        "base_url": py_cfg.getoption("--base-url"),
-        "window_size": py_cfg.getoption("--window-size"),
-        "lang": py_cfg.getoption("--lang"),
-        "incognito": py_cfg.getoption("--incognito"),
-        "iwait": int(py_cfg.getoption("--iwait")),
-        "har": bool(py_cfg.getoption("--har")),
-    }
-
-    if cfg["browser"] == "chrome":
-        drv = _chrome(cfg)
-    elif cfg["browser"] == "firefox":
-        drv = _firefox(cfg)
-    elif cfg["browser"] == "edge":
-        drv = _edge(cfg)
-    else:
-        raise pytest.UsageError(f"Unsupported --browser={cfg['browser']}")
-
-    drv.implicitly_wait(cfg["iwait"])
-    with contextlib.suppress(Exception):
-        drv.set_page_load_timeout(60)
-        drv.set_script_timeout(30)
-
-    # expose config
-    drv.test_cfg = cfg
-    drv.base_url = cfg["base_url"].rstrip("/")
-    return drv
+@pytest.fixture(scope="session")
+def _driver_pool(request):
+    """One browser per worker with --reuse-driver (None otherwise)."""
+    py_cfg = request.config
+    if not py_cfg.getoption("--reuse-driver"):
+        yield None
+        return
+    w, h = map(int, py_cfg.getoption("--window-size").split(","))
+    pool = ReusableDriver(lambda: _new_driver(py_cfg), window_size=(w, h), implicit_wait=py_cfg.getoption("--iwait"))
+    yield pool
+    pool.close()
 
 
-# ================================ WebDriver ==================================
 @pytest.fixture(scope="function")
-def driver(request):
-    drv = _build_driver(request.config)
+def driver(request, _driver_pool):
+    if _driver_pool is None:
+        drv = _new_driver(request.config)
+        request.node.driver_lease = _lease(request.config, LAUNCHED)
+        yield drv
+        with contextlib.suppress(Exception):
+            drv.quit()
+        return
+    drv = _driver_pool.acquire()
+    request.node.driver_lease = _lease(request.config, _driver_pool.last_event)
     yield drv
-    with contextlib.suppress(Exception):
-        drv.quit()
+    _driver_pool.release()
 
 
 @pytest.fixture(scope="class")
@@ -187,159 +102,94 @@ def ui_creds() -> tuple[str, str, str]:
     return ui_cfg.api_user_name, ui_cfg.api_user_password, ui_cfg.ui_user_id
 
 
-# ================================ HAR recorder ===============================
-def _is_chromium(drv) -> bool:
-    name = (drv.capabilities or {}).get("browserName", "").lower()
-    return name in ("chrome", "msedge", "edge", "chromium")
+# ======================== Third-party request blocking =======================
+@pytest.fixture(scope="function", autouse=True)
+def request_blocking(request, driver):
+    """Counts blocked (or, with observe, blockable) requests per page on Chromium browsers."""
+    mode = driver.test_cfg.get("block_mode", OFF)
+    if mode == OFF or not is_chromium(driver):
+        yield None
+        return
+    blocker = RequestBlocker(driver.test_cfg["block_urls"], mode=mode)
+    with contextlib.suppress(Exception):
+        driver.get_log("performance")  # events of a previous test
+    yield blocker
+    blocker.drain(driver)  # with --har the recorder fed most events already, this picks up the rest
+    request.node.blocked_requests = blocker.summary()
+    blocker.save_sizes()
 
 
+# ================================ HAR recorder ===============================
 @pytest.fixture(scope="function", autouse=True)
-def har_recorder(request, driver, base_url):
+def har_recorder(request, driver, base_url, request_blocking):
     """
-    Record HAR via Chrome DevTools 'performance' logs.
+    Record a gzipped HAR via Chrome DevTools 'performance' logs, streamed while the test runs.
     Enabled only when --har and Chromium-based browser.
     """
-    if not driver.test_cfg.get("har") or not _is_chromium(driver):
+    if not driver.test_cfg.get("har") or not is_chromium(driver):
         yield None
         return
 
-    # flush previous logs
-    with contextlib.suppress(Exception):
-        driver.get_log("performance")
-
-    yield {}
-
-    try:
-        raw = driver.get_log("performance")
-    except Exception:
-        raw = []
-
-    events = []
-    for e in raw:
-        try:
-            evt = json.loads(e["message"])["message"]
-            events.append(evt)
-        except Exception:
-            continue
-
-    target_host = urlsplit(base_url).netloc or "demoqa.com"
-    requests_map = {}  # requestId -> data
-
-    # Collect requests/responses
-    for ev in events:
-        method = ev.get("method")
-        params = ev.get("params", {})
-        rid = params.get("requestId")
-        if not rid:
-            continue
-
-        if method == "Network.requestWillBeSent":
-            req = params.get("request", {})
-            url = req.get("url", "")
-            if target_host not in url:
-                continue
-            requests_map.setdefault(rid, {})
-            requests_map[rid]["request"] = {
-                "url": url,
-                "method": req.get("method"),
-                "headers": req.get("headers", {}),
-                "postData": req.get("postData"),
-                "timestamp": params.get("timestamp"),
-            }
-
-        elif method == "Network.responseReceived":
-            resp = params.get("response", {})
-            url = resp.get("url", "")
-            if target_host not in url:
-                continue
-            requests_map.setdefault(rid, {})
-            requests_map[rid]["response"] = {
-                "url": url,
-                "status": resp.get("status"),
-                "statusText": resp.get("statusText"),
-                "headers": resp.get("headers", {}),
-                "mimeType": resp.get("mimeType"),
-            }
-
-        elif method == "Network.loadingFinished":
-            requests_map.setdefault(rid, {})
-            requests_map[rid]["loadingFinished"] = params
-
-    # Fetch bodies via CDP (best-effort)
-    for rid, entry in list(requests_map.items()):
-        if "response" not in entry:
-            continue
-        with contextlib.suppress(Exception):
-            body_res = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": rid})
-            entry["response"]["body"] = body_res.get("body", "")
-            entry["response"]["base64Encoded"] = body_res.get("base64Encoded", False)
-
-    # Build minimal HAR 1.2
-    har = {"log": {"version": "1.2", "creator": {"name": "pytest-har", "version": "1.0"}, "entries": []}}
-    for rid, e in requests_map.items():
-        req = e.get("request", {})
-        resp = e.get("response", {})
-        lf = e.get("loadingFinished", {})
-        if not req or not resp:
-            continue
-        har["log"]["entries"].append({
-            "startedDateTime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
-            "time": 0,
-            "request": {
-                "method": req.get("method"),
-                "url": req.get("url"),
-                "httpVersion": "HTTP/1.1",
-                "headers": [{"name": k, "value": str(v)} for k, v in (req.get("headers") or {}).items()],
-                "queryString": [],
-                "postData": (
-                    {"mimeType": (req.get("headers", {}) or {}).get("Content-Type", ""),
-                     "text": req.get("postData", "")}
-                    if req.get("postData") else None
-                ),
-                "headersSize": -1,
-                "bodySize": -1,
-            },
-            "response": {
-                "status": resp.get("status", 0),
-                "statusText": resp.get("statusText", ""),
-                "httpVersion": "HTTP/1.1",
-                "headers": [{"name": k, "value": str(v)} for k, v in (resp.get("headers") or {}).items()],
-                "content": {
-                    "size": int(lf.get("encodedDataLength", -1)) if isinstance(lf.get("encodedDataLength"),
-                                                                               (int, float)) else -1,
-                    "mimeType": resp.get("mimeType", ""),
-                    "text": resp.get("body", ""),
-                },
-                "redirectURL": (resp.get("headers") or {}).get("location", ""),
-                "headersSize": -1,
-                "bodySize": int(lf.get("encodedDataLength", -1)) if isinstance(lf.get("encodedDataLength"),
-                                                                               (int, float)) else -1,
-            },
-            "cache": {},
-            "timings": {"send": -1, "wait": -1, "receive": -1},
-        })
-
-    outdir = Path("target/har")
-    outdir.mkdir(parents=True, exist_ok=True)
-    ts = time.strftime("%Y%m%d_%H%M%S")
-    fname = f"{request.node.name}_{ts}.har"
-    fpath = outdir / fname
-    fpath.write_text(json.dumps(har, ensure_ascii=False, indent=2), encoding="utf-8")
+    fname = f"{request.node.name}_{time.strftime('%Y%m%d_%H%M%S')}.har.gz"
+    recorder = HarRecorder(driver, Path("target/har") / fname,
+                           target_host=urlsplit(base_url).netloc or "demoqa.com").start()
+    if request_blocking is not None:
+        recorder.listeners.append(request_blocking.on_event)
+    yield recorder
+    fpath = recorder.stop()
 
     with contextlib.suppress(Exception):
-        allure.attach.file(str(fpath), name=fname, attachment_type=allure.attachment_type.JSON)
+        allure.attach.file(str(fpath), name=fname, extension="har.gz")
+
+
+# ============================ Page performance ===============================
+@pytest.fixture(scope="function", autouse=True)
+def page_perf(request, driver):
+    """With --page-perf, page objects measure themselves through the recorder attached to the driver."""
+    if not request.config.getoption("--page-perf"):
+        yield None
+        return
+    recorder = PagePerfRecorder(driver)
+    driver.page_perf = recorder
+    yield recorder
+    driver.page_perf = None
+
+
+# ================================== Waits ====================================
+@pytest.fixture(scope="function", autouse=True)
+def wait_log(request, driver):
+    """Every explicit wait of the test, recorded by the page objects' WaitEngine whatever step decorator runs."""
+    log = WaitLog()
+    driver.wait_log = log
+    yield log
+    driver.wait_log = None
+    request.node.wait_stats = log.summary()
 
 
 # ============================== Failure attachments ==========================
-def _attach_text(name: str, content: str):
-    with contextlib.suppress(Exception):
-        allure.attach(content, name=name, attachment_type=allure.attachment_type.TEXT)
+FAILURE_ARTIFACTS_KEY = pytest.StashKey[FailureArtifactCollector]()
 
 
-def _attach_json(name: str, obj):
-    with contextlib.suppress(Exception):
-        allure.attach(json.dumps(obj, indent=2, ensure_ascii=False),
-                      name=name, attachment_type=allure.attachment_type.JSON)
+def _failure_artifacts(config) -> FailureArtifactCollector:
+    collector = config.stash.get(FAILURE_ARTIFACTS_KEY, None)
+    if collector is None:
+        collector = FailureArtifactCollector(shared_attachment_writer(config),
+                                             jpeg_quality=config.getoption("--screenshot-quality"))
+        config.stash[FAILURE_ARTIFACTS_KEY] = collector
+    return collector
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Budgets are soft assertions: a test that ran to the end fails once with all violations.
+    Failing the call phase itself lets every reporter (pytest-html, Allure, xdist) see the same outcome.
+    """
+    outcome = yield
+    recorder = item.funcargs.get("page_perf")
+    if recorder is not None and recorder.violations and outcome.excinfo is None:
+        outcome.force_exception(pytest.fail.Exception(
+            "Performance budgets exceeded:\n  " + "\n  ".join(recorder.violations), pytrace=False))
 
 
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
@@ -348,21 +198,26 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
 
+    if rep.when == "setup" and hasattr(item, "driver_lease"):
+        # counted by DriverReuseSummary on the controller
+        rep.driver_lease = item.driver_lease
+    if rep.when == "teardown" and hasattr(item, "blocked_requests"):
+        # counted by BlockedRequestSummary on the controller
+        rep.blocked_requests = item.blocked_requests
+    if rep.when == "teardown" and getattr(item, "wait_stats", None):
+        stats = item.wait_stats
+        rep.wait_stats = stats
+        if stats["waits"]:
+            slowest = "; ".join(f"{w['label']} {w['ms']:g} ms ({w['polls']} polls)" for w in stats["slowest"])
+            rep.sections.append(("Waits", f"{stats['waits']} waits, {stats['ms']:g} ms, {stats['polls']} polls, "
+                                          f"{stats['timeouts']} timeouts\nslowest: {slowest}"))
+    recorder = item.funcargs.get("page_perf") if rep.when == "call" else None
+    if recorder is not None:
+        rep.page_metrics = recorder.results  # plain dicts: reach the run history on the xdist controller
     if rep.when == "call" and rep.failed:
         drv = item.funcargs.get("driver")
         if not drv:
             return
-
-        ts = time.strftime("%Y-%m-%d_%H-%M-%S")
-        with contextlib.suppress(Exception):
-            allure.attach(drv.get_screenshot_as_png(), name=f"{item.name}_{ts}.png",
-                          attachment_type=allure.attachment_type.PNG)
-        with contextlib.suppress(Exception):
-            allure.attach(drv.page_source, name=f"{item.name}_{ts}.html",
-                          attachment_type=allure.attachment_type.HTML)
-        with contextlib.suppress(Exception):
-            _attach_text("current_url.txt", drv.current_url)
-        with contextlib.suppress(Exception):
-            logs = drv.get_log("browser")
-            if logs:
-                _attach_json("console.json", logs)
+        collector = _failure_artifacts(item.config)
+        artifacts = collector.capture(drv)
+        rep.extras = getattr(rep, "extras", []) + collector.publish(artifacts, name=item.name)
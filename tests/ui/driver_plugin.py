@@ -0,0 +1,208 @@
+"""
+Browser options and WebDriver construction for the UI tests.
+
+Registered from the root conftest (`pytest_plugins`), so the options are accepted and the session hooks
+run whatever paths are passed on the command line, not only when tests/ui is the initial path.
+"""
+import contextlib
+import os
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.ui.driver_binaries import DriverBinaryResolver
+from core.ui.driver_pool import BrowserPrewarmPool
+from core.ui.request_blocking import FIREFOX_BLOCKING_PREFS, OBSERVE, OFF, ON, apply_blocking, load_block_list
+from core.util.support.shared_store import is_xdist_worker
+
+
+# =============================== CLI options =================================
+def pytest_addoption(parser):
+    # browsers / display
+    parser.addoption("--browser", action="store", default="chrome", help="chrome|firefox|edge")
+    parser.addoption("--headless", action="store_true", default=False, help="Run headless")
+    parser.addoption("--window-size", action="store", default="1920,1080", help="WxH window size (default 1920,1080)")
+    parser.addoption("--lang", action="store", default="en-US", help="Accept-Language/locale")
+    parser.addoption("--incognito", action="store_true", default=False, help="Incognito/Private mode")
+    # grid / base url / waits
+    parser.addoption("--base-url", action="store", default="https://demoqa.com", help="Base URL")
+    parser.addoption("--iwait", action="store", type=int, default=0,
+                     help="Implicit wait seconds (0: page objects wait explicitly through core.ui.waits)")
+    # driver binaries
+    parser.addoption("--driver-path", action="store", default=None,
+                     help="Pinned WebDriver binary (chromedriver/geckodriver/msedgedriver); skips resolution")
+    parser.addoption("--driver-offline", action="store_true", default=False,
+                     help="Never download/look up drivers: use --driver-path or the cached manifest entry only")
+    parser.addoption("--reuse-driver", action="store_true", default=False,
+                     help="Keep one browser per worker and reset its state between tests instead of relaunching")
+    parser.addoption("--prewarm", action="store", type=int, default=0,
+                     help="Browsers per worker launched ahead in the background, from session start (0: off)")
+    # third-party requests
+    parser.addoption("--block-third-party", action="store", default="auto", choices=("auto", ON, OFF, OBSERVE),
+                     help="Block ad/analytics/font requests (auto: on when CI is set; observe: count them only)")
+    parser.addoption("--block-list", action="store", default=None,
+                     help="File with URL patterns to block, one per line (replaces the default list)")
+    # HAR / cleanup
+    parser.addoption("--har", action="store_true", default=False, help="Record HAR via CDP (Chrome/Edge)")
+    parser.addoption("--cleanup-user", action="store_true", default=False, help="Delete temp user after session")
+    # front-end performance
+    parser.addoption("--page-perf", action="store_true", default=False,
+                     help="Collect Navigation/Paint Timing and CDP metrics in page objects and enforce PERF_BUDGETS")
+    # failure artifacts
+    parser.addoption("--screenshot-quality", action="store", type=int, default=60,
+                     help="JPEG quality of failure screenshots (Chrome/Edge)")
+
+
+# ============================== Driver builders ==============================
+def _chrome(cfg):
+    opts = ChromeOptions()
+    # console + performance logs (for HAR)
+    opts.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
+    opts.add_argument(f"--lang={cfg['lang']}")
+    if cfg["incognito"]:
+        opts.add_argument("--incognito")
+    if cfg["headless"]:
+        opts.add_argument("--headless=new")
+    w, h = cfg["window_size"].split(",")
+    opts.add_argument(f"--window-size={int(w)},{int(h)}")
+    if os.getenv("CI"):
+        opts.add_argument("--no-sandbox")
+        opts.add_argument("--disable-dev-shm-usage")
+
+    # the performance log is read for network events only (HAR, blocked requests)
+    opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    service = ChromeService(cfg["driver_path"])
+    drv = webdriver.Chrome(service=service, options=opts)
+
+    # Enable CDP network for HAR; the recorder fetches bodies as soon as a request finishes, small buffers suffice
+    with contextlib.suppress(Exception):
+        drv.execute_cdp_cmd("Network.enable", {"maxTotalBufferSize": 10_000_000, "maxResourceBufferSize": 2_000_000})
+    if cfg["block_mode"] == ON:
+        apply_blocking(drv, cfg["block_urls"])
+    return drv
+
+
+def _firefox(cfg):
+    opts = FirefoxOptions()
+    if cfg["headless"]:
+        opts.add_argument("-headless")
+    opts.set_preference("intl.accept_languages", cfg["lang"])
+    if cfg["block_mode"] == ON:
+        for name, value in FIREFOX_BLOCKING_PREFS.items():
+            opts.set_preference(name, value)
+    service = FirefoxService(cfg["driver_path"])
+    drv = webdriver.Firefox(service=service, options=opts)
+
+    # set window size explicitly for FF
+    w, h = map(int, cfg["window_size"].split(","))
+    with contextlib.suppress(Exception):
+        drv.set_window_size(w, h)
+    return drv
+
+
+def _edge(cfg):
+    opts = EdgeOptions()
+    opts.use_chromium = True
+    if cfg["headless"]:
+        opts.add_argument("--headless=new")
+    opts.add_argument(f"--lang={cfg['lang']}")
+    if cfg["incognito"]:
+        opts.add_argument("-inprivate")
+    w, h = cfg["window_size"].split(",")
+    opts.add_argument(f"--window-size={int(w)},{int(h)}")
+    if cfg["block_mode"] != OFF:
+        opts.set_capability("ms:loggingPrefs", {"performance": "ALL"})  # blocked request counts
+
+    service = EdgeService(cfg["driver_path"])
+    drv = webdriver.Edge(service=service, options=opts)
+
+    # Enable CDP network for HAR (Edge)
+    with contextlib.suppress(Exception):
+        drv.execute_cdp_cmd("Network.enable", {})
+    if cfg["block_mode"] == ON:
+        apply_blocking(drv, cfg["block_urls"])
+    return drv
+
+
+def _block_mode(py_cfg) -> str:
+    mode = py_cfg.getoption("--block-third-party")
+    if mode == "auto":
+        return ON if os.getenv("CI") else OFF
+    return mode
+
+
+def _driver_binary(py_cfg, browser: str) -> str:
+    resolver = DriverBinaryResolver(pinned_path=py_cfg.getoption("--driver-path"),
+                                    offline=py_cfg.getoption("--driver-offline"))
+    try:
+        return resolver.resolve(browser)
+    except ValueError:
+        raise pytest.UsageError(f"Unsupported --browser={browser}") from None
+
+
+PREWARM_KEY = pytest.StashKey[BrowserPrewarmPool]()
+
+
+def pytest_sessionstart(session):
+    """
+    Controller (or single process): resolve the driver binary once; workers read it from the manifest.
+    Processes that run tests start the --prewarm pool, so browsers launch while tests are collected.
+    """
+    py_cfg = session.config
+    if not is_xdist_worker(py_cfg):
+        with contextlib.suppress(Exception):  # a real failure is reported by the first driver build
+            _driver_binary(py_cfg, py_cfg.getoption("--browser").lower())
+    runs_tests = is_xdist_worker(py_cfg) or not getattr(py_cfg.option, "numprocesses", None)
+    if runs_tests and py_cfg.getoption("--prewarm") > 0 and not py_cfg.getoption("collectonly"):
+        pool = BrowserPrewarmPool(lambda: _build_driver(py_cfg), spares=py_cfg.getoption("--prewarm"),
+                                  refill=not py_cfg.getoption("--reuse-driver"))
+        py_cfg.stash[PREWARM_KEY] = pool.start()
+
+
+def pytest_sessionfinish(session):
+    prewarm = session.config.stash.get(PREWARM_KEY, None)
+    if prewarm is not None:
+        prewarm.close()  # spares nobody took
+
+
+def _build_driver(py_cfg) -> WebDriver:
+    cfg = {
+        "browser": py_cfg.getoption("--browser").lower(),
+        "headless": py_cfg.getoption("--headless"),
+        "base_url": py_cfg.getoption("--base-url"),
+        "window_size": py_cfg.getoption("--window-size"),
+        "lang": py_cfg.getoption("--lang"),
+        "incognito": py_cfg.getoption("--incognito"),
+        "iwait": int(py_cfg.getoption("--iwait")),
+        "har": bool(py_cfg.getoption("--har")),
+        "block_mode": _block_mode(py_cfg),
+    }
+    cfg["block_urls"] = load_block_list(py_cfg.getoption("--block-list")) if cfg["block_mode"] != OFF else []
+    cfg["driver_path"] = _driver_binary(py_cfg, cfg["browser"])
+
+    if cfg["browser"] == "chrome":
+        drv = _chrome(cfg)
+    elif cfg["browser"] == "firefox":
+        drv = _firefox(cfg)
+    elif cfg["browser"] == "edge":
+        drv = _edge(cfg)
+    else:
+        raise pytest.UsageError(f"Unsupported --browser={cfg['browser']}")
+
+    drv.implicitly_wait(cfg["iwait"])
+    with contextlib.suppress(Exception):
+        drv.set_page_load_timeout(60)
+        drv.set_script_timeout(30)
+
+    # expose config
+    drv.test_cfg = cfg
+    drv.base_url = cfg["base_url"].rstrip("/")
+    return drv
@@ -52,8 +52,9 @@ class TestLoginPage(BaseTest):
         login_page = profile_page.logout()
         with (soft_assertions()):
             assert_that(login_page.url_contains("/login")).is_true()
-            assert_that(login_page.user_name_default()).contains("UserName")
-            assert_that(login_page.password_default()).contains("Password")
+            placeholders = login_page.placeholders()
+            assert_that(placeholders.get("userName")).contains("UserName")
+            assert_that(placeholders.get("password")).contains("Password")
 
     @allure.title("Logout from Profile → back to Login")
     @html_title("Logout from Profile → back to Login")
@@ -66,5 +67,6 @@ class TestLoginPage(BaseTest):
         login_page = profile_page.logout()
         with (soft_assertions()):
             assert_that(login_page.url_contains("/login")).is_true()
-            assert_that(login_page.user_name_default()).contains("UserName")
-            assert_that(login_page.password_default()).contains("Password")
+            placeholders = login_page.placeholders()
+            assert_that(placeholders.get("userName")).contains("UserName")
+            assert_that(placeholders.get("password")).contains("Password")
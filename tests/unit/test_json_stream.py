@@ -0,0 +1,61 @@
+import json
+from typing import Iterator, List
+
+import pytest
+from assertpy import assert_that
+
+from core.http.json_stream import iter_json_array
+
+
+def _chunks(doc: str, size: int) -> List[bytes]:
+    raw = doc.encode("utf-8")
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+BOOKS = [{"isbn": "9781449325862", "title": 'Say "hi"', "pages": 234},
+         {"isbn": "9781449331818", "title": "Back\\slash ü", "pages": 254}]
+
+
+@pytest.mark.unit
+class TestIterJsonArray:
+    def test_items_across_chunk_boundaries(self):
+        doc = json.dumps({"books": BOOKS}, ensure_ascii=False)
+        for size in (1, 2, 3, 7, 1024):  # 1-2 bytes also split the multi-byte "ü"
+            assert_that(list(iter_json_array(_chunks(doc, size), "books"))).is_equal_to(BOOKS)
+
+    def test_key_and_escaped_quotes_split_across_chunks(self):
+        doc = '{"note": "a \\"books\\": [1] in a string", "bo\\u006fks" : [ 1 , "x\\"y" ]}'
+        for size in (1, 2, 5):
+            assert_that(list(iter_json_array(_chunks(doc, size), "books"))).is_equal_to([1, 'x"y'])
+
+    def test_nested_key_with_the_same_name_does_not_match(self):
+        doc = json.dumps({"meta": {"books": ["nested"]}, "list": [{"books": [0]}], "books": ["top"]})
+        assert_that(list(iter_json_array(_chunks(doc, 4), "books"))).is_equal_to(["top"])
+
+    def test_only_nested_key_is_missing_at_top_level(self):
+        doc = json.dumps({"meta": {"books": ["nested"]}})
+        with pytest.raises(ValueError):
+            list(iter_json_array(_chunks(doc, 4), "books"))
+
+    def test_empty_array(self):
+        assert_that(list(iter_json_array(_chunks('{"books": [ ]}', 3), "books"))).is_empty()
+
+    def test_missing_key(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(_chunks('{"items": [1, 2]}', 3), "books"))
+
+    def test_number_at_a_chunk_end_is_not_cut(self):
+        assert_that(list(iter_json_array([b'{"books": [12', b"34, 5", b"6]}"], "books"))).is_equal_to([1234, 56])
+
+    def test_stopping_early_stops_reading_chunks(self):
+        read: List[bytes] = []
+
+        def source() -> Iterator[bytes]:
+            for chunk in _chunks(json.dumps({"books": list(range(100))}), 8):
+                read.append(chunk)
+                yield chunk
+
+        items = iter_json_array(source(), "books")
+        assert_that(next(items)).is_equal_to(0)
+        items.close()
+        assert_that(len(read)).is_less_than(5)
@@ -0,0 +1,53 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import pytest
+from assertpy import assert_that
+
+from core.util.support.run_history import RunHistory, RunRecorder
+
+
+def _record(history: RunHistory, call_ms: float, latency_ms: Optional[List[float]] = None, env: str = "qa") -> int:
+    run = RunRecorder()
+    for when, duration in (("setup", 0.01), ("call", call_ms / 1000), ("teardown", 0.01)):
+        run.pytest_runtest_logreport(SimpleNamespace(nodeid="tests/test_x.py::test_a", when=when, duration=duration,
+                                                     failed=False, skipped=False))
+    latencies: Dict[str, List[float]] = {"GET /BookStore/v1/Books": latency_ms or [100.0, 110.0, 120.0]}
+    run.latencies.update(latencies)
+    return history.record(run, env=env, meta={})
+
+
+@pytest.mark.unit
+class TestRegressions:
+    def test_stable_series_has_no_regressions(self, tmp_path: Path):
+        history = RunHistory(tmp_path / "history.sqlite")
+        for call_ms in (1000, 1040, 980, 1010, 995, 1025):
+            _record(history, call_ms)
+        last = _record(history, 1030)
+        assert_that(history.regressions(last)).is_empty()
+
+    def test_clear_regression_is_flagged(self, tmp_path: Path):
+        history = RunHistory(tmp_path / "history.sqlite")
+        for call_ms in (1000, 1040, 980, 1010, 995, 1025):
+            _record(history, call_ms)
+        last = _record(history, 2500, latency_ms=[400.0, 420.0, 450.0])
+        found = {(r.kind, r.metric): r for r in history.regressions(last)}
+        assert_that(found).contains_key(("test", "call_ms"), ("endpoint", "p50_ms"))
+        assert_that(found[("test", "call_ms")].name).is_equal_to("tests/test_x.py::test_a")
+        assert_that(found[("test", "call_ms")].baseline).is_between(995, 1025)
+        assert_that(found[("test", "call_ms")].runs).is_equal_to(6)
+
+    def test_too_few_baseline_runs(self, tmp_path: Path):
+        history = RunHistory(tmp_path / "history.sqlite")
+        for call_ms in (1000, 1010, 990):
+            _record(history, call_ms)
+        last = _record(history, 5000)
+        assert_that(history.regressions(last, min_runs=5)).is_empty()
+
+    def test_baseline_is_limited_to_the_same_env(self, tmp_path: Path):
+        history = RunHistory(tmp_path / "history.sqlite")
+        for call_ms in (1000, 1040, 980, 1010, 995, 1025):
+            _record(history, call_ms, env="prod")
+        last = _record(history, 5000, env="qa")
+        assert_that(history.regressions(last)).is_empty()
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from assertpy import assert_that
+
+from core.util.support.shared_store import FileLock, SharedJsonStore, SharedResource
+
+DEAD_OWNER = "999999999:crashed"  # above the kernel's pid_max: never a running process
+
+
+def _increment(path: str, times: int) -> None:
+    store = SharedJsonStore(Path(path), lock_timeout=60)
+    for _ in range(times):
+        with store.update() as data:
+            value = data.get("n", 0)
+            time.sleep(0.001)  # widen the read-modify-write window
+            data["n"] = value + 1
+
+
+def _old_lock(path: Path, owner: str, age_s: float = 3600) -> None:
+    path.write_text(owner, encoding="utf-8")
+    past = time.time() - age_s
+    os.utime(path, (past, past))
+
+
+@pytest.mark.unit
+class TestSharedJsonStore:
+    def test_update_persists(self, tmp_path: Path):
+        store = SharedJsonStore(tmp_path / "state.json")
+        with store.update() as data:
+            data["a"] = 1
+        with store.update() as data:
+            data["b"] = data["a"] + 1
+        assert_that(SharedJsonStore(tmp_path / "state.json").read()).is_equal_to({"a": 1, "b": 2})
+        assert_that((tmp_path / "state.json.lock").exists()).is_false()
+
+    def test_threads_do_not_lose_updates(self, tmp_path: Path):
+        threads = [threading.Thread(target=_increment, args=(str(tmp_path / "n.json"), 25)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert_that(SharedJsonStore(tmp_path / "n.json").read()["n"]).is_equal_to(150)
+
+    def test_processes_do_not_lose_updates(self, tmp_path: Path):
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=_increment, args=(str(tmp_path / "n.json"), 20)) for _ in range(3)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(60)
+        assert_that([p.exitcode for p in procs]).is_equal_to([0, 0, 0])
+        assert_that(SharedJsonStore(tmp_path / "n.json").read()["n"]).is_equal_to(60)
+
+
+@pytest.mark.unit
+class TestFileLock:
+    def test_held_lock_times_out(self, tmp_path: Path):
+        with FileLock(tmp_path / "x.lock"):
+            with pytest.raises(TimeoutError):
+                FileLock(tmp_path / "x.lock", timeout=0.2).acquire()
+
+    def test_stale_lock_of_dead_owner_is_broken(self, tmp_path: Path):
+        _old_lock(tmp_path / "x.lock", DEAD_OWNER)
+        with FileLock(tmp_path / "x.lock", timeout=2, stale_after=60) as lock:
+            assert_that(lock._read_owner()).starts_with(f"{os.getpid()}:")
+        assert_that((tmp_path / "x.lock").exists()).is_false()
+
+    def test_old_lock_of_live_owner_is_kept(self, tmp_path: Path):
+        _old_lock(tmp_path / "x.lock", f"{os.getpid()}:busy")
+        with pytest.raises(TimeoutError):
+            FileLock(tmp_path / "x.lock", timeout=0.2, stale_after=60).acquire()
+        assert_that((tmp_path / "x.lock").read_text(encoding="utf-8")).is_equal_to(f"{os.getpid()}:busy")
+
+    def test_release_keeps_lock_taken_over_by_another_owner(self, tmp_path: Path):
+        lock = FileLock(tmp_path / "x.lock")
+        lock.acquire()
+        (tmp_path / "x.lock").write_text(DEAD_OWNER, encoding="utf-8")  # broken as stale and re-taken
+        lock.release()
+        assert_that((tmp_path / "x.lock").read_text(encoding="utf-8")).is_equal_to(DEAD_OWNER)
+
+
+@pytest.mark.unit
+class TestSharedResource:
+    def test_value_is_built_once_and_kept_until_taken(self, tmp_path: Path):
+        built = []
+
+        def factory():
+            built.append(1)
+            return {"user": f"u{len(built)}"}
+
+        first = SharedResource(SharedJsonStore(tmp_path / "r.json")).acquire(factory)
+        # a worker that finished early does not drop it: a later worker still reuses the same value
+        later = SharedResource(SharedJsonStore(tmp_path / "r.json")).acquire(factory)
+        assert_that(later).is_equal_to(first)
+        assert_that(built).is_length(1)
+        assert_that(SharedResource(SharedJsonStore(tmp_path / "r.json")).take()).is_equal_to({"user": "u1"})
+        assert_that(SharedResource(SharedJsonStore(tmp_path / "r.json")).take()).is_none()
+
+    def test_take_without_store_returns_none(self, tmp_path: Path):
+        assert_that(SharedResource(SharedJsonStore(tmp_path / "missing.json")).take()).is_none()
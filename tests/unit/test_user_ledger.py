@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+from assertpy import assert_that
+
+from core.util.support.user_ledger import UserLedger
+
+
+@pytest.fixture()
+def ledger(tmp_path: Path) -> UserLedger:
+    return UserLedger(tmp_path / "users.jsonl")
+
+
+@pytest.mark.unit
+class TestUserLedger:
+    def test_compact_drops_deleted_accounts_and_their_passwords(self, ledger: UserLedger):
+        ledger.record_created("auto_user_1", "secret-1", "id-1")
+        ledger.record_created("auto_user_2", "secret-2", "id-2")
+        ledger.record_deleted("id-1")
+        assert_that(ledger.compact()).is_equal_to(2)
+        text = ledger.path.read_text(encoding="utf-8")
+        assert_that(text).does_not_contain("secret-1").contains("secret-2")
+        assert_that([e["userId"] for e in ledger.live()]).is_equal_to(["id-2"])
+
+    def test_compact_of_a_compact_ledger_does_not_rewrite_it(self, ledger: UserLedger):
+        ledger.record_created("auto_user_1", "secret-1", "id-1")
+        before = ledger.path.stat().st_mtime_ns
+        assert_that(ledger.compact()).is_equal_to(0)
+        assert_that(ledger.path.stat().st_mtime_ns).is_equal_to(before)
+
+    def test_compact_without_a_file(self, ledger: UserLedger):
+        assert_that(ledger.compact()).is_equal_to(0)
+        assert_that(ledger.path.exists()).is_false()
@@ -0,0 +1,89 @@
+import itertools
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from assertpy import assert_that
+
+from core.api.models.user import UserRequest
+from core.util.support.user_pool import UserPool
+
+
+class FakeRawApi:
+    """DemoQaRawApi stand-in: accounts live in a dict, `books_ok` / `login_ok` switch recycling off."""
+
+    def __init__(self) -> None:
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.books_ok = True
+        self.login_ok = True
+        self._ids = itertools.count(1)
+
+    def create_user(self, body: UserRequest) -> Optional[Dict[str, Any]]:
+        user = {"username": body.userName, "password": body.password, "userId": f"id-{next(self._ids)}"}
+        self.users[user["userId"]] = user
+        return dict(user)
+
+    def login(self, user: Dict[str, Any]) -> Optional[bool]:
+        if self.login_ok:
+            user["token"] = "token"
+        return self.login_ok
+
+    def clear_books(self, user: Dict[str, Any]) -> bool:
+        return self.books_ok
+
+    def delete_user(self, user: Dict[str, Any]) -> bool:
+        return self.users.pop(user["userId"], None) is not None
+
+
+class FakeCleanup:
+    def __init__(self) -> None:
+        self.deleted: List[Dict[str, Any]] = []
+
+    def delete_user(self, user: Dict[str, Any]) -> None:
+        self.deleted.append(user)
+
+
+@pytest.fixture()
+def api() -> FakeRawApi:
+    return FakeRawApi()
+
+
+@pytest.fixture()
+def cleanup() -> FakeCleanup:
+    return FakeCleanup()
+
+
+@pytest.fixture()
+def pool(tmp_path: Path, api: FakeRawApi, cleanup: FakeCleanup) -> UserPool:
+    # not started: release() recycles synchronously
+    return UserPool(tmp_path, size=2, lease_timeout=1.0, api=api, cleanup=cleanup)  # type: ignore[arg-type]
+
+
+@pytest.mark.unit
+class TestUserPool:
+    def test_lease_from_empty_pool_provisions_on_demand(self, pool: UserPool, api: FakeRawApi):
+        user = pool.lease()
+        stats = pool.stats()
+        assert_that(api.users).contains_key(user["userId"])
+        assert_that(user.get("token")).is_not_none()
+        assert_that((stats.leases, stats.misses, stats.hits, stats.created)).is_equal_to((1, 1, 0, 1))
+        assert_that(pool.store.read()["leased"]).contains_key(user["userId"])
+
+    def test_released_user_is_leased_again(self, pool: UserPool):
+        user = pool.lease()
+        pool.release(user)
+        again = pool.lease()
+        stats = pool.stats()
+        assert_that(again["userId"]).is_equal_to(user["userId"])
+        assert_that((stats.hits, stats.misses, stats.recycled)).is_equal_to((1, 1, 1))
+
+    def test_user_is_dropped_after_failed_recycle(self, pool: UserPool, api: FakeRawApi, cleanup: FakeCleanup):
+        user = pool.lease()
+        api.books_ok = api.login_ok = False
+        pool.release(user)
+        data = pool.store.read()
+        assert_that(data["all"]).does_not_contain_key(user["userId"])
+        assert_that(data["free"]).is_empty()
+        assert_that(pool.stats().dropped).is_equal_to(1)
+        assert_that([u["userId"] for u in cleanup.deleted]).is_equal_to([user["userId"]])
+